@@ -0,0 +1,445 @@
+import numpy as np
+
+
+def distance_matrix(cities):
+    # 城市坐标 (n, 2) -> 欧氏距离矩阵 (n, n)
+    cities = np.asarray(cities, dtype=np.float64)
+    diff = cities[:, None, :] - cities[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def tour_lengths(dist, tours):
+    # tours: (m, n) 的城市序列，返回每条闭合路径的长度 (m,)
+    tours = np.atleast_2d(tours)
+    return dist[tours, np.roll(tours, -1, axis=1)].sum(axis=1)
+
+
+def nearest_neighbours(cities, k):
+    # 均匀网格索引求每个城市的 k 近邻，返回按距离升序的 (n, k) 下标与距离。
+    # 每个格子平均约 k/2 个城市；以格子为单位向外逐环扩展，
+    # 直到第 k 近邻的距离不超过已搜索区域的内半径，结果即为精确 k 近邻
+    cities = np.asarray(cities, dtype=np.float64)
+    n = len(cities)
+    k = min(k, n - 1)
+    lo = cities.min(axis=0)
+    span = np.maximum(cities.max(axis=0) - lo, 1e-12)
+    h = max(np.sqrt(span[0] * span[1] * k / (2.0 * n)), span.max() * k / (2.0 * n))
+    gx, gy = (np.floor(span / h).astype(int) + 1)
+
+    cell_xy = np.minimum(((cities - lo) / h).astype(int), [gx - 1, gy - 1])
+    cell = cell_xy[:, 0] * gy + cell_xy[:, 1]
+    order = np.argsort(cell, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(cell, minlength=gx * gy))))
+
+    nn_idx = np.empty((n, k), dtype=np.intp)
+    nn_dist = np.empty((n, k))
+    for c in np.flatnonzero(bounds[1:] > bounds[:-1]):
+        members = order[bounds[c]:bounds[c + 1]]
+        cx, cy = divmod(c, gy)
+        r = 1
+        while True:
+            x0, x1 = max(cx - r, 0), min(cx + r, gx - 1)
+            y0, y1 = max(cy - r, 0), min(cy + r, gy - 1)
+            # 同一列的格子在 cell 编号上连续，每列取一段切片即可
+            cand = np.concatenate([order[bounds[x * gy + y0]:bounds[x * gy + y1 + 1]]
+                                   for x in range(x0, x1 + 1)])
+            covers_all = x0 == 0 and y0 == 0 and x1 == gx - 1 and y1 == gy - 1
+            if len(cand) > k:
+                d = np.sqrt(((cities[members, None, :] - cities[None, cand, :]) ** 2).sum(axis=-1))
+                d[members[:, None] == cand[None, :]] = np.inf
+                part = np.argpartition(d, k - 1, axis=1)[:, :k]
+                kd = np.take_along_axis(d, part, axis=1)
+                if covers_all or kd.max() <= r * h:
+                    srt = np.argsort(kd, axis=1)
+                    nn_idx[members] = cand[np.take_along_axis(part, srt, axis=1)]
+                    nn_dist[members] = np.take_along_axis(kd, srt, axis=1)
+                    break
+            r += 1
+    return nn_idx, nn_dist
+
+
+class DensePheromone:
+    # 稠密 n×n 信息素矩阵
+    def __init__(self, n, tau0, dtype=np.float64):
+        self.n = n
+        self.data = np.full((n, n), tau0, dtype=dtype)
+
+    def candidate_values(self, cand):
+        return self.data[np.arange(self.n)[:, None], cand]
+
+    def rows(self, idx):
+        return self.data[idx]
+
+    def values(self, i, j):
+        return self.data[i, j]
+
+    def evaporate(self, factor):
+        self.data *= factor
+
+    def deposit(self, src, dst, amount):
+        np.add.at(self.data, (src, dst), amount)
+        np.add.at(self.data, (dst, src), amount)
+
+    def clip(self, lo, hi):
+        np.clip(self.data, lo, hi, out=self.data)
+
+    def fill(self, value):
+        self.data.fill(value)
+
+    def normalize(self):
+        pass
+
+
+class CompactPheromone:
+    # 紧凑存储：只在候选边上保存信息素，每行 k 个值（CSR 风格，列下标即候选表 cand），
+    # 默认 float32；非候选边共用一个基准值 base。
+    # 蒸发只更新全局衰减因子 scale（真实值 = data·scale），scale 过小时再乘回 data 归一化
+    def __init__(self, cand, tau0, dtype=np.float32, renormalize_below=1e-3):
+        self.cand = cand
+        self.n = len(cand)
+        self.data = np.full(cand.shape, tau0, dtype=dtype)
+        self.base = float(tau0)
+        self.scale = 1.0
+        self.renormalize_below = renormalize_below
+
+    def candidate_values(self, cand=None):
+        return self.data * self.scale
+
+    def rows(self, idx):
+        idx = np.asarray(idx)
+        out = np.full((len(idx), self.n), self.base)
+        out[np.arange(len(idx))[:, None], self.cand[idx]] = self.data[idx] * self.scale
+        return out
+
+    def slots(self, i, j):
+        # 边 (i, j) 在第 i 行中的位置；j 不在 i 的候选表中时 found 为 False
+        hit = self.cand[i] == np.asarray(j)[:, None]
+        return hit.any(axis=1), hit.argmax(axis=1)
+
+    def values(self, i, j):
+        i, j = np.asarray(i), np.asarray(j)
+        out = np.full(len(i), self.base)
+        # 对称边在两端的候选行中各存一份，优先取 i 行
+        for a, b in ((j, i), (i, j)):
+            found, slot = self.slots(a, b)
+            out[found] = self.data[a[found], slot[found]] * self.scale
+        return out
+
+    def evaporate(self, factor):
+        self.scale *= factor
+        self.base *= factor
+        if self.scale < self.renormalize_below:
+            self.normalize()
+
+    def normalize(self):
+        self.data *= self.scale
+        self.scale = 1.0
+
+    def deposit(self, src, dst, amount):
+        # 非候选边上的沉积被丢弃（这些边只在全扫描回退时使用，取基准值）
+        for a, b in ((src, dst), (dst, src)):
+            found, slot = self.slots(a, b)
+            np.add.at(self.data, (a[found], slot[found]),
+                      (amount[found] / self.scale).astype(self.data.dtype))
+
+    def clip(self, lo, hi):
+        np.clip(self.data, lo / self.scale, hi / self.scale, out=self.data)
+        self.base = min(max(self.base, lo), hi)
+
+    def fill(self, value):
+        self.data.fill(value)
+        self.base = float(value)
+        self.scale = 1.0
+
+
+class AntSystemUpdate:
+    # 原始 AS：所有蚂蚁按 Q/L_k 沉积信息素
+    def initialize(self, colony):
+        pass
+
+    def update(self, colony, tours, lengths):
+        colony.evaporate()
+        colony.deposit(tours, colony.q / lengths)
+
+
+class ElitistUpdate(AntSystemUpdate):
+    # 精英蚁群系统：在 AS 的基础上，全局最优路径额外获得 e·Q/L_best 的信息素
+    def __init__(self, elite_weight=None):
+        self.elite_weight = elite_weight    # 默认取蚂蚁数量
+
+    def update(self, colony, tours, lengths):
+        super().update(colony, tours, lengths)
+        e = colony.n_ants if self.elite_weight is None else self.elite_weight
+        colony.deposit(colony.best_tour, e * colony.q / colony.best_length)
+
+
+class RankBasedUpdate(AntSystemUpdate):
+    # 基于排序的蚁群系统：只有本轮前 w-1 名蚂蚁沉积，第 r 名权重为 w-r，
+    # 全局最优路径权重为 w
+    def __init__(self, w=6):
+        self.w = w
+
+    def update(self, colony, tours, lengths):
+        colony.evaporate()
+        top = np.argsort(lengths)[:self.w - 1]
+        ranks = np.arange(1, len(top) + 1)
+        colony.deposit(tours[top], (self.w - ranks) * colony.q / lengths[top])
+        colony.deposit(colony.best_tour, self.w * colony.q / colony.best_length)
+
+
+class MaxMinUpdate(AntSystemUpdate):
+    # 最大-最小蚂蚁系统：只有最优蚂蚁沉积，信息素被限制在 [τ_min, τ_max] 内，
+    # 初始信息素取 τ_max
+    def __init__(self, p_best=0.05, global_every=5):
+        self.p_best = p_best
+        self.global_every = global_every    # 每隔若干轮用全局最优代替本轮最优沉积
+
+    def bounds(self, colony):
+        tau_max = 1.0 / (colony.rho * colony.best_length)
+        # 公式的分母 (n/2 - 1) 在 n <= 2 时不为正，此时改用 τ_max / (2n)
+        if colony.n <= 2:
+            return tau_max / (2.0 * colony.n), tau_max
+        root = self.p_best ** (1.0 / colony.n)
+        tau_min = tau_max * (1.0 - root) / ((colony.n / 2.0 - 1.0) * root)
+        return min(tau_min, tau_max), tau_max
+
+    def initialize(self, colony):
+        colony.pheromone.fill(1.0 / (colony.rho * colony.nn_length))
+
+    def update(self, colony, tours, lengths):
+        colony.evaporate()
+        if self.global_every and (colony.iteration + 1) % self.global_every == 0:
+            colony.deposit(colony.best_tour, colony.q / colony.best_length)
+        else:
+            best = int(np.argmin(lengths))
+            colony.deposit(tours[best], colony.q / lengths[best])
+        tau_min, tau_max = self.bounds(colony)
+        colony.pheromone.clip(tau_min, tau_max)
+
+
+class AntSystem:
+    # 向量化的蚁群系统 (Ant System)：所有蚂蚁同步构建路径，信息素批量蒸发与沉积
+    def __init__(self, cities, n_ants=None, alpha=1.0, beta=2.0, rho=0.5, q=1.0,
+                 tau0=None, start=None, candidates=None, storage="dense", dtype=None,
+                 update=None, local_search=None, rng=None):
+        self.cities = np.asarray(cities, dtype=np.float64)
+        self.n = len(self.cities)
+        self.n_ants = n_ants if n_ants is not None else self.n
+        self.alpha = alpha    # 信息素重要程度
+        self.beta = beta      # 启发式信息重要程度
+        self.rho = rho        # 蒸发率
+        self.q = q            # 信息素强度常数
+        self.start = start    # 固定起点城市；None 表示每只蚂蚁随机起点
+        self.local_search = local_search    # 可选：构建路径后的局部搜索（如 tsp_local_search.LocalSearch）
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        if candidates is None:
+            self.cand = None
+            self.dist = distance_matrix(self.cities)
+            with np.errstate(divide="ignore"):
+                self.eta = 1.0 / self.dist          # 启发式信息 η = 1/d
+            np.fill_diagonal(self.eta, 0.0)
+        else:
+            # 候选表模式：只保存每个城市 k 近邻上的距离与启发式信息
+            self.cand, self.cand_dist = nearest_neighbours(self.cities, candidates)
+            self.eta_cand = 1.0 / np.maximum(self.cand_dist, 1e-12)
+        if storage == "compact":
+            if self.cand is None:
+                raise ValueError("compact pheromone storage requires candidate lists")
+            self.eta_cand = self.eta_cand.astype(dtype or np.float32)
+        elif storage != "dense":
+            raise ValueError(f"unknown pheromone storage: {storage!r}")
+
+        self.nn_length = float(self.tour_lengths(self.nearest_neighbour_tour())[0])
+        if tau0 is None:
+            # 常用初值：m / L_nn，L_nn 为最近邻路径长度
+            tau0 = self.n_ants / self.nn_length
+        if storage == "compact":
+            self.pheromone = CompactPheromone(self.cand, tau0, dtype=dtype or np.float32)
+        else:
+            self.pheromone = DensePheromone(self.n, tau0, dtype=dtype or np.float64)
+
+        # 信息素更新策略：AS / 精英 / 排序 / MAX-MIN
+        self.update = update if update is not None else AntSystemUpdate()
+        self.update.initialize(self)
+
+        self.best_tour = None
+        self.best_length = np.inf
+        self.history = []      # 每次迭代后的全局最优长度
+        self.iteration = 0
+
+    def tour_lengths(self, tours):
+        tours = np.atleast_2d(tours)
+        if self.cand is None:
+            return tour_lengths(self.dist, tours)
+        step = self.cities[np.roll(tours, -1, axis=1)] - self.cities[tours]
+        return np.sqrt((step ** 2).sum(axis=-1)).sum(axis=1)
+
+    def distances_from(self, idx):
+        # 若干城市到所有城市的距离 (len(idx), n)
+        if self.cand is None:
+            return self.dist[idx]
+        diff = self.cities[idx][:, None, :] - self.cities[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=-1))
+
+    def nearest_neighbour_tour(self, start=0):
+        tour = [start]
+        visited = np.zeros(self.n, dtype=bool)
+        visited[start] = True
+        for _ in range(self.n - 1):
+            cur = tour[-1]
+            if self.cand is not None:
+                # 候选表按距离升序，第一个未访问的候选即最近邻
+                free = ~visited[self.cand[cur]]
+                if free.any():
+                    nxt = int(self.cand[cur][np.argmax(free)])
+                    tour.append(nxt)
+                    visited[nxt] = True
+                    continue
+            d = np.where(visited, np.inf, self.distances_from([cur])[0])
+            nxt = int(np.argmin(d))
+            tour.append(nxt)
+            visited[nxt] = True
+        return np.array(tour)
+
+    def choice_weights(self):
+        # 转移矩阵的分子 [τ_ij]^α · [η_ij]^β；候选表模式下只在 (n, k) 候选边上计算
+        if self.cand is None:
+            return self.pheromone.data ** self.alpha * self.eta ** self.beta
+        tau = self.pheromone.candidate_values(self.cand)
+        return tau ** self.alpha * self.eta_cand ** self.beta
+
+    def construct_tours(self):
+        if self.cand is not None:
+            return self.construct_tours_candidates()
+        m, n = self.n_ants, self.n
+        rows = np.arange(m)
+
+        # 城市按块划分：轮盘赌先在块和上选块，再在块内选城市，
+        # 避免每一步对整行 n 个权重做累加
+        block = max(1, int(np.ceil(np.sqrt(n))))
+        n_blocks = -(-n // block)
+        width = n_blocks * block
+        # 概率只与行内比例有关，按行最大值归一化后再转 float32，避免下溢
+        w_full = self.choice_weights()
+        row_max = w_full.max(axis=1, keepdims=True)
+        row_max[row_max <= 0.0] = 1.0
+        weights = np.zeros((n, width), dtype=np.float32)
+        weights[:, :n] = w_full / row_max
+
+        tours = np.empty((m, n), dtype=np.intp)
+        free = np.zeros((m, width), dtype=np.float32)  # 1 表示尚未访问
+        free[:, :n] = 1.0
+        if self.start is None:
+            current = self.rng.integers(n, size=m)
+        else:
+            current = np.full(m, self.start, dtype=np.intp)
+        tours[:, 0] = current
+        free[rows, current] = 0.0
+
+        for step in range(1, n):
+            # 每只蚂蚁取出当前城市的一行权重，屏蔽已访问城市，按轮盘赌选择下一城市
+            w = weights[current]
+            w *= free
+            blocks = w.reshape(m, n_blocks, block)
+            block_sum = blocks.sum(axis=2)
+            block_cum = np.cumsum(block_sum, axis=1)
+            r = self.rng.random(m) * block_cum[:, -1]
+            b = np.minimum((block_cum <= r[:, None]).sum(axis=1), n_blocks - 1)
+            r -= block_cum[rows, b] - block_sum[rows, b]
+            inner = np.cumsum(blocks[rows, b], axis=1)
+            nxt = b * block + np.minimum((inner <= r[:, None]).sum(axis=1), block - 1)
+
+            # 权重全部下溢为 0（或舍入落到已访问城市）时，退化为选择权重最大的未访问城市
+            dead = free[rows, nxt] == 0.0
+            if dead.any():
+                nxt[dead] = np.argmax(np.where(free[dead] > 0.0, w[dead], -1.0), axis=1)
+
+            tours[:, step] = nxt
+            free[rows, nxt] = 0.0
+            current = nxt
+        return tours
+
+    def construct_tours_candidates(self):
+        # 蚂蚁只在当前城市的 k 个候选城市中按轮盘赌选择；
+        # 候选全部访问过时才对所有未访问城市做一次全扫描，取 [τ]^α·[η]^β 最大者
+        m, n = self.n_ants, self.n
+        rows = np.arange(m)
+        weights = self.choice_weights()
+
+        tours = np.empty((m, n), dtype=np.intp)
+        visited = np.zeros((m, n), dtype=bool)
+        if self.start is None:
+            current = self.rng.integers(n, size=m)
+        else:
+            current = np.full(m, self.start, dtype=np.intp)
+        tours[:, 0] = current
+        visited[rows, current] = True
+
+        for step in range(1, n):
+            cand = self.cand[current]
+            w = np.where(visited[rows[:, None], cand], 0.0, weights[current])
+            cum = np.cumsum(w, axis=1)
+            r = self.rng.random(m) * cum[:, -1]
+            pick = np.minimum((cum <= r[:, None]).sum(axis=1), cand.shape[1] - 1)
+            nxt = cand[rows, pick]
+
+            stuck = visited[rows, nxt]
+            if stuck.any():
+                nxt[stuck] = self.best_unvisited(current[stuck], visited[stuck])
+
+            tours[:, step] = nxt
+            visited[rows, nxt] = True
+            current = nxt
+        return tours
+
+    def best_unvisited(self, current, visited):
+        # 全扫描：在所有未访问城市中选择 [τ]^α·[η]^β 最大者
+        if self.cand is None:
+            d2 = self.dist[current] ** 2
+        else:
+            # 分量分开计算，避免 (m, n, 2) 的中间数组
+            x, y = self.cities[:, 0], self.cities[:, 1]
+            dx = x - x[current][:, None]
+            dy = y - y[current][:, None]
+            d2 = dx * dx + dy * dy
+        if isinstance(self.pheromone, CompactPheromone):
+            # 候选边都已访问，其余边的 τ 都等于基准值，最大者就是最近的未访问城市
+            return np.argmin(np.where(visited, np.inf, d2), axis=1)
+        with np.errstate(divide="ignore"):
+            w = self.pheromone.rows(current) ** self.alpha / d2 ** (0.5 * self.beta)
+        return np.argmax(np.where(visited, -1.0, w), axis=1)
+
+    def update_pheromone(self, tours, lengths):
+        # τ_ij(t+1) = (1-ρ)·τ_ij(t) + Σ_k Δτ_ij^k，具体沉积方式由更新策略决定
+        self.update.update(self, tours, lengths)
+
+    def evaporate(self):
+        self.pheromone.evaporate(1.0 - self.rho)
+
+    def deposit(self, tours, amounts):
+        # 沿每条路径的所有边（对称）批量沉积信息素
+        tours = np.atleast_2d(tours)
+        src = tours.ravel()
+        dst = np.roll(tours, -1, axis=1).ravel()
+        amount = np.repeat(np.broadcast_to(amounts, (len(tours),)), tours.shape[1])
+        self.pheromone.deposit(src, dst, amount)
+
+    def step(self):
+        tours = self.construct_tours()
+        if self.local_search is not None:
+            tours = np.array([self.local_search.improve(tour) for tour in tours])
+        lengths = self.tour_lengths(tours)
+        best = int(np.argmin(lengths))
+        if lengths[best] < self.best_length:
+            self.best_length = float(lengths[best])
+            self.best_tour = tours[best].copy()
+        self.update_pheromone(tours, lengths)
+        self.iteration += 1
+        self.history.append(self.best_length)
+        return tours, lengths
+
+    def run(self, n_iterations):
+        for _ in range(n_iterations):
+            self.step()
+        return self.best_tour, self.best_length
@@ -0,0 +1,115 @@
+import multiprocessing as mp
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from aco_engine import AntSystem
+
+# 岛屿模型：多个蚁群在各自的进程中独立迭代，每隔 K 轮交换一次信息。
+# 每个岛屿的信息素矩阵放在共享内存中，交换时无需在进程间复制整个矩阵：
+#   migration="best"  环形拓扑，每个岛屿接收上一个岛屿的最优路径并沿其沉积信息素
+#   migration="blend" 每个岛屿的信息素向所有岛屿的平均值混合 τ_i ← (1-w)·τ_i + w·mean(τ)
+
+
+class IslandResult:
+    def __init__(self, island_tours, island_lengths, history, snapshots):
+        self.island_tours = island_tours          # (I, n) 各岛屿最终最优路径
+        self.island_lengths = island_lengths      # (I,)
+        self.history = history                    # (I, 迭代次数) 各岛屿每轮后的最优长度
+        self.snapshots = snapshots                # (I, 交换次数, n) 每次交换前各岛屿的最优路径
+        best = int(np.argmin(island_lengths))
+        self.best_tour = island_tours[best]
+        self.best_length = float(island_lengths[best])
+
+
+# 工作进程内的共享状态，由 ProcessPoolExecutor 的 initializer 在进程创建时设置
+_shared = {}
+
+
+def _init_worker(barrier, tau_buf, tour_buf, length_buf, n_islands, tau_shape, tau_dtype):
+    _shared["barrier"] = barrier
+    _shared["taus"] = np.frombuffer(tau_buf, dtype=tau_dtype).reshape((n_islands,) + tau_shape)
+    _shared["tours"] = np.frombuffer(tour_buf, dtype=np.int64).reshape(n_islands, -1)
+    _shared["lengths"] = np.frombuffer(length_buf, dtype=np.float64)
+
+
+def _run_island(island, cities, seed, n_iterations, exchange_every, migration, blend, colony_kwargs):
+    barrier = _shared["barrier"]
+    taus, tours, lengths = _shared["taus"], _shared["tours"], _shared["lengths"]
+    n_islands = len(lengths)
+
+    colony = AntSystem(cities, rng=np.random.default_rng(seed), **colony_kwargs)
+    # 信息素数组换成共享内存上的视图；引擎对 τ 的更新都是原地操作
+    taus[island] = colony.pheromone.data
+    colony.pheromone.data = taus[island]
+
+    snapshots = []
+    while True:
+        for _ in range(min(exchange_every, n_iterations - colony.iteration)):
+            colony.step()
+        snapshots.append(colony.best_tour.copy())
+
+        # 发布本岛最优路径；最后一轮之后不再交换
+        tours[island] = colony.best_tour
+        lengths[island] = colony.best_length
+        if colony.iteration >= n_iterations:
+            break
+        barrier.wait()      # 等待所有岛屿到达交换点
+        if migration == "best":
+            src = (island - 1) % n_islands
+            migrant, migrant_length = tours[src].copy(), float(lengths[src])
+            barrier.wait()      # 所有岛屿读完之后才允许下一次发布
+            colony.deposit(migrant, colony.q / migrant_length)
+            if migrant_length < colony.best_length:
+                colony.best_tour, colony.best_length = migrant, migrant_length
+        else:
+            # 紧凑存储的延迟衰减因子先乘回数组，共享内存里才是真实的 τ
+            colony.pheromone.normalize()
+            barrier.wait()
+            mean = taus.mean(axis=0)
+            barrier.wait()      # 所有岛屿算完平均值之后才允许写回
+            colony.pheromone.data *= 1.0 - blend
+            colony.pheromone.data += blend * mean
+    return colony.history, np.array(snapshots)
+
+
+def run_islands(cities, n_islands=4, n_iterations=100, exchange_every=10, migration="best",
+                blend=0.1, seed=None, **colony_kwargs):
+    if migration not in ("best", "blend"):
+        raise ValueError(f"unknown migration mode: {migration!r}")
+    cities = np.asarray(cities, dtype=np.float64)
+    n = len(cities)
+    if colony_kwargs.get("storage", "dense") == "compact":
+        tau_shape = (n, min(colony_kwargs["candidates"], n - 1))
+        tau_dtype = np.dtype(colony_kwargs.get("dtype") or np.float32)
+    else:
+        tau_shape = (n, n)
+        tau_dtype = np.dtype(colony_kwargs.get("dtype") or np.float64)
+    seeds = np.random.SeedSequence(seed).spawn(n_islands)
+
+    ctx = mp.get_context()
+    barrier = ctx.Barrier(n_islands)
+    tau_buf = ctx.RawArray("b", n_islands * int(np.prod(tau_shape)) * tau_dtype.itemsize)
+    tour_buf = ctx.RawArray("q", n_islands * n)
+    length_buf = ctx.RawArray("d", n_islands)
+
+    # 所有岛屿必须同时运行才能在交换点会合，因此每个岛屿独占一个工作进程
+    with ProcessPoolExecutor(max_workers=n_islands, mp_context=ctx, initializer=_init_worker,
+                             initargs=(barrier, tau_buf, tour_buf, length_buf, n_islands, tau_shape,
+                                       tau_dtype)) as pool:
+        futures = [pool.submit(_run_island, i, cities, seeds[i], n_iterations, exchange_every,
+                               migration, blend, colony_kwargs)
+                   for i in range(n_islands)]
+        # 任一岛屿出错时打断屏障，避免其余岛屿永远等待
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = [f for f in done if f.exception() is not None]
+        if failed:
+            barrier.abort()
+            raise failed[0].exception()
+        results = [f.result() for f in futures]
+
+    tours = np.frombuffer(tour_buf, dtype=np.int64).reshape(n_islands, n).copy()
+    lengths = np.frombuffer(length_buf, dtype=np.float64).copy()
+    history = np.array([h for h, _ in results])
+    snapshots = np.array([s for _, s in results])
+    return IslandResult(tours, lengths, history, snapshots)
@@ -0,0 +1,81 @@
+from manim import *
+import numpy as np
+
+
+class TourPlayback(Animation):
+    # 蚂蚁沿城市序列依次移动，同时逐段画出走过的边。
+    # 整条路径是一个动画、一次 self.play，每条边分到相同的时间
+    def __init__(self, ant, points, edge_rate_func=smooth, run_time_per_edge=0.5,
+                 path_config=None, **kwargs):
+        points = np.array([np.asarray(p, dtype=np.float64) for p in points])
+        self.ant = ant
+        self.path = VMobject(**(path_config or {}))
+        self.path.set_points_as_corners(points)
+        self.starts, self.ends = points[:-1], points[1:]
+        self.n_edges = len(points) - 1
+        self.edge_rate_func = edge_rate_func
+        kwargs.setdefault("run_time", run_time_per_edge * self.n_edges)
+        super().__init__(VGroup(self.path, ant), rate_func=linear, **kwargs)
+
+    def begin(self):
+        self.full_path = self.path.copy()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = alpha * self.n_edges
+        k = min(int(t), self.n_edges - 1)
+        a = self.edge_rate_func(t - k)
+        self.ant.move_to(interpolate(self.starts[k], self.ends[k], a))
+        self.path.pointwise_become_partial(self.full_path, 0, (k + a) / self.n_edges)
+
+
+class PheromoneField(VGroup):
+    # 信息素场：所有候选边画在少数几个 VMobject 中。
+    # 按 τ 的相对大小把边分成 levels 档，每档一个 VMobject，该档所有边是它的子路径，
+    # 线宽与透明度随档位递增；一个 updater 每帧读取最新的 τ 并重新分档
+    def __init__(self, points, edges, values, levels=8, max_width=8, min_opacity=0.1,
+                 color=BLUE, live=True, **kwargs):
+        super().__init__(**kwargs)
+        points = np.array([np.asarray(p, dtype=np.float64) for p in points])
+        self.edges = np.asarray(edges, dtype=np.intp)
+        self.values = values            # 无参函数，返回每条边当前的 τ (E,)
+        self.levels = levels
+        # 每条边是一段直线贝塞尔曲线：起点、两个三等分控制点、终点
+        a, b = points[self.edges[:, 0]], points[self.edges[:, 1]]
+        self.curves = np.stack([a, (2 * a + b) / 3, (a + 2 * b) / 3, b], axis=1)
+        self.last_values = None
+        for k in range(levels):
+            level = (k + 1) / levels
+            self.add(VMobject(stroke_color=color, stroke_width=max_width * level,
+                              stroke_opacity=min_opacity + (1 - min_opacity) * level))
+        self.refresh()
+        if live:
+            self.add_updater(lambda m: m.refresh())
+
+    @classmethod
+    def from_colony(cls, colony, points, **kwargs):
+        # 候选表模式只画候选边，否则画所有城市对
+        if colony.cand is None:
+            i, j = np.triu_indices(colony.n, k=1)
+        else:
+            i = np.repeat(np.arange(colony.n), colony.cand.shape[1])
+            j = colony.cand.ravel()
+            # 非对称的近邻关系也要保留，只去掉重复的 (i, j)/(j, i)
+            pairs = np.unique(np.sort(np.stack([i, j], axis=1), axis=1), axis=0)
+            i, j = pairs[:, 0], pairs[:, 1]
+        return cls(points, np.stack([i, j], axis=1), lambda: colony.pheromone.values(i, j), **kwargs)
+
+    def refresh(self):
+        values = np.asarray(self.values(), dtype=np.float64)
+        if self.last_values is not None and np.array_equal(values, self.last_values):
+            return self
+        self.last_values = values.copy()
+        top = values.max() if len(values) else 0.0
+        scale = self.levels / top if top > 0 else 0.0
+        level = np.minimum((values * scale).astype(np.intp), self.levels - 1)
+        order = np.argsort(level, kind="stable")
+        bounds = np.searchsorted(level[order], np.arange(self.levels + 1))
+        for k, mob in enumerate(self.submobjects):
+            idx = order[bounds[k]:bounds[k + 1]]
+            mob.set_points(self.curves[idx].reshape(-1, 3))
+        return self
@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from aco_visuals import PheromoneField, TourPlayback
+from scene_base import BaseScene
+from text_cache import CachedText as Text
+from traces import trace
+
 # 自定义支持中文的LaTeX模板
 class ChineseTexTemplate(TexTemplate):
     def __init__(self):
@@ -11,12 +16,27 @@ class ChineseTexTemplate(TexTemplate):
 \usepackage{amssymb}
 """)
 
-class AntColonyAlgorithm(Scene):
+def island_panels(cities, islands, width=3.0):
+    # 各岛屿的最优路径并排显示，每个面板下方标注路径长度（islands 为 trace("islands") 的轨迹）
+    panels = VGroup()
+    for i, (tour, length) in enumerate(zip(islands["island_tours"], islands["island_lengths"])):
+        points = [np.array([x, y, 0]) for x, y in cities]
+        dots = VGroup(*[Dot(point=pt, color=RED, radius=0.1) for pt in points])
+        path = Polygon(*[points[j] for j in tour], color=BLUE, stroke_width=3)
+        panel = VGroup(path, dots).scale_to_fit_width(width)
+        label = Text(f"岛屿 {i+1}: L = {length:.2f}", font_size=24).next_to(panel, DOWN, buff=0.3)
+        panels.add(VGroup(panel, label))
+    return panels.arrange(RIGHT, buff=0.5)
+
+class AntColonyAlgorithm(BaseScene):
+    seed = 43
+
     def construct(self):
         # 设置中文LaTeX模板
         chinese_template = ChineseTexTemplate()
         
         # 第一部分：介绍
+        self.next_section("介绍")
         title = Text("蚁群算法 (Ant Colony Optimization)", font_size=48, color=YELLOW)
         subtitle = Text("一种模拟蚂蚁觅食行为的群体智能算法", font_size=36, color=BLUE)
         subtitle.next_to(title, DOWN, buff=0.5)
@@ -45,6 +65,7 @@ class AntColonyAlgorithm(Scene):
         self.play(FadeOut(intro_text), FadeOut(intro_title))
 
         # 第二部分：蚂蚁行为模拟 - 更详细的解释
+        self.next_section("觅食行为")
         behavior_title = Text("蚂蚁的觅食行为与信息素沟通", font_size=40, color=BLUE)
         self.play(Write(behavior_title))
         self.wait(1)
@@ -136,6 +157,7 @@ class AntColonyAlgorithm(Scene):
             FadeOut(behavior_title)
         )
         # 第三部分：算法公式 - 更详细的解释
+        self.next_section("数学模型")
         formula_title = Text("蚁群算法数学模型", font_size=40, color=GREEN)
         self.play(Write(formula_title))
         self.wait(1)
@@ -242,6 +264,7 @@ class AntColonyAlgorithm(Scene):
         self.play(FadeOut(param_effects), FadeOut(param_title), FadeOut(formula_title))
 
         # 第四部分：算法流程 - 更详细的步骤
+        self.next_section("算法流程")
         process_title = Text("蚁群算法基本流程", font_size=40, color=ORANGE)
         self.play(Write(process_title))
         self.wait(1)
@@ -286,6 +309,7 @@ class AntColonyAlgorithm(Scene):
         self.play(FadeOut(steps), FadeOut(flow_chart), FadeOut(process_title))
 
         # 第五部分：TSP示例 - 更详细的演示
+        self.next_section("TSP示例")
         tsp_title = Text("应用示例: 旅行商问题(TSP)", font_size=40, color=PURPLE)
         self.play(Write(tsp_title))
         self.wait(1)
@@ -297,10 +321,11 @@ class AntColonyAlgorithm(Scene):
         self.wait(2)
         self.play(problem_desc.animate.to_edge(DOWN))
         
-        # 创建城市（调整随机种子避免点太近）
-        np.random.seed(43)  # 改变种子避免C3和C8太近
-        n_cities = 8
-        cities = np.random.rand(n_cities, 2) * 5 - 2.5
+        # 蚁群算法先在场景外运行（4只蚂蚁都从C1出发，共50轮），这里只回放记录下的轨迹；
+        # 城市坐标也来自轨迹（由场景种子生成，任意两座城市相距不小于 0.8）
+        aco = trace("aco", n_cities=8, n_ants=4, n_iterations=50,
+                    alpha=1.0, beta=2.0, rho=0.5, start=0, seed=self.seed)
+        cities = aco["cities"].astype(np.float64)
         city_dots = VGroup()
         city_labels = VGroup()
         
@@ -326,36 +351,19 @@ class AntColonyAlgorithm(Scene):
         iteration_text = Text("迭代 1", font_size=28, color=YELLOW).to_corner(UR)
         self.play(Write(iteration_text))
         
-        # 第一次迭代：蚂蚁随机选择路径
+        # 第一次迭代：信息素均匀，蚂蚁主要依据距离启发式选择路径
+        tours = aco["tours"][0]
         all_paths = VGroup()
-        for ant in ants:
-            # 随机生成一条路径
-            path_order = [0] + list(np.random.permutation(range(1, n_cities))) + [0]
-            ant_path = VGroup()
-            
-            for i in range(len(path_order)-1):
-                start_idx = path_order[i]
-                end_idx = path_order[i+1]
-                
-                line = Line(
-                    city_dots[start_idx].get_center(),
-                    city_dots[end_idx].get_center(),
-                    color=YELLOW,
-                    stroke_width=2,
-                    stroke_opacity=0.6
-                )
-                ant_path.add(line)
-                
-                # 创建路径动画
-                self.play(
-                    ant.animate.move_to(city_dots[end_idx].get_center()),
-                    Create(line),
-                    run_time=0.5
-                )
-            
-            all_paths.add(ant_path)
-            # 返回起点
-            self.play(ant.animate.move_to(city_dots[0].get_center()), run_time=0.3)
+        for ant, tour in zip(ants, tours):
+            path_order = list(tour) + [tour[0]]
+            # 整条路径一次播放：蚂蚁依次经过各城市并回到起点，边随之逐段画出
+            playback = TourPlayback(
+                ant,
+                [city_dots[j].get_center() for j in path_order],
+                path_config=dict(color=YELLOW, stroke_width=2, stroke_opacity=0.6)
+            )
+            self.play(playback)
+            all_paths.add(playback.path)
         
         self.wait(1)
         
@@ -367,51 +375,57 @@ class AntColonyAlgorithm(Scene):
         # 第二次迭代：基于信息素选择路径
         self.play(FadeOut(all_paths))
         
-        # 模拟信息素更新后的路径选择（短路径更可能被选择）
-        best_path_indices = [0, 3, 1, 5, 2, 7, 4, 6, 0]  # 预设一条较好的路径
-        
-        for ant in ants:
-            # 80%概率选择较好路径，20%概率探索新路径
-            if np.random.random() < 0.8:
-                path_order = best_path_indices
-            else:
-                path_order = [0] + list(np.random.permutation(range(1, n_cities))) + [0]
-                
-            ant_path = VGroup()
-            
-            for i in range(len(path_order)-1):
-                start_idx = path_order[i]
-                end_idx = path_order[i+1]
-                
-                line = Line(
-                    city_dots[start_idx].get_center(),
-                    city_dots[end_idx].get_center(),
-                    color=BLUE,
-                    stroke_width=3,
-                    stroke_opacity=0.7
-                )
-                ant_path.add(line)
-                
-                self.play(
-                    ant.animate.move_to(city_dots[end_idx].get_center()),
-                    Create(line),
-                    run_time=0.5
-                )
-            
-            all_paths.add(ant_path)
-            self.play(ant.animate.move_to(city_dots[0].get_center()), run_time=0.3)
+        # 信息素更新后的路径选择（短路径上信息素更浓，更可能被选择）
+        tours = aco["tours"][1]
+        all_paths = VGroup()
+        
+        for ant, tour in zip(ants, tours):
+            path_order = list(tour) + [tour[0]]
+            playback = TourPlayback(
+                ant,
+                [city_dots[j].get_center() for j in path_order],
+                path_config=dict(color=BLUE, stroke_width=3, stroke_opacity=0.7)
+            )
+            self.play(playback)
+            all_paths.add(playback.path)
         
         self.wait(1)
         
-        # 最终最优路径
+        # 信息素场：所有城市对之间的边合并绘制，线宽与透明度取自轨迹中记录的 τ
+        # （shown[0] 为当前显示的轮次，第 k 行是第 k 轮迭代之后的 τ）
+        shown = [2]
+        pheromone_field = PheromoneField(
+            [dot.get_center() for dot in city_dots], aco["edges"],
+            lambda: aco["pheromone"][shown[0]]
+        )
+        self.play(FadeOut(all_paths), FadeIn(pheromone_field))
+        self.bring_to_front(city_dots, ants)
+
+        # 继续迭代直到收敛（共50轮），信息素场随迭代逐帧刷新，最后取全局最优路径
+        n_iterations = len(aco["tours"])
+
+        def show_iteration(m, alpha):
+            shown[0] = 2 + round(alpha * (n_iterations - 2))
+
+        self.play(UpdateFromAlphaFunc(pheromone_field, show_iteration), run_time=4)
+        self.wait(1)
+
+        # 最终最优路径：与 Held-Karp 精确解比较，只有差距为0时才称为最优
+        gap, exact = float(aco["gap"]), bool(aco["exact"])
+        if exact and gap < 1e-6:
+            result_text = Text("找到最优路径!", font_size=28, color=GREEN)
+        elif exact:
+            result_text = Text(f"距最优解: +{100 * gap:.1f}%", font_size=28, color=ORANGE)
+        else:
+            result_text = Text(f"距下界: ≤{100 * gap:.1f}%", font_size=28, color=ORANGE)
         self.play(
-            FadeOut(all_paths),
+            FadeOut(pheromone_field),
             FadeOut(ants),
-            iteration_text.animate.become(Text("找到最优路径!", font_size=28, color=GREEN).to_corner(UR))
+            iteration_text.animate.become(result_text.to_corner(UR))
         )
         
         # 显示最优路径
-        optimal_order = [0, 3, 1, 5, 2, 7, 4, 6, 0]
+        optimal_order = list(aco["best_tour"]) + [aco["best_tour"][0]]
         optimal_path = VGroup()
         
         for i in range(len(optimal_order)-1):
@@ -437,6 +451,7 @@ class AntColonyAlgorithm(Scene):
         )
 
         # 第六部分：算法变种和改进
+        self.next_section("变种与改进")
         variants_title = Text("蚁群算法的变种与改进", font_size=40, color=GREEN)
         self.play(Write(variants_title))
         self.wait(1)
@@ -457,6 +472,7 @@ class AntColonyAlgorithm(Scene):
         self.play(FadeOut(variants), FadeOut(variants_title))
 
         # 第七部分：优点和应用（分两页显示）
+        self.next_section("优势与应用")
         # 优点部分
         advantages_title = Text("蚁群算法的优势与特点", font_size=40, color=BLUE)
         self.play(Write(advantages_title))
@@ -474,9 +490,19 @@ class AntColonyAlgorithm(Scene):
         
         self.play(Write(advantages))
         self.wait(3)
+
+        # 并行岛屿模型：4个蚁群在各自进程中独立搜索，每10轮交换一次最优路径；
+        # 与上面的蚁群一样先在场景外运行，这里只回放轨迹（城市与上面的相同）
+        self.play(FadeOut(advantages))
+        islands = trace("islands", n_cities=8, n_islands=4, n_iterations=30,
+                        exchange_every=10, n_ants=8, seed=self.seed)
+        panels = island_panels(cities, islands)
+        panels.scale_to_fit_width(config.frame_width - 1)
+        self.play(Create(panels), run_time=2)
+        self.wait(3)
         
         # 应用领域部分（下一页）
-        self.play(FadeOut(advantages), FadeOut(advantages_title))
+        self.play(FadeOut(panels), FadeOut(advantages_title))
         
         applications_title = Text("实际应用领域", font_size=40, color=GREEN)
         self.play(Write(applications_title))
@@ -499,6 +525,7 @@ class AntColonyAlgorithm(Scene):
         self.play(FadeOut(applications), FadeOut(applications_title))
 
         # 第八部分：总结与展望
+        self.next_section("总结")
         conclusion_title = Text("总结与展望", font_size=48, color=YELLOW)
         self.play(Write(conclusion_title))
         self.wait(1)
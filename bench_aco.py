@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import numpy as np
+
+from aco_engine import AntSystem, AntSystemUpdate, ElitistUpdate, MaxMinUpdate, RankBasedUpdate
+from tsp_exact import EXACT_LIMIT, reference as exact_reference
+from tsp_local_search import LocalSearch
+
+# 对比各信息素更新策略达到目标质量所需的迭代次数。
+# 实例与随机数均固定种子；目标质量 = 参考长度 × (1 + gap)。
+# 参考长度：城市数不超过 EXACT_LIMIT 时为 Held-Karp 精确最优值，否则为所有运行找到的最短路径
+
+
+VARIANTS = {
+    "AS": dict(rho=0.5, update=AntSystemUpdate),
+    "Elitist AS": dict(rho=0.5, update=ElitistUpdate),
+    "Rank-based AS": dict(rho=0.1, update=RankBasedUpdate),
+    "MAX-MIN AS": dict(rho=0.2, update=MaxMinUpdate),
+}
+
+
+def iterations_to_target(history, target):
+    hit = np.flatnonzero(np.asarray(history) <= target)
+    return int(hit[0]) + 1 if len(hit) else None
+
+
+def run_variant(cities, variant, seed, iterations, local_search=None):
+    params = dict(VARIANTS[variant])
+    update = params.pop("update")()
+    colony = AntSystem(cities, alpha=1.0, beta=2.0, update=update, local_search=local_search,
+                       rng=np.random.default_rng(seed), **params)
+    start = time.perf_counter()
+    colony.run(iterations)
+    return colony.history, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ACO 信息素更新策略收敛速度对比")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 30, 60])
+    parser.add_argument("--instances", type=int, default=3, help="每个规模的实例数")
+    parser.add_argument("--runs", type=int, default=3, help="每个实例的独立运行次数")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--gap", type=float, default=0.02, help="目标质量相对最优的允许差距")
+    parser.add_argument("--local-search", action="store_true", help="每只蚂蚁构建路径后做 2-opt + Or-opt")
+    args = parser.parse_args()
+
+    print(f"{'n':>5} {'variant':<15} {'hit':>7} {'iters':>8} {'final gap':>10} {'s/run':>8}")
+    for n in args.sizes:
+        results = {v: [] for v in VARIANTS}
+        instances = [np.random.default_rng(1000 + n + i).random((n, 2)) for i in range(args.instances)]
+        for i, cities in enumerate(instances):
+            local_search = LocalSearch(cities) if args.local_search else None
+            for variant in VARIANTS:
+                for run in range(args.runs):
+                    results[variant].append(
+                        (i,) + run_variant(cities, variant, run, args.iterations, local_search))
+
+        # 每个实例的参考长度：精确最优值，或所有策略、所有运行中的最短路径
+        if n <= EXACT_LIMIT:
+            reference = [exact_reference(cities)[0] for cities in instances]
+        else:
+            reference = [min(h[-1] for v in VARIANTS for j, h, _ in results[v] if j == i)
+                         for i in range(len(instances))]
+        for variant in VARIANTS:
+            iters, gaps, times = [], [], []
+            for i, history, seconds in results[variant]:
+                iters.append(iterations_to_target(history, reference[i] * (1.0 + args.gap)))
+                gaps.append(history[-1] / reference[i] - 1.0)
+                times.append(seconds)
+            hits = [it for it in iters if it is not None]
+            mean_iters = f"{np.mean(hits):8.1f}" if hits else f"{'-':>8}"
+            print(f"{n:>5} {variant:<15} {len(hits):>3}/{len(iters):<3} {mean_iters} "
+                  f"{100 * np.mean(gaps):9.2f}% {np.mean(times):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import time
+
+import numpy as np
+
+from objectives import OBJECTIVES
+from pso_engine import (GlobalTopology, ParticleSwarm, RandomTopology, RingTopology,
+                        VonNeumannTopology)
+
+# 对比各邻域拓扑达到目标适应度所需的函数评估次数（粒子数 × 迭代次数）。
+# 参数取常用的收缩因子设定 w = 0.7298, c1 = c2 = 1.49618，速度上限为搜索范围的一半
+
+TOPOLOGIES = {
+    "gbest": GlobalTopology,
+    "ring": RingTopology,
+    "von Neumann": VonNeumannTopology,
+    "random-3": RandomTopology,
+}
+
+# 各函数的目标适应度（D = 30 时的常用阈值）
+TARGETS = {
+    "sphere": 1e-2,
+    "rastrigin": 100.0,
+    "rosenbrock": 100.0,
+    "ackley": 0.1,
+    "griewank": 0.1,
+}
+
+
+def evaluations_to_target(history, n_particles, target):
+    hit = np.flatnonzero(np.asarray(history) <= target)
+    return (int(hit[0]) + 2) * n_particles if len(hit) else None
+
+
+def run_topology(function, topology, n_particles, dim, seed, iterations):
+    objective = OBJECTIVES[function](dim)
+    lo, hi = objective.bounds
+    swarm = ParticleSwarm(objective, n_particles=n_particles, dim=dim, w=0.7298, c1=1.49618,
+                          c2=1.49618, bounds=(lo, hi), v_bounds=((lo - hi) / 2, (hi - lo) / 2),
+                          v_max=(hi - lo) / 2, clip=True, topology=TOPOLOGIES[topology](),
+                          rng=np.random.default_rng(seed))
+    start = time.perf_counter()
+    swarm.run(iterations)
+    return swarm.history, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PSO 邻域拓扑收敛速度对比")
+    parser.add_argument("--functions", nargs="+", default=["sphere", "rastrigin", "ackley", "griewank"],
+                        choices=sorted(TARGETS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 400], help="粒子数")
+    parser.add_argument("--dim", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'function':<11} {'N':>5} {'topology':<12} {'hit':>7} {'evals':>10} {'final':>10} {'s/run':>7}")
+    for function in args.functions:
+        for n in args.sizes:
+            for topology in TOPOLOGIES:
+                evals, finals, times = [], [], []
+                for run in range(args.runs):
+                    history, seconds = run_topology(function, topology, n, args.dim, run,
+                                                    args.iterations)
+                    evals.append(evaluations_to_target(history, n, TARGETS[function]))
+                    finals.append(history[-1])
+                    times.append(seconds)
+                hits = [e for e in evals if e is not None]
+                mean_evals = f"{np.mean(hits):10.0f}" if hits else f"{'-':>10}"
+                print(f"{function:<11} {n:>5} {topology:<12} {len(hits):>3}/{len(evals):<3} {mean_evals} "
+                      f"{np.median(finals):10.3g} {np.mean(times):7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import time
+
+import numpy as np
+
+from hc_engine import HillClimber
+from objectives import OBJECTIVES
+from sa_engine import (AdaptiveCooling, Annealer, GeometricCooling, LogarithmicCooling,
+                       LundyMeesCooling)
+
+# 对比各降温策略在固定评估预算内达到目标能量所需的函数评估次数。
+# 每种设定同时跑 --chains 条独立的马尔可夫链，每条链每步计算一次新解的能量；
+# 几何与 Lundy-Mees 降温的参数按预算换算，使温度在预算用完时正好从 T_0 降到 T_end。
+# 随机重启的首次改进爬山算法作为基线（同样的预算按评估次数计），evals/s 为总评估吞吐量
+
+SCHEDULES = {
+    "geometric": lambda t0, t_end, budget: GeometricCooling((t_end / t0) ** (1.0 / budget)),
+    "logarithmic": lambda t0, t_end, budget: LogarithmicCooling(),
+    "lundy-mees": lambda t0, t_end, budget: LundyMeesCooling((1.0 / t_end - 1.0 / t0) / budget),
+    "adaptive": lambda t0, t_end, budget: AdaptiveCooling(decay=(0.02 / 0.5) ** (1.0 / budget)),
+}
+
+
+def maximize(objective):
+    # 爬山场景求的是最大值，取负后交给最小化的退火器
+    def negated(X):
+        return -objective(X)
+    negated.bounds = objective.bounds
+    return negated
+
+
+def grid_minimum(objective, points=100001):
+    lo, hi = objective.bounds
+    xs = np.linspace(lo, hi, points)
+    return float(objective(xs[:, None]).min())
+
+
+# 名称: (目标函数, 维数, 初始温度, 结束温度, 步长, 目标能量)；一维场景的目标为全局最小值 + 0.05
+LANDSCAPES = {
+    "annealing": lambda: (OBJECTIVES["annealing"](), 1, 10.0, 0.01, 1.0, None),
+    "hill": lambda: (maximize(OBJECTIVES["hill"]()), 1, 10.0, 0.01, 1.0, None),
+    "rastrigin-2": lambda: (OBJECTIVES["rastrigin"](2), 2, 10.0, 0.01, 0.5, 0.5),
+    "rastrigin-5": lambda: (OBJECTIVES["rastrigin"](5), 5, 10.0, 0.01, 0.3, 5.0),
+    "ackley-2": lambda: (OBJECTIVES["ackley"](2), 2, 5.0, 0.01, 2.0, 0.5),
+    "rosenbrock-2": lambda: (OBJECTIVES["rosenbrock"](2), 2, 10.0, 0.001, 0.2, 0.01),
+}
+
+
+def evaluations_to_target(annealer, budget, target):
+    # 每条链第一次达到目标的评估次数（初始解算 1 次，之后每步 1 次）；预算内未达到记为 0
+    hit = np.where(annealer.best_energy <= target, 1, 0)
+    for k in range(budget):
+        annealer.step()
+        newly = (hit == 0) & (annealer.best_energy <= target)
+        hit[newly] = k + 2
+    return hit
+
+
+def run_schedule(landscape, schedule, n_chains, budget, seed):
+    objective, dim, t0, t_end, step, target = LANDSCAPES[landscape]()
+    if target is None:
+        target = grid_minimum(objective) + 0.05
+    annealer = Annealer(objective, n_chains=n_chains, dim=dim, bounds=objective.bounds, step=step,
+                        t0=t0, schedule=SCHEDULES[schedule](t0, t_end, budget),
+                        dtype=np.float32, rng=np.random.default_rng(seed))
+    start = time.perf_counter()
+    hit = evaluations_to_target(annealer, budget, target)
+    return hit, annealer.best_energy, n_chains * (budget + 1), time.perf_counter() - start
+
+
+def run_hill_climbing(landscape, n_chains, budget, seed):
+    objective, dim, t0, t_end, step, target = LANDSCAPES[landscape]()
+    if target is None:
+        target = grid_minimum(objective) + 0.05
+    climber = HillClimber(objective, n_starts=n_chains, dim=dim, bounds=objective.bounds, step=step,
+                          min_step=step * 1e-3, mode="first", restart=True, dtype=np.float32,
+                          rng=np.random.default_rng(seed))
+    hit = np.where(climber.best_value <= target, 1, 0)
+    start = time.perf_counter()
+    while climber.evaluations.min() < budget:
+        climber.step()
+        newly = (hit == 0) & (climber.best_value <= target) & (climber.evaluations <= budget)
+        hit[newly] = climber.evaluations[newly]
+    return hit, climber.best_value, int(climber.evaluations.sum()), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟退火降温策略收敛速度对比")
+    parser.add_argument("--landscapes", nargs="+", default=list(LANDSCAPES), choices=sorted(LANDSCAPES))
+    parser.add_argument("--schedules", nargs="+", default=list(SCHEDULES), choices=list(SCHEDULES))
+    parser.add_argument("--chains", type=int, default=1000, help="独立链数")
+    parser.add_argument("--budget", type=int, default=2000, help="每条链的评估预算（步数）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'landscape':<13} {'schedule':<12} {'hit':>7} {'evals':>8} {'median E':>10} {'evals/s':>9} {'s':>6}")
+    for landscape in args.landscapes:
+        runs = [(schedule, run_schedule(landscape, schedule, args.chains, args.budget, args.seed))
+                for schedule in args.schedules]
+        runs.append(("hill-climb", run_hill_climbing(landscape, args.chains, args.budget, args.seed)))
+        for name, (hit, best, evaluations, seconds) in runs:
+            hits = hit[hit > 0]
+            median_evals = f"{np.median(hits):8.0f}" if len(hits) else f"{'-':>8}"
+            print(f"{landscape:<13} {name:<12} {len(hits) / len(hit):7.1%} {median_evals} "
+                  f"{np.median(best):10.3g} {evaluations / seconds:9.3g} {seconds:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+
+from manim import *
+
+# 草稿模式：调排版、调节奏时快速预览。所有 self.wait() 的时长乘以 wait_factor 且单次不超过 max_wait，
+# 其他动画的 run_time 乘以 run_time_factor；launcher 同时改用低分辨率、低帧率渲染。
+# 分段视频缓存照常开启，manim 按分辨率与帧率分目录存放，草稿与正式渲染各自命中，互不覆盖。
+#   python launcher.py render --draft AntColonyAlgorithm
+#   python launcher.py render --draft --max-wait 0.2 --run-time-factor 0.25 UserScene -- -p
+# 不经过 launcher 时设置环境变量 MANIM_DRAFT=1 即可（分辨率与帧率用 manim 的 -r、--fps 自行指定）。
+
+WAIT_FACTOR = 0.25
+RUN_TIME_FACTOR = 0.5
+MAX_WAIT = 0.5
+RESOLUTION = (640, 360)
+FRAME_RATE = 15
+# 环境变量名 -> Draft 的参数名
+ENVIRONMENT = {"MANIM_DRAFT_WAIT_FACTOR": "wait_factor", "MANIM_DRAFT_RUN_TIME_FACTOR": "run_time_factor",
+               "MANIM_DRAFT_MAX_WAIT": "max_wait"}
+
+
+class Draft:
+    def __init__(self, scene, wait_factor=WAIT_FACTOR, run_time_factor=RUN_TIME_FACTOR, max_wait=MAX_WAIT):
+        self.scene = scene
+        self.wait_factor = wait_factor
+        self.run_time_factor = run_time_factor
+        self.max_wait = max_wait
+
+    def run_time(self, animation):
+        if isinstance(animation, Wait):
+            return min(animation.run_time * self.wait_factor, self.max_wait)
+        # Succession / AnimationGroup 按整体时长插值，缩放整体即可，其中的 Wait 一起按比例缩短
+        return animation.run_time * self.run_time_factor
+
+    def install(self):
+        # play 与 wait 都经过 compile_animations，在 manim 计算总时长、判断静止等待之前改写 run_time
+        compile_animations = self.scene.compile_animations
+
+        def compile_scaled(*animations, **play_kwargs):
+            compiled = compile_animations(*animations, **play_kwargs)
+            for animation in compiled:
+                animation.run_time = self.run_time(animation)
+            return compiled
+
+        self.scene.compile_animations = compile_scaled
+
+
+def draft_mode(scene):
+    # 在场景的 setup 中调用（见 scene_base.py）；未开启草稿模式时返回 None
+    if os.environ.get("MANIM_DRAFT", "0") in ("", "0"):
+        return None
+    kwargs = {name: float(os.environ[key]) for key, name in ENVIRONMENT.items() if key in os.environ}
+    draft = Draft(scene, **kwargs)
+    draft.install()
+    logger.info(f"草稿模式：等待 ×{draft.wait_factor}（最长 {draft.max_wait} s），动画 ×{draft.run_time_factor}")
+    return draft
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class HillClimber:
+    # 向量化的爬山算法：M 个爬山者同时搜索，每步把所有爬山者的整个邻域拼成一个
+    # (M·K, D) 数组，一次调用 objective 算完。邻域为沿每个坐标轴 ±step 的 K = 2D 个点；
+    # 邻域中没有更优的点时步长乘以 shrink，步长小于 min_step 即认为到达局部最优。
+    #   mode="steepest"：移动到邻域中最好的点（最陡爬升）
+    #   mode="first"：按随机顺序检查邻域，移动到第一个更优的点（首次改进），
+    #                 evaluations 按逐个检查时实际需要的评估次数计
+    # maximize=True 时求最大值（爬山），否则求最小值。
+    # restart=True 时到达局部最优的爬山者在随机位置重新开始（随机重启），best_x 保留历史最优
+    def __init__(self, objective, n_starts=1, dim=1, x0=None, bounds=(0.0, 10.0), step=0.5,
+                 min_step=1e-3, shrink=0.5, mode="steepest", maximize=False, restart=False,
+                 dtype=np.float64, rng=None):
+        if mode not in ("steepest", "first"):
+            raise ValueError(f"未知的爬山方式: {mode}")
+        self.objective = objective
+        self.bounds = bounds
+        self.initial_step = step
+        self.min_step = min_step
+        self.shrink = shrink
+        self.mode = mode
+        self.sign = -1.0 if maximize else 1.0
+        self.restart = restart
+        self.dtype = np.dtype(dtype)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        if x0 is None:
+            x = self.rng.uniform(bounds[0], bounds[1], (n_starts, dim))
+        else:
+            x = np.broadcast_to(np.asarray(x0, dtype=np.float64), (n_starts, dim))
+        self.x = np.array(x, dtype=self.dtype)
+        self.n, self.dim = self.x.shape
+        self.value = self.evaluate(self.x)
+        self.step_sizes = np.full(self.n, step, dtype=self.dtype)   # 每个爬山者当前的步长
+        self.converged = np.zeros(self.n, dtype=bool)
+        self.evaluations = np.ones(self.n, dtype=np.int64)      # 每个爬山者累计的目标函数评估次数
+        self.moves = np.zeros(self.n, dtype=np.int64)           # 每个爬山者累计的移动次数
+        self.restarts = np.zeros(self.n, dtype=np.int64)
+
+        self.best_x = self.x.copy()
+        self.best_value = self.value.copy()
+        # 沿各坐标轴正负方向的单位向量 (K, D)
+        eye = np.eye(self.dim, dtype=self.dtype)
+        self._directions = np.concatenate((eye, -eye))
+        self.history = []        # 每次迭代后所有爬山者中的最优值
+        self.iteration = 0
+
+    def evaluate(self, x):
+        return np.asarray(self.objective(x), dtype=self.dtype)
+
+    def neighbours(self):
+        # (M, K, D)：每个爬山者的全部邻居，超出范围的截断到边界（与当前点重合时不会被选中）
+        nb = self.x[:, None, :] + self.step_sizes[:, None, None] * self._directions
+        return np.clip(nb, self.bounds[0], self.bounds[1], out=nb)
+
+    def step(self):
+        nb = self.neighbours()
+        m, k = nb.shape[:2]
+        values = self.evaluate(nb.reshape(m * k, self.dim)).reshape(m, k)
+        improving = self.sign * values < self.sign * self.value[:, None]
+        rows = np.arange(m)
+
+        if self.mode == "steepest":
+            choice = np.argmin(self.sign * values, axis=1)
+            moved = improving[rows, choice]
+            used = np.full(m, k)
+        else:
+            order = self.rng.permuted(np.broadcast_to(np.arange(k), (m, k)), axis=1)
+            ordered = np.take_along_axis(improving, order, axis=1)
+            first = np.argmax(ordered, axis=1)
+            moved = ordered[rows, first]
+            choice = order[rows, first]
+            used = np.where(moved, first + 1, k)
+
+        active = ~self.converged
+        moved &= active
+        self.evaluations += np.where(active, used, 0)
+        self.moves += moved
+        self.x = np.where(moved[:, None], nb[rows, choice], self.x)
+        self.value = np.where(moved, values[rows, choice], self.value)
+        self.step_sizes = np.where(active & ~moved, self.step_sizes * self.shrink, self.step_sizes).astype(self.dtype)
+        self.converged |= self.step_sizes < self.min_step
+
+        better = self.sign * self.value < self.sign * self.best_value
+        self.best_x = np.where(better[:, None], self.x, self.best_x)
+        self.best_value = np.where(better, self.value, self.best_value)
+
+        if self.restart and self.converged.any():
+            done = self.converged
+            self.x[done] = self.rng.uniform(self.bounds[0], self.bounds[1], (done.sum(), self.dim))
+            self.value[done] = self.evaluate(self.x[done])
+            self.evaluations += done
+            self.step_sizes[done] = self.initial_step
+            self.restarts += done
+            self.converged = np.zeros(self.n, dtype=bool)
+
+        self.iteration += 1
+        self.history.append(float(self.sign * np.min(self.sign * self.best_value)))
+        return moved
+
+    def run(self, max_iterations=1000):
+        # 不重启时所有爬山者都到达局部最优即停止
+        for _ in range(max_iterations):
+            self.step()
+            if not self.restart and self.converged.all():
+                break
+        best = int(np.argmin(self.sign * self.best_value))
+        return self.best_x[best], float(self.best_value[best])
+
+
+def basins(x, value, tolerance=0.05):
+    # 吸引盆统计：把终点相距不超过 tolerance 的爬山者归为同一个局部最优，
+    # 返回各局部最优的位置 (K, D)、函数值 (K,) 和落入该吸引盆的起点比例 (K,)，按比例从大到小排列
+    x = np.asarray(x, dtype=np.float64).reshape(len(x), -1)
+    value = np.asarray(value, dtype=np.float64)
+    label = np.full(len(x), -1)
+    centers = []
+    while (label < 0).any():
+        i = np.flatnonzero(label < 0)[0]
+        near = (label < 0) & (np.abs(x - x[i]).max(axis=1) <= tolerance)
+        label[near] = len(centers)
+        centers.append(i)
+    counts = np.bincount(label)
+    # 代表点取每个吸引盆中函数值居中的终点，避免离群点
+    idx = np.lexsort((value, label))
+    j = idx[np.searchsorted(label[idx], np.arange(len(centers))) + counts // 2]
+    order = np.argsort(-counts, kind="stable")
+    return x[j][order], value[j][order], counts[order] / len(x)
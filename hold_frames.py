@@ -0,0 +1,113 @@
+import os
+import tempfile
+from fractions import Fraction
+
+import av
+from manim import *
+from manim.scene.scene_file_writer import to_av_frame_rate
+from manim.utils.file_ops import is_png_format, write_to_movie
+
+# 静帧片段：场景中单独的、静止的 self.wait()（manim 判断没有更新函数，只光栅化一帧）
+# 原本仍要把同一帧交给编码器编码 N 次，wait(20) 在 60fps 下就是 1200 帧。
+# 这里只按 manim 分段视频的编码设置编码一段 1 秒的静帧（再加一段不足 1 秒的余数），
+# 然后把这段的压缩数据包平移时间戳、重复写入该分段视频（流复制），不再重新编码。
+# 无论等待多久，编码量都不超过 2 秒的画面；写出的文件与 manim 的其他分段编码参数相同，照常拼接。
+
+UNIT_SECONDS = 1.0
+# 短于此的等待照常编码
+MIN_SECONDS = 2.0
+
+
+def still_packets(path):
+    # 逐个读出片段中的数据包（跳过 demux 最后给出的空包），每次重新读取，数据包不能重复写入
+    with av.open(path) as source:
+        stream = source.streams.video[0]
+        for packet in source.demux(stream):
+            if packet.dts is not None:
+                yield packet
+
+
+class HoldFrames:
+    # 在场景的 setup 中创建并调用 install()（见 scene_base.py）
+    def __init__(self, scene, unit_seconds=UNIT_SECONDS, min_seconds=MIN_SECONDS):
+        self.scene = scene
+        self.renderer = scene.renderer
+        self.unit_seconds = unit_seconds
+        self.min_seconds = min_seconds
+        self.holding = False
+        self.holds = 0             # 走静帧路径的等待数
+        self.copied_frames = 0     # 没有经过编码器、直接复制的帧数
+
+    def eligible(self):
+        # 只处理 cairo 渲染、输出 libx264 视频（mp4/mov，不透明）时单独一个静止的 Wait
+        return (config.renderer == RendererType.CAIRO and write_to_movie() and not is_png_format()
+                and config.movie_file_extension in (".mp4", ".mov") and not config.transparent
+                and self.scene.is_current_animation_frozen_frame()
+                and self.scene.duration >= self.min_seconds)
+
+    def install(self):
+        renderer, writer = self.renderer, self.renderer.file_writer
+        begin, end, freeze = writer.begin_animation, writer.end_animation, renderer.freeze_current_frame
+
+        # 静帧的分段视频由 write_hold 整个写出，manim 不再为它打开编码器
+        def begin_animation(allow_write=False, file_path=None):
+            self.holding = allow_write and self.eligible()
+            if not self.holding:
+                begin(allow_write, file_path=file_path)
+
+        def end_animation(allow_write=False):
+            if not self.holding:
+                end(allow_write)
+            self.holding = False
+
+        def freeze_current_frame(duration):
+            if not self.holding:
+                return freeze(duration)
+            dt = 1 / renderer.camera.frame_rate
+            num_frames = int(duration / dt)
+            self.write_hold(renderer.get_frame(), num_frames, writer.partial_movie_files[renderer.num_plays])
+            renderer.time += num_frames * dt
+
+        writer.begin_animation = begin_animation
+        writer.end_animation = end_animation
+        renderer.freeze_current_frame = freeze_current_frame
+
+    def encode_still(self, frame, num_frames, path):
+        # 用 manim 自己打开分段视频的方法编码，编码器、像素格式、crf 与其他分段完全一致
+        writer = self.renderer.file_writer
+        writer.open_partial_movie_stream(file_path=path)
+        writer.write_frame(frame, num_frames=num_frames)
+        writer.close_partial_movie_stream()
+
+    def write_hold(self, frame, num_frames, path):
+        writer = self.renderer.file_writer
+        fps = to_av_frame_rate(config.frame_rate)
+        unit = max(1, round(self.unit_seconds * fps))
+        copies, rest = divmod(num_frames, unit)
+        with tempfile.TemporaryDirectory(dir=writer.partial_movie_directory) as tmp:
+            # [(片段文件, 帧数, 重复次数)]
+            clips = [(os.path.join(tmp, f"unit{config.movie_file_extension}"), unit, copies)]
+            if rest:
+                clips.append((os.path.join(tmp, f"rest{config.movie_file_extension}"), rest, 1))
+            for clip, frames, _ in clips:
+                self.encode_still(frame, frames, clip)
+
+            with av.open(path, mode="w") as output:
+                stream = None
+                start = 0          # 已写入的帧数
+                for clip, frames, repeat in clips:
+                    for _ in range(repeat):
+                        for packet in still_packets(clip):
+                            if stream is None:
+                                stream = output.add_stream(template=packet.stream)
+                            shift = round(Fraction(start) / fps / packet.time_base)
+                            packet.pts += shift
+                            packet.dts += shift
+                            packet.stream = stream
+                            output.mux(packet)
+                        start += frames
+        writer.partial_movie_file_path = path
+        self.holds += 1
+        self.copied_frames += num_frames - unit - rest
+        logger.info(f"Animation {self.renderer.num_plays} : 静帧 {num_frames} 帧，编码 {unit + rest} 帧，"
+                    f"其余复制 (hold: '{path}')")
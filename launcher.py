@@ -0,0 +1,135 @@
+import argparse
+import ast
+import os
+import sys
+
+# 场景启动器：只解析源码（AST）就能列出、检查各文件中的 Scene 子类，
+# 不导入 manim、也不执行场景文件；只有真正渲染时才导入 manim。
+#   python launcher.py list
+#   python launcher.py check
+#   python launcher.py render UserScene -- -ql -p
+#   python launcher.py render --draft AntColonyAlgorithm      草稿模式，见 draft.py
+#   python launcher.py render --jobs 8 AntColonyAlgorithm     分段并行渲染，见 parallel_render.py
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCENE_FILES = ["ant_colony_algorithm.py", "liziqun.py", "scene1.py"]
+# manim 中可直接继承的场景基类，以及本仓库的场景基类（scene_base.py）
+SCENE_BASES = {"Scene", "ThreeDScene", "MovingCameraScene", "ZoomedScene",
+               "VectorScene", "LinearTransformationScene", "SpecialThreeDScene", "BaseScene"}
+
+
+def base_name(node):
+    # Scene / manim.Scene 均取最后一段名字
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def parse(path):
+    with open(path, encoding="utf-8") as f:
+        return ast.parse(f.read(), filename=path)
+
+
+def scene_classes(tree):
+    # 顶层类中直接或间接（同一文件内）继承自场景基类的类
+    bases, scenes = set(SCENE_BASES), []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(base_name(b) in bases for b in node.bases):
+            bases.add(node.name)
+            scenes.append(node.name)
+    return scenes
+
+
+def side_effects(tree):
+    # 导入时就会执行的顶层调用（例如 scene.render()），不含 if __name__ == "__main__" 中的代码
+    found = []
+    for node in tree.body:
+        if isinstance(node, (ast.Expr, ast.Assign)) and any(
+                isinstance(n, ast.Call) for n in ast.walk(node.value)):
+            found.append(node.lineno)
+    return found
+
+
+def discover(files=SCENE_FILES):
+    # 返回 [(文件名, 场景类名)]
+    found = []
+    for name in files:
+        found.extend((name, scene) for scene in scene_classes(parse(os.path.join(ROOT, name))))
+    return found
+
+
+def find_scene(name, files=SCENE_FILES):
+    matches = [f for f, scene in discover(files) if scene == name]
+    if not matches:
+        raise SystemExit(f"未找到场景: {name}")
+    if len(matches) > 1:
+        raise SystemExit(f"场景 {name} 在多个文件中定义: {', '.join(matches)}")
+    return matches[0]
+
+
+def render(name, manim_args=(), draft=None, jobs=None):
+    # 交给 manim 的命令行处理画质、预览等参数；manim 只在这里导入
+    path = os.path.join(ROOT, find_scene(name))
+    if draft is not None:
+        # 场景在 setup 中读取这些环境变量；分辨率与帧率放在最前面，manim_args 中再指定时以后者为准
+        import draft as draft_settings
+        os.environ["MANIM_DRAFT"] = "1"
+        for key, setting in draft_settings.ENVIRONMENT.items():
+            if draft[setting] is not None:
+                os.environ[key] = str(draft[setting])
+        width, height = draft_settings.RESOLUTION
+        manim_args = ["-r", f"{width},{height}", "--fps", str(draft_settings.FRAME_RATE), *manim_args]
+    if jobs is not None:
+        from parallel_render import render_parallel
+        render_parallel(path, name, manim_args, jobs or None)
+        return
+    from manim.__main__ import main
+    main(args=["render", *manim_args, path, name], prog_name="manim")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列出、检查并渲染本仓库中的场景")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="列出所有场景")
+    sub.add_parser("check", help="检查场景文件在导入时是否有副作用")
+    render_parser = sub.add_parser("render", help="渲染一个场景")
+    render_parser.add_argument("--draft", action="store_true", help="草稿模式：缩短等待与动画，低分辨率、低帧率")
+    render_parser.add_argument("--wait-factor", type=float, help="草稿模式下等待时长的倍数")
+    render_parser.add_argument("--run-time-factor", type=float, help="草稿模式下动画时长的倍数")
+    render_parser.add_argument("--max-wait", type=float, help="草稿模式下单次等待的最长秒数")
+    render_parser.add_argument("--jobs", type=int,
+                               help="按 next_section 分段并行渲染的进程数，0 表示使用全部 CPU")
+    render_parser.add_argument("scene")
+    render_parser.add_argument("manim_args", nargs=argparse.REMAINDER,
+                               help="传给 manim render 的其他参数，如 -- -ql -p")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, scene in discover():
+            print(f"{scene:<24} {name}")
+    elif args.command == "check":
+        ok = True
+        for name in SCENE_FILES:
+            tree = parse(os.path.join(ROOT, name))
+            if not scene_classes(tree):
+                print(f"{name}: 没有场景类")
+                ok = False
+            for line in side_effects(tree):
+                print(f"{name}:{line}: 导入时会执行的顶层调用")
+                ok = False
+        if not ok:
+            sys.exit(1)
+        print("ok")
+    else:
+        extra = args.manim_args[1:] if args.manim_args[:1] == ["--"] else args.manim_args
+        draft = None
+        if args.draft:
+            draft = dict(wait_factor=args.wait_factor, run_time_factor=args.run_time_factor,
+                         max_wait=args.max_wait)
+        render(args.scene, extra, draft, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
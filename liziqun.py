@@ -2,6 +2,11 @@
 from manim import *
 import numpy as np
 
+from readout import Readout, atlas_source
+from scene_base import BaseScene
+from text_cache import CachedText as Text
+from traces import frame, trace
+
 # 配置参数（学习因子、惯性权重等）
 w = 1     # 惯性权重
 c1 = 1    # 个体学习因子
@@ -11,7 +16,9 @@ T_max = 5  # 最大迭代次数
         
 
 
-class UserScene(Scene):
+class UserScene(BaseScene):
+    seed = 0
+
     def construct(self):
         # 标题
         title = Text("粒子群优化算法 (PSO) 简介", font_size=40)
@@ -121,18 +128,11 @@ class UserScene(Scene):
         # ---------------------------
         # 3. 初始化粒子：随机位置 + 随机速度
         # ---------------------------
-        # 定义优化问题的目标函数（这里用简单的平方和，全局最优(0,0,0)）
-        def objective_func(pos):
-            x, y, z = pos
-            return x**2 + y**2
+        # 粒子群状态为 (N, 2) 数组；画面上的点取 z = 0
+        def to_point(pos):
+            return np.append(pos, 0.0)
 
-        # 初始化粒子群
-        
         particles = VGroup()
-        pbest_positions = []    # 个体历史最优位置
-        pbest_fitness = []      # 个体历史最优适应度
-        velocities = []         # 粒子速度
-        positions = []          # 粒子当前位置
 
         # 固定显示位置起点，适应度文本在左，个体最优适应度文本在右
         fitness_start = LEFT*4 + UP*3    # 适应度文本从左上角开始
@@ -142,28 +142,23 @@ class UserScene(Scene):
         vertical_spacing = 0.5
 
 
-        # 随机生成 N 个粒子的初始位置（2维）、初始速度
+        # 粒子群算法先在场景外运行，这里只回放记录下的每轮状态：
+        # 优化目标为简单的平方和（全局最优(0,0)）；
+        # 随机生成 N 个粒子的初始位置（[-3,3]）、初始速度（[-1,1]）；
+        # 初始时，个体最优 = 当前位置，群体最优（gbest）取其中最好的
+        pso = trace("pso", objective="sphere", n_particles=N, dim=2, n_iterations=T_max,
+                    w=w, c1=c1, c2=c2, bounds=(-3, 3), v_bounds=(-1, 1), seed=self.seed)
+        # 各轮要显示的 gbest 位置先全部登记，批量编译一次；
+        # 适应度与 pbest 用 Readout 显示，只需登记各前缀的字形表
+        self.tex_batch.add_tex(atlas_source())
         for i in range(N):
-            # 随机位置：在 [-5,5] 范围内
-            x = np.random.uniform(-3, 3)
-            y = np.random.uniform(-3, 3)
-            pos = np.array([x, y,0])  # 修改为二维向量
-            positions.append(pos)
-
-            # 随机速度：在 [-1,1] 范围内
-            vx = np.random.uniform(-1, 1)
-            vy = np.random.uniform(-1, 1)
-            vel = np.array([vx, vy,0])
-            velocities.append(vel)
-
-            # 初始时，个体最优 = 当前位置，适应度 = 当前函数值
-            pbest_positions.append(pos.copy())
-            pbest_fitness.append(objective_func(pos))
-
-        # 找到群体历史最优（gbest）
-        gbest_idx = np.argmin(pbest_fitness)
-        gbest_position = pbest_positions[gbest_idx].copy()
-        gbest_fitness = pbest_fitness[gbest_idx]
+            self.tex_batch.add_tex(atlas_source(f"$pbest_{i} =$"))
+        for t in range(T_max + 1):
+            self.tex_batch.add_tex(f"${to_point(frame(pso, t).gbest_position)}$")
+        self.tex_batch.compile()
+        swarm = frame(pso, 0)
+        gbest_position = to_point(swarm.gbest_position)
+        gbest_fitness = swarm.gbest_fitness
 
         # 创建粒子（Dot）和速度箭头（Arrow）
         particle_dots = VGroup()
@@ -171,37 +166,38 @@ class UserScene(Scene):
         velocity_arrows = VGroup()
         fitness_texts = VGroup()   # 显示每个粒子的适应度
         pbest_texts = VGroup()    # 显示每个粒子的 pbest 适应度
-        gbest_text = VGroup(Text("群体最优：位置 =", font_size=20,color=YELLOW), Tex(f"${gbest_position}$", font_size=30,color=YELLOW),Text(", 适应度 =", font_size=20,color=YELLOW), Tex(f"${gbest_fitness:.2f}$", font_size=30,color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(UP)
+        gbest_text = VGroup(Text("群体最优：位置 =", font_size=20,color=YELLOW), Tex(f"${gbest_position}$", font_size=30,color=YELLOW),Text(", 适应度 =", font_size=20,color=YELLOW), Readout(gbest_fitness, font_size=30, color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(UP)
         
         # Text(f"群体最优：位置 = {gbest_position}, 适应度 = {gbest_fitness:.2f}", 
         #                   font_size=20, color=YELLOW).to_edge(UP)
 
         for i in range(N):
             # 创建粒子（蓝色圆点）
-            dot = Dot(point=positions[i], radius=0.15, color=BLUE)
+            pos = to_point(swarm.positions[i])
+            dot = Dot(point=pos, radius=0.15, color=BLUE)
             particle_dots.add(dot)
             number_text = Text(str(i), font_size=20,color=BLACK).move_to(dot.get_center())
             particle_index.add(number_text)
 
             # 创建速度箭头（从粒子指向 速度方向）
-            te=velocities[i]
+            te=to_point(swarm.velocities[i])
             vel_arrow = Arrow(
-                start=positions[i], 
-                end=positions[i] + te/ np.linalg.norm(te),  # 单位向量方便看
+                start=pos, 
+                end=pos + te/ np.linalg.norm(te),  # 单位向量方便看
                 buff=0, color=GREEN
             )
             velocity_arrows.add(vel_arrow)
 
             # 显示当前适应度
-            fit_text = VGroup(Text(f"适应度_{i} =",font_size=20),Tex(f"${objective_func(positions[i]):.2f}$",font_size=25)).arrange(RIGHT, buff=0.5).next_to(fitness_start - i*vertical_spacing*UP, LEFT)
+            fit_text = VGroup(Text(f"适应度_{i} =",font_size=20),Readout(swarm.fitness[i], font_size=25)).arrange(RIGHT, buff=0.5).next_to(fitness_start - i*vertical_spacing*UP, LEFT)
             # Text(f"适应度_{i} = {objective_func(positions[i]):.2f}", 
             #                font_size=16).next_to(dot, UP)
             
             fitness_texts.add(fit_text)
 
             # 显示个体最优适应度
-            pbest_fit_text = Tex(f"$pbest_{i} = {pbest_fitness[i]:.2f}$", 
-                                 font_size=25, color=ORANGE).next_to(pbest_start - i*vertical_spacing*UP, LEFT)
+            pbest_fit_text = Readout(swarm.pbest_fitness[i], prefix=f"$pbest_{i} =$",
+                                     font_size=25, color=ORANGE).next_to(pbest_start - i*vertical_spacing*UP, LEFT)
             pbest_texts.add(pbest_fit_text)
 
         # 把所有粒子、箭头、文字加入场景
@@ -234,54 +230,27 @@ class UserScene(Scene):
             # particle_index=VGroup()
 
 
-            # 遍历每个粒子，更新速度、位置、适应度、pbest/gbest
+            # 整个粒子群一次更新：
+            #   v_new = w*v_old + c1*r1*(pbest - x_old) + c2*r2*(gbest - x_old)
+            #   x_new = x_old + v_new
+            # 然后计算新适应度，更新个体最优 (pbest) 与群体最优 (gbest)
+            swarm = frame(pso, t + 1)
+            gbest_position = to_point(swarm.gbest_position)
+            gbest_fitness = swarm.gbest_fitness
+
+            # 只为画面上的粒子生成文字与箭头
             for i in range(N):
-                # --- (1) 计算新速度 ---
-                # 公式：v_new = w*v_old + c1*r1*(pbest - x_old) + c2*r2*(gbest - x_old)
-                r1, r2 = np.random.rand(), np.random.rand()  # 随机因子 [0,1]
-
-                # 惯性项：w * v_old
-                inertia_term = w * velocities[i]
-                # 认知项：c1*r1*(pbest - x_old)
-                cognitive_term = c1 * r1 * (pbest_positions[i] - positions[i])
-                # 社会项：c2*r2*(gbest - x_old)
-                social_term = c2 * r2 * (gbest_position - positions[i])
-
-                # 合成新速度
-                new_vel = inertia_term + cognitive_term + social_term
-                velocities[i] = new_vel
-
-                # --- (2) 更新位置：x_new = x_old + v_new ---
-                new_pos = positions[i] + new_vel
-                positions[i] = new_pos
-
-                # --- (3) 计算新适应度 ---
-                new_fit = objective_func(new_pos)
+                new_pos = to_point(swarm.positions[i])
+                new_vel = to_point(swarm.velocities[i])
                 fitness_texts.add(
-                    VGroup(Text(f"适应度_{i} = ",font_size=20),Tex(f"${new_fit:.2f}$",font_size=25)).arrange(RIGHT, buff=0.5).next_to(fitness_start - i*vertical_spacing*UP, LEFT)
-                    # Text(f"适应度_{i} = {new_fit:.2f}", font_size=16).next_to(positions[i], UP)
+                    VGroup(Text(f"适应度_{i} = ",font_size=20),Readout(swarm.fitness[i], font_size=25)).arrange(RIGHT, buff=0.5).next_to(fitness_start - i*vertical_spacing*UP, LEFT)
+                )
+                pbest_texts.add(
+                    Readout(swarm.pbest_fitness[i], prefix=f"$pbest_{i} =$",
+                            font_size=25, color=ORANGE).next_to(pbest_start - i*vertical_spacing*UP, LEFT)
                 )
-                # particle_index.add(
-                #     Text(str(i), font_size=20).move_to(positions[i])#粒子编号
-                # )
-
-                # --- (4) 更新个体最优 (pbest) ---
-                if new_fit < pbest_fitness[i]:
-                    pbest_positions[i] = new_pos.copy()
-                    pbest_fitness[i] = new_fit
-                    pbest_texts.add(
-                        Tex(f"$pbest_{i} = {pbest_fitness[i]:.2f}$", 
-                             font_size=25, color=ORANGE).next_to(pbest_start - i*vertical_spacing*UP, LEFT)
-                    )
-                else:
-                    pbest_texts.add(
-                        Tex(f"$pbest_{i} = {pbest_fitness[i]:.2f}$", 
-                             font_size=25, color=ORANGE).next_to(pbest_start - i*vertical_spacing*UP, LEFT)
-                    )
 
                 # 创建本轮的速度箭头（可视化新速度）
-                # print("11111111",len(velocity_arrows))
-                # velocity_arrows[i]=Arrow(start=velocity_arrows[i].get_start(),end=velocity_arrows[i].get_end() + new_vel*0.5,buff=0, color=GREEN)
                 new_vel_arrow = Arrow(
                     start=new_pos, 
                     end=new_pos + new_vel*0.5,  # 缩放0.5方便看
@@ -289,18 +258,11 @@ class UserScene(Scene):
                 )
                 new_velocity_arrows.add(new_vel_arrow)#**************************************************
 
-            # --- (5) 更新群体最优 (gbest) ---
-            current_gbest_idx = np.argmin(pbest_fitness)
-            current_gbest_fit = pbest_fitness[current_gbest_idx]
-            if current_gbest_fit < gbest_fitness:
-                gbest_position = pbest_positions[current_gbest_idx].copy()
-                gbest_fitness = current_gbest_fit
-
             # 更新 gbest 文字
             new_gbest_text = VGroup(Text("群体最优：位置 =", font_size=20,color=YELLOW), 
                                 Tex(f"${gbest_position}$", font_size=30,color=YELLOW),
                                 Text(", 适应度 =", font_size=20,color=YELLOW), 
-                                Tex(f"${gbest_fitness:.2f}$", font_size=30,color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(UP)
+                                Readout(gbest_fitness, font_size=30, color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(UP)
             # new_gbest_text = Text(
             #     f"群体最优：位置 = {gbest_position}, 适应度 = {gbest_fitness:.2f}", 
             #     font_size=20, color=YELLOW
@@ -311,7 +273,7 @@ class UserScene(Scene):
             # 更新粒子位置、速度箭头、适应度文字、pbest文字
             self.play(FadeOut(velocity_arrows))
             for i in range(len(particle_dots)):
-                te=velocities[i]   
+                te=to_point(swarm.velocities[i])   
                 velocity_arrows[i]=Arrow(start=velocity_arrows[i].get_start(),end=te/ np.linalg.norm(te)+velocity_arrows[i].get_start(),buff=0, color=GREEN)
             self.play(Create(velocity_arrows))
 
@@ -319,10 +281,11 @@ class UserScene(Scene):
             # 逐个移动每个粒子点（Dot）到对应的位置
             animations = []
             for i in range(len(particle_dots)):
-                animations.append(particle_dots[i].animate.move_to(positions[i]))
-                animations.append(particle_index[i].animate.move_to(positions[i]))
-                # animations.append(velocity_arrows[i].animate.move_to(positions[i]))
-                velocity_arrows[i].shift(positions[i]-velocity_arrows[i].get_start())
+                pos = to_point(swarm.positions[i])
+                animations.append(particle_dots[i].animate.move_to(pos))
+                animations.append(particle_index[i].animate.move_to(pos))
+                # animations.append(velocity_arrows[i].animate.move_to(pos))
+                velocity_arrows[i].shift(pos-velocity_arrows[i].get_start())
 
 
             # self.play(Create(velocity_arrows))
@@ -343,12 +306,12 @@ class UserScene(Scene):
             # 给粒子画“轨迹线”（从旧位置到新位置）
             if t == 0:
                 # 第一次迭代，先创建轨迹线的起点（粒子当前位置）
-                trails = VGroup(*[Dot(point=pos, radius=0.05, color=particle_dots[i].color) 
-                                 for i, pos in enumerate(positions)])
+                trails = VGroup(*[Dot(point=to_point(pos), radius=0.05, color=particle_dots[i].color) 
+                                 for i, pos in enumerate(swarm.positions)])
             else:
                 # 后续迭代，更新轨迹线（把粒子新位置加入轨迹）
                 for i in range(N):
-                    trails[i].move_to(positions[i])
+                    trails[i].move_to(to_point(swarm.positions[i]))
 
             # self.play(Create(trails))  # 只在第一次创建时播放，后续用MoveToTarget
             self.wait(1)  # 控制迭代节奏
@@ -357,14 +320,14 @@ class UserScene(Scene):
         # 5. 迭代结束，输出最优解 + 可视化轨迹
         # ---------------------------
         # 高亮全局最优粒子（让它的颜色变红）
-        best_particle = particle_dots[np.argmin([objective_func(pos) for pos in positions])]
+        best_particle = particle_dots[int(np.argmin(swarm.fitness))]
         self.play(best_particle.animate.set_color(RED))
 
         # 显示最终结果
         result_text = VGroup(Text("迭代结束！最优解：位置 ≈", font_size=20,color=YELLOW), 
                 Tex(f"${gbest_position}$", font_size=30,color=YELLOW),
                 Text(", 适应度 ≈", font_size=20,color=YELLOW), 
-                Tex(f"${gbest_fitness:.2f}$", font_size=30,color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(DOWN)
+                Readout(gbest_fitness, font_size=30, color=YELLOW)).arrange(RIGHT, buff=0.5).to_edge(DOWN)
         # result_text = Text(
         #     f"迭代结束！最优解：位置 ≈ {gbest_position}, 适应度 ≈ {gbest_fitness:.2f}", 
         #     font_size=30, color=GREEN
@@ -386,7 +349,7 @@ class UserScene(Scene):
 
 
 
-# 渲染场景
-scene = UserScene()
-scene.render()
-    
\ No newline at end of file
+# 渲染场景（直接运行本文件时）；导入本模块不会触发渲染，也可用 python launcher.py render UserScene
+if __name__ == "__main__":
+    scene = UserScene()
+    scene.render()
@@ -0,0 +1,106 @@
+import numpy as np
+
+# 批量目标函数：输入 (N, D) 的解数组，返回 N 个函数值（越小越好）。
+# 优化器一次调用即可计算整个种群，不需要逐个解循环；
+# at(x) 只用于画图等需要标量的场合
+
+
+class Objective:
+    bounds = (-5.0, 5.0)   # 常用的搜索范围（每一维相同）
+    optimum = 0.0          # 全局最小值；未知时为 None
+
+    def __init__(self, dim=2):
+        self.dim = dim
+
+    def __call__(self, X):
+        raise NotImplementedError
+
+    def at(self, *x):
+        return float(self(np.array([x], dtype=np.float64))[0])
+
+    def optimum_position(self):
+        return np.zeros(self.dim) if self.optimum is not None else None
+
+
+class Sphere(Objective):
+    bounds = (-5.12, 5.12)
+
+    def __call__(self, X):
+        X = np.asarray(X)
+        return (X * X).sum(axis=1)
+
+
+class Rastrigin(Objective):
+    bounds = (-5.12, 5.12)
+
+    def __call__(self, X):
+        X = np.asarray(X)
+        return 10.0 * X.shape[1] + (X * X - 10.0 * np.cos(2 * np.pi * X)).sum(axis=1)
+
+
+class Rosenbrock(Objective):
+    bounds = (-2.048, 2.048)
+
+    def __call__(self, X):
+        X = np.asarray(X)
+        head, tail = X[:, :-1], X[:, 1:]
+        return (100.0 * (tail - head * head) ** 2 + (1.0 - head) ** 2).sum(axis=1)
+
+    def optimum_position(self):
+        return np.ones(self.dim)
+
+
+class Ackley(Objective):
+    bounds = (-32.768, 32.768)
+
+    def __call__(self, X):
+        X = np.asarray(X)
+        a = np.sqrt((X * X).mean(axis=1))
+        b = np.cos(2 * np.pi * X).mean(axis=1)
+        return 20.0 + np.e - 20.0 * np.exp(-0.2 * a) - np.exp(b)
+
+
+class Griewank(Objective):
+    bounds = (-600.0, 600.0)
+
+    def __call__(self, X):
+        X = np.asarray(X)
+        scale = np.sqrt(np.arange(1, X.shape[1] + 1, dtype=np.float64))
+        return 1.0 + (X * X).sum(axis=1) / 4000.0 - np.cos(X / scale).prod(axis=1)
+
+
+class HillClimbingLandscape(Objective):
+    # scene1.py 第一屏（爬山算法）的一维多峰函数
+    bounds = (0.0, 10.0)
+    optimum = None
+
+    def __init__(self, dim=1):
+        super().__init__(1)
+
+    def __call__(self, X):
+        x = np.asarray(X)[:, 0]
+        return 2 * np.sin(x) + 3 * np.cos(0.5 * x) + 4
+
+
+class AnnealingLandscape(Objective):
+    # scene1.py 模拟退火部分的一维能量函数
+    bounds = (0.0, 10.0)
+    optimum = None
+
+    def __init__(self, dim=1):
+        super().__init__(1)
+
+    def __call__(self, X):
+        x = np.asarray(X)[:, 0]
+        return 3 + 2 * np.sin(x) + 1.5 * np.sin(2.5 * x)
+
+
+OBJECTIVES = {
+    "sphere": Sphere,
+    "rastrigin": Rastrigin,
+    "rosenbrock": Rosenbrock,
+    "ackley": Ackley,
+    "griewank": Griewank,
+    "hill": HillClimbingLandscape,
+    "annealing": AnnealingLandscape,
+}
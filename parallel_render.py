@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from manim import *
+
+# 分段并行渲染：场景用 self.next_section(名称) 划分段落，每段交给一个 manim 子进程，
+# 用 -n 只渲染该段的动画（之前的动画只跳到结束状态、不画帧，段落开始时的画面与顺序渲染完全相同）。
+# 各进程把分段视频写进同一个缓存目录；最后照常渲染一遍整个场景，所有动画都命中缓存，
+# manim 只把分段视频按顺序流复制拼接起来（不重新编码）。总耗时约为最长一段的渲染时间。
+#   python launcher.py render --jobs 8 AntColonyAlgorithm -- -qh
+# 每段的起始动画编号与时长由场景中的 SectionPlan 记录在 media/section_plan/<场景名>.json，
+# 渲染前先跳过所有动画运行一遍场景得到最新的划分（同时预先生成轨迹、文字与 LaTeX 缓存）。
+# 拼接成功后删除各段子进程用 -o 写出的分段成片，只留下整个场景的成片。
+
+PLAN_DIR = os.path.join("media", "section_plan")
+# 规划时跳过所有动画：从一个不可能达到的编号开始渲染
+SKIP_ALL = 10 ** 9
+# 子进程同时写同一个缓存目录，不能让某个进程结束时按 max_files_cached 删掉其他进程刚写的分段视频
+WORKER_CONFIG = "[CLI]\nmax_files_cached = 1000000\n"
+# 子进程不打开预览
+PREVIEW_FLAGS = {"-p", "--preview", "-f", "--show_in_file_browser"}
+
+
+class SectionPlan:
+    # 在场景的 setup 中创建并调用 install()，在 tear_down 中调用 save()（见 scene_base.py）
+    def __init__(self, scene, plan_dir=PLAN_DIR):
+        self.scene = scene
+        self.path = os.path.join(plan_dir, f"{type(scene).__name__}.json")
+        self.sections = []       # [(名称, 第一个动画的编号, 开始时间)]
+
+    def install(self):
+        next_section = self.scene.next_section
+
+        def record(name="unnamed", *args, **kwargs):
+            renderer = self.scene.renderer
+            self.sections.append((name, renderer.num_plays, renderer.time))
+            return next_section(name, *args, **kwargs)
+
+        self.scene.next_section = record
+
+    def save(self):
+        # 用 -n 提前结束时只走了一部分场景，不覆盖完整的划分
+        if config.upto_animation_number >= 0:
+            return
+        renderer = self.scene.renderer
+        # 成片所在目录：分段子进程的 -o 成片也写在这里，拼接后按它清理
+        movie = getattr(renderer.file_writer, "movie_file_path", None)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(dict(sections=self.sections, plays=renderer.num_plays, duration=renderer.time,
+                           movie_dir=str(movie.parent) if movie else None),
+                      f, ensure_ascii=False, indent=1)
+
+
+def section_ranges(plan):
+    # [(名称, 第一个动画编号, 最后一个动画编号, 时长)]，跳过没有动画的段；第一段之前的动画单独成段
+    sections = [tuple(s) for s in plan["sections"]]
+    if not sections or sections[0][1] > 0:
+        sections.insert(0, ("", 0, 0.0))
+    ends = [(first, start) for _, first, start in sections[1:]] + [(plan["plays"], plan["duration"])]
+    return [(name, first, end - 1, stop - start)
+            for (name, first, start), (end, stop) in zip(sections, ends) if end > first]
+
+
+def section_movies(plan, scene, count):
+    # 各段子进程写出的成片 <场景名>_sectionXX.<扩展名>
+    movie_dir = plan.get("movie_dir")
+    if not movie_dir or not os.path.isdir(movie_dir):
+        return []
+    names = {f"{scene}_section{i:02d}" for i in range(count)}
+    return [entry.path for entry in os.scandir(movie_dir) if os.path.splitext(entry.name)[0] in names]
+
+
+def worker_args(manim_args):
+    # 去掉预览参数，合写的短参数（如 -pql）只去掉其中的 p、f
+    args = []
+    for arg in manim_args:
+        if arg in PREVIEW_FLAGS:
+            continue
+        if re.fullmatch(r"-[a-zA-Z]+", arg) and re.search("[pf]", arg):
+            arg = re.sub("[pf]", "", arg)
+            if arg == "-":
+                continue
+        args.append(arg)
+    return args
+
+
+def run_manim(path, scene, args):
+    command = [sys.executable, "-m", "manim", "render", *args, path, scene]
+    return subprocess.run(command, stdout=subprocess.DEVNULL).returncode
+
+
+def render_parallel(path, scene, manim_args=(), jobs=None):
+    jobs = jobs or os.cpu_count() or 1
+    args = worker_args(manim_args)
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, "worker.cfg")
+        with open(config_file, "w") as f:
+            f.write(WORKER_CONFIG)
+        args += ["-c", config_file]
+
+        start = time.perf_counter()
+        if run_manim(path, scene, [*args, "-n", str(SKIP_ALL)]):
+            raise SystemExit(f"规划 {scene} 时出错")
+        with open(os.path.join(PLAN_DIR, f"{scene}.json"), encoding="utf-8") as f:
+            plan = json.load(f)
+        ranges = section_ranges(plan)
+        print(f"{scene}: {len(ranges)} 段，规划用时 {time.perf_counter() - start:.1f} s")
+
+        # 时长最长的段先开始，减少最后只剩一段在渲染的时间
+        def render_section(item):
+            i, (name, first, last, duration) = item
+            t = time.perf_counter()
+            code = run_manim(path, scene, [*args, "-n", f"{first},{last}", "-o", f"{scene}_section{i:02d}"])
+            print(f"  [{i:02d}] {name or '(开头)'}: 动画 {first}-{last}，{duration:.1f} s 视频，"
+                  f"用时 {time.perf_counter() - t:.1f} s" + ("" if code == 0 else f"，出错 ({code})"))
+            return code
+
+        order = sorted(enumerate(ranges), key=lambda item: -item[1][3])
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            failed = sum(code != 0 for code in pool.map(render_section, order))
+        if failed:
+            raise SystemExit(f"{failed} 段渲染出错")
+
+    # 所有动画都已在缓存中，这一遍只做拼接；预览等参数在这里生效
+    t = time.perf_counter()
+    if run_manim(path, scene, list(manim_args)):
+        raise SystemExit(f"拼接 {scene} 时出错")
+    # 分段成片只是中间产物（分段视频已在缓存中），子进程的配置文件随临时目录一起删除
+    for movie in section_movies(plan, scene, len(ranges)):
+        os.remove(movie)
+    print(f"{scene}: 拼接用时 {time.perf_counter() - t:.1f} s，共 {time.perf_counter() - start:.1f} s")
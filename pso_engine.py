@@ -0,0 +1,168 @@
+import numpy as np
+
+
+class GlobalTopology:
+    # 全局拓扑 (gbest)：所有粒子都向群体最优学习
+    def initialize(self, swarm):
+        self.neighbours = None
+
+    def local_best(self, swarm):
+        return None
+
+
+class LocalTopology(GlobalTopology):
+    # 局部拓扑的公共部分：子类在 initialize 中构建 (N, k) 的邻居下标数组 neighbours
+    def local_best(self, swarm):
+        # 一次 gather 得到 (N, k) 的邻居 pbest 适应度，按行 argmin
+        nbr = self.neighbours
+        best = np.argmin(swarm.pbest_fitness[nbr], axis=1)
+        return nbr[np.arange(len(nbr)), best]
+
+
+class RingTopology(LocalTopology):
+    # 环形拓扑：粒子 i 的邻域为 i-k..i+k（含自身）
+    def __init__(self, k=1):
+        self.k = k
+
+    def initialize(self, swarm):
+        offsets = np.arange(-self.k, self.k + 1)
+        self.neighbours = (np.arange(swarm.n)[:, None] + offsets) % swarm.n
+
+
+class VonNeumannTopology(LocalTopology):
+    # 冯·诺依曼拓扑：粒子按行排成近似正方形的环面网格，邻域为自身与上下左右。
+    # 行、列坐标分别回绕；n 不是整行时最后一行较短，该行按实际长度、缺格的列按实际高度回绕
+    def initialize(self, swarm):
+        n = swarm.n
+        cols = max(int(np.ceil(np.sqrt(n))), 1)
+        rows = -(-n // cols)
+        r, c = np.divmod(np.arange(n), cols)
+        width = np.minimum(cols, n - r * cols)                  # 第 r 行的长度
+        height = rows - (c >= n - (rows - 1) * cols)            # 第 c 列的高度
+        self.neighbours = np.stack((r * cols + c,
+                                    r * cols + (c - 1) % width, r * cols + (c + 1) % width,
+                                    (r - 1) % height * cols + c, (r + 1) % height * cols + c), axis=1)
+
+
+class RandomTopology(LocalTopology):
+    # 随机拓扑：每个粒子除自身外随机连接 k 个信息源，邻接表只在初始化时生成一次
+    def __init__(self, k=3):
+        self.k = k
+
+    def initialize(self, swarm):
+        # 每行从 0..n-2 抽 k 个数，>= 自身下标的加一跳过自身；行内重复的位置重新抽取，
+        # 直到 k 个信息源互不相同。只占 (N, k) 的内存，十万级粒子也能直接构建
+        n = swarm.n
+        k = min(self.k, n - 1)
+        rows = np.arange(n)[:, None]
+        others = swarm.rng.integers(0, max(n - 1, 1), (n, k))
+        others += others >= rows
+        while k > 1:
+            others.sort(axis=1)
+            dup = np.zeros(others.shape, dtype=bool)
+            dup[:, 1:] = others[:, 1:] == others[:, :-1]
+            i, j = np.nonzero(dup)
+            if not len(i):
+                break
+            redraw = swarm.rng.integers(0, n - 1, len(i))
+            others[i, j] = redraw + (redraw >= i)
+        self.neighbours = np.concatenate((rows, others), axis=1)
+
+
+class ParticleSwarm:
+    # 向量化的粒子群优化：整个粒子群存成 (N, D) 数组，
+    # 每次迭代的速度更新、位置更新、适应度计算、pbest/gbest 更新都是整体数组运算。
+    # objective 接收 (N, D) 数组，返回 N 个适应度（越小越好）
+    def __init__(self, objective, n_particles=None, dim=2, w=1.0, c1=1.0, c2=1.0,
+                 bounds=(-3.0, 3.0), v_bounds=(-1.0, 1.0), v_max=None, clip=False,
+                 positions=None, velocities=None, topology=None, dtype=np.float64, rng=None):
+        self.objective = objective
+        self.w = w            # 惯性权重
+        self.c1 = c1          # 个体学习因子
+        self.c2 = c2          # 群体学习因子
+        self.bounds = bounds  # 初始位置范围；clip=True 时位置始终限制在此范围内
+        self.v_max = v_max    # 可选：速度分量的绝对值上限
+        self.clip = clip
+        self.dtype = np.dtype(dtype)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        if positions is None:
+            positions = self.rng.uniform(bounds[0], bounds[1], (n_particles, dim))
+        self.positions = np.array(positions, dtype=self.dtype)
+        self.n, self.dim = self.positions.shape
+        if velocities is None:
+            velocities = self.rng.uniform(v_bounds[0], v_bounds[1], (self.n, self.dim))
+        self.velocities = np.array(velocities, dtype=self.dtype)
+
+        # 初始时，个体最优 = 当前位置
+        self.fitness = self.evaluate(self.positions)
+        self.pbest_positions = self.positions.copy()
+        self.pbest_fitness = self.fitness.copy()
+        best = int(np.argmin(self.pbest_fitness))
+        self.gbest_position = self.pbest_positions[best].copy()
+        self.gbest_fitness = float(self.pbest_fitness[best])
+
+        # 邻域拓扑：全局 / 环形 / 冯·诺依曼 / 随机，邻居下标数组只构建一次
+        self.topology = topology if topology is not None else GlobalTopology()
+        self.topology.initialize(self)
+
+        # 随机因子与中间结果的缓冲区，迭代中原地复用，避免每轮分配 (N, D) 临时数组
+        self._r = np.empty_like(self.positions)
+        self._buf = np.empty_like(self.positions)
+        self.history = []      # 每次迭代后的 gbest 适应度
+        self.iteration = 0
+
+    def evaluate(self, positions):
+        return np.asarray(self.objective(positions), dtype=np.float64)
+
+    def update_velocities(self):
+        # v ← w·v + c1·r1·(pbest - x) + c2·r2·(lbest - x)，全局拓扑时 lbest = gbest
+        v, x, r, buf = self.velocities, self.positions, self._r, self._buf
+        v *= self.w
+        self.rng.random(out=r, dtype=self.dtype)
+        np.subtract(self.pbest_positions, x, out=buf)
+        buf *= r
+        buf *= self.c1
+        v += buf
+        self.rng.random(out=r, dtype=self.dtype)
+        lbest = self.topology.local_best(self)
+        if lbest is None:
+            np.subtract(self.gbest_position, x, out=buf)
+        else:
+            np.take(self.pbest_positions, lbest, axis=0, out=buf)
+            buf -= x
+        buf *= r
+        buf *= self.c2
+        v += buf
+        if self.v_max is not None:
+            np.clip(v, -self.v_max, self.v_max, out=v)
+
+    def update_positions(self):
+        self.positions += self.velocities
+        if self.clip:
+            np.clip(self.positions, self.bounds[0], self.bounds[1], out=self.positions)
+
+    def update_best(self):
+        improved = self.fitness < self.pbest_fitness
+        np.copyto(self.pbest_positions, self.positions, where=improved[:, None])
+        self.pbest_fitness[improved] = self.fitness[improved]
+        best = int(np.argmin(self.pbest_fitness))
+        if self.pbest_fitness[best] < self.gbest_fitness:
+            self.gbest_fitness = float(self.pbest_fitness[best])
+            self.gbest_position = self.pbest_positions[best].copy()
+        return improved
+
+    def step(self):
+        # 同步更新：所有粒子使用本轮开始时的 gbest
+        self.update_velocities()
+        self.update_positions()
+        self.fitness = self.evaluate(self.positions)
+        improved = self.update_best()
+        self.iteration += 1
+        self.history.append(self.gbest_fitness)
+        return improved
+
+    def run(self, n_iterations):
+        for _ in range(n_iterations):
+            self.step()
+        return self.gbest_position, self.gbest_fitness
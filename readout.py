@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+from manim import *
+from manim.utils.tex_file_writing import tex_hash
+
+from tex_batch import template_fields
+
+# 数字读数：前缀与 0-9、负号、小数点只编译一次（同一个 Tex，基线和间距与正常排版一致），
+# 之后任何数值都由这些字形的控制点拼出来。set_value 只原地改写每个字符槽的点，不启动 LaTeX，
+# 适合每轮、甚至每帧都变化的适应度、温度、概率等数字。
+
+CHARS = "0123456789-."
+# (前缀, 模板内容的哈希, 字号) -> GlyphAtlas，同一进程内共享
+_ATLASES = {}
+
+
+def atlas_source(prefix=""):
+    # 编译字形表用的 Tex 字符串；可交给 TexBatch.add_tex 预先批量编译
+    return f"{prefix} ${CHARS}$" if prefix else f"${CHARS}$"
+
+
+def atlas_key(prefix="", tex_template=None, font_size=DEFAULT_FONT_SIZE):
+    # 模板按内容（与 TexBatch 相同的字段）取哈希：内容相同的模板共用字形表，不依赖对象 id
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    return prefix, tex_hash(json.dumps(template_fields(tex_template), sort_keys=True)), font_size
+
+
+class GlyphAtlas:
+    def __init__(self, prefix="", tex_template=None, font_size=DEFAULT_FONT_SIZE):
+        kwargs = {} if tex_template is None else {"tex_template": tex_template}
+        source = Tex(atlas_source(prefix), font_size=font_size, **kwargs)
+        glyphs = source.family_members_with_points()
+        if len(glyphs) < len(CHARS):
+            raise ValueError(f"字形表只有 {len(glyphs)} 个字形: {atlas_source(prefix)}")
+        digits = glyphs[-len(CHARS):]
+        self.prefix = VGroup(*glyphs[:-len(CHARS)]).copy()
+        self.style = digits[0]
+
+        # 坐标以前缀左端、数字基线为原点；"0" 的底部近似为基线
+        left = self.prefix.get_left()[0] if len(self.prefix) else digits[0].get_left()[0]
+        base = digits[0].get_bottom()[1]
+        offset = np.array([left, base, 0.0])
+        self.prefix.shift(-offset)
+        self.start = digits[0].get_left()[0] - left        # 第一个数字的起始位置
+        self.points, self.widths = {}, {}
+        for ch, glyph in zip(CHARS, digits):
+            self.points[ch] = glyph.points - np.array([glyph.get_left()[0], base, 0.0])
+            self.widths[ch] = glyph.width
+        # 字符之间的间距取各数字间空隙的中位数
+        gaps = [b.get_left()[0] - a.get_right()[0] for a, b in zip(digits[:9], digits[1:10])]
+        self.gap = float(np.median(gaps))
+        # 参考长度：从原点到第一个数字右端，读数中至少有一个数字，这一段总在读数的范围内
+        self.unit = self.start + self.widths["0"]
+
+    @classmethod
+    def get(cls, prefix="", tex_template=None, font_size=DEFAULT_FONT_SIZE):
+        key = atlas_key(prefix, tex_template, font_size)
+        if key not in _ATLASES:
+            _ATLASES[key] = cls(prefix, tex_template, font_size)
+        return _ATLASES[key]
+
+
+class Readout(VMobject):
+    # Readout(3.14, prefix="$T =$", num_decimal_places=2, font_size=24, color=YELLOW)
+    # 之后 readout.set_value(x) 原地更新；平移、缩放后更新也保持位置
+    def __init__(self, value=0.0, prefix="", num_decimal_places=2, tex_template=None,
+                 font_size=DEFAULT_FONT_SIZE, color=None, **kwargs):
+        super().__init__(**kwargs)
+        self.atlas = GlyphAtlas.get(prefix, tex_template, font_size)
+        self.num_decimal_places = num_decimal_places
+        # 两个不可见的参考点记录读数自身的位置与缩放（都在读数的包围盒内，不影响排版）
+        self.origin = VectorizedPoint(ORIGIN)
+        self.unit = VectorizedPoint(self.atlas.unit * RIGHT)
+        self.prefix = self.atlas.prefix.copy()
+        self.chars = VGroup()
+        self.add(self.origin, self.unit, self.prefix, self.chars)
+        self.text = ""
+        self.set_value(value)
+        if color is not None:
+            self.set_color(color)
+
+    def set_value(self, value):
+        text = f"{value:.{self.num_decimal_places}f}"
+        if any(ch not in self.atlas.points for ch in text):
+            raise ValueError(f"无法用字形表显示: {text}")
+        origin = self.origin.get_center()
+        scale = (self.unit.get_center()[0] - origin[0]) / self.atlas.unit
+
+        # 字符槽数量随位数增减，新增的槽沿用已有字符的样式
+        while len(self.chars) < len(text):
+            template = self.chars[-1] if len(self.chars) else self.atlas.style
+            self.chars.add(template.copy())
+        if len(self.chars) > len(text):
+            self.chars.remove(*self.chars[len(text):])
+
+        x = self.atlas.start
+        for ch, slot in zip(text, self.chars):
+            slot.set_points(origin + scale * (self.atlas.points[ch] + np.array([x, 0.0, 0.0])))
+            x += self.atlas.widths[ch] + self.atlas.gap
+        self.value = value
+        self.text = text
+        return self
+
+    def get_value(self):
+        return self.value
@@ -0,0 +1,229 @@
+import numpy as np
+
+
+class GeometricCooling:
+    # 降温策略：initialize(annealer) 在退火器创建时调用一次，
+    # update(annealer, accept) 在每次 Metropolis 步之后原地修改 annealer.temperature（每条链一个温度）。
+    # 几何降温 T_{k+1} = α·T_k
+    def __init__(self, alpha=0.85):
+        self.alpha = alpha
+
+    def initialize(self, annealer):
+        pass
+
+    def update(self, annealer, accept):
+        annealer.temperature *= self.alpha
+
+
+class LogarithmicCooling(GeometricCooling):
+    # 对数降温 T_k = T_0 / (1 + c·ln(1 + k))：降得很慢，理论上能保证收敛到全局最优
+    def __init__(self, c=1.0):
+        self.c = c
+
+    def initialize(self, annealer):
+        self.t0 = annealer.temperature.copy()
+
+    def update(self, annealer, accept):
+        k = annealer.iteration + 1
+        np.divide(self.t0, 1.0 + self.c * np.log1p(k), out=annealer.temperature)
+
+
+class LundyMeesCooling(GeometricCooling):
+    # Lundy-Mees 降温 T_{k+1} = T_k / (1 + β·T_k)：高温时降得快，低温时降得慢
+    def __init__(self, beta=1e-3):
+        self.beta = beta
+
+    def update(self, annealer, accept):
+        t = annealer.temperature
+        np.divide(t, 1.0 + self.beta * t, out=t)
+
+
+class AdaptiveCooling(GeometricCooling):
+    # 自适应降温：用最近 window 步的接受率控制温度，接受率高于目标就降温、低于目标就升温，
+    # T ← T·exp(gain·(目标 - 接受率))；目标接受率每步乘以 decay，逐渐从 target 降到 min_target。
+    # 某条链连续 patience 步没有刷新最优解时重新加热：温度至少回到 reheat·T_0，目标接受率复位
+    def __init__(self, target=0.5, decay=0.995, min_target=0.01, window=20, gain=0.2,
+                 patience=200, reheat=0.5):
+        self.initial_target = target
+        self.decay = decay
+        self.min_target = min_target
+        self.window = window
+        self.gain = gain
+        self.patience = patience
+        self.reheat = reheat
+
+    def initialize(self, annealer):
+        n = annealer.n
+        self.t0 = annealer.temperature.copy()
+        self.target = np.full(n, self.initial_target, dtype=annealer.dtype)
+        self._accepts = np.zeros((self.window, n), dtype=np.int8)   # 环形缓冲区，逐链记录最近的接受情况
+        self._count = np.zeros(n, dtype=np.int32)
+        self._seen = 0
+        self._best = annealer.best_energy.copy()
+        self.stall = np.zeros(n, dtype=np.int64)      # 距上次刷新最优解的步数
+        self.reheats = np.zeros(n, dtype=np.int64)    # 每条链累计重新加热次数
+
+    def acceptance_rate(self):
+        return self._count / max(self._seen, 1)
+
+    def update(self, annealer, accept):
+        slot = annealer.iteration % self.window
+        self._count += accept
+        self._count -= self._accepts[slot]
+        self._accepts[slot] = accept
+        self._seen = min(self._seen + 1, self.window)
+
+        t = annealer.temperature
+        t *= np.exp(self.gain * (self.target - self.acceptance_rate())).astype(annealer.dtype)
+        self.target *= self.decay
+        np.maximum(self.target, self.min_target, out=self.target)
+
+        improved = annealer.best_energy < self._best
+        self._best = annealer.best_energy.copy()
+        self.stall = np.where(improved, 0, self.stall + 1)
+        stuck = self.stall >= self.patience
+        if stuck.any():
+            t[stuck] = np.maximum(t[stuck], self.reheat * self.t0[stuck])
+            self.target[stuck] = self.initial_target
+            self.stall[stuck] = 0
+            self.reheats += stuck
+
+
+class Annealer:
+    # 向量化的多链模拟退火：M 条马尔可夫链同时提出新解、计算 ΔE 并按 Metropolis 准则接受。
+    # objective 接收 (M, D) 数组，返回 M 个能量；每条链有自己的温度。
+    # 解、能量、温度均使用 dtype：链很多时 float32 的 sin/exp 等明显快于 float64
+    def __init__(self, objective, n_chains=1, dim=1, x0=None, bounds=(0.0, 10.0), step=1.0,
+                 t0=10.0, cooling=0.85, schedule=None, dtype=np.float64, rng=None):
+        self.objective = objective
+        self.bounds = bounds      # 解空间范围，新解超出时截断到边界
+        self.step_size = step     # 新解 = 当前解 + U(-step, step)
+        # 降温策略，默认按 cooling 系数几何降温 T ← cooling·T
+        self.schedule = schedule if schedule is not None else GeometricCooling(cooling)
+        self.dtype = np.dtype(dtype)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        if x0 is None:
+            x = self.rng.uniform(bounds[0], bounds[1], (n_chains, dim))
+        else:
+            x = np.broadcast_to(np.asarray(x0, dtype=np.float64), (n_chains, dim))
+        self.x = np.array(x, dtype=self.dtype)
+        self.n, self.dim = self.x.shape
+        self.energy = self.evaluate(self.x)
+        self.temperature = np.full(self.n, t0, dtype=self.dtype)
+
+        self.best_x = self.x.copy()
+        self.best_energy = self.energy.copy()
+        self.accepted = np.zeros(self.n, dtype=np.int64)     # 每条链累计接受次数
+        self.proposal = np.empty_like(self.x)    # 最近一次提出的新解（缓冲区每步原地复用）
+        self.history = []        # 每次迭代后所有链中的最低能量
+        self.iteration = 0
+        self.schedule.initialize(self)
+
+    def evaluate(self, x):
+        return np.asarray(self.objective(x), dtype=self.dtype)
+
+    def propose(self):
+        new = self.proposal
+        self.rng.random(out=new, dtype=self.dtype)
+        new *= 2.0 * self.step_size
+        new -= self.step_size
+        new += self.x
+        np.clip(new, self.bounds[0], self.bounds[1], out=new)
+        return new
+
+    def metropolis(self):
+        # ΔE <= 0 时必然接受，否则以 exp(-ΔE/T) 的概率接受。
+        # 温度可能降到次正规数或 0（float32 下溢、t_min = 0）：此时 ΔE/T 溢出为 inf 或为 nan，只接受不变差的解
+        new = self.propose()
+        new_energy = self.evaluate(new)
+        delta = new_energy - self.energy
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            p = np.exp(-np.maximum(delta, 0) / self.temperature)
+        accept = (delta <= 0) | (self.rng.random(self.n, dtype=self.dtype) < p)
+        # np.where 生成新数组比带掩码的原地 copyto 更快
+        self.x = np.where(accept[:, None], new, self.x)
+        self.energy = np.where(accept, new_energy, self.energy)
+        self.accepted += accept
+
+        better = self.energy < self.best_energy
+        self.best_x = np.where(better[:, None], self.x, self.best_x)
+        self.best_energy = np.where(better, self.energy, self.best_energy)
+        return accept, delta
+
+    def cool(self, accept):
+        self.schedule.update(self, accept)
+
+    def step(self):
+        accept, delta = self.metropolis()
+        self.cool(accept)
+        self.iteration += 1
+        self.history.append(float(self.best_energy.min()))
+        return accept, delta
+
+    def run(self, n_iterations):
+        for _ in range(n_iterations):
+            self.step()
+        best = int(np.argmin(self.best_energy))
+        return self.best_x[best], float(self.best_energy[best])
+
+
+class ParallelTempering(Annealer):
+    # 并行回火：S 个独立系统，每个系统有 K 个副本，分别固定在温度阶梯 T_1 < ... < T_K 上。
+    # 所有副本一起做 Metropolis 步，之后相邻温度的副本按
+    # P = min(1, exp((1/T_k - 1/T_{k+1})(E_k - E_{k+1}))) 交换状态（奇偶轮交替配对）。
+    # 链按 (系统, 温度) 排列，第 s 个系统的第 k 个副本为第 s·K + k 条链
+    def __init__(self, objective, n_systems=1, temperatures=None, n_replicas=8, t_min=0.05,
+                 t_max=10.0, swap_every=1, **kwargs):
+        if temperatures is None:
+            temperatures = np.geomspace(t_min, t_max, n_replicas)
+        self.ladder = np.sort(np.asarray(temperatures, dtype=np.float64))
+        self.n_systems = n_systems
+        self.n_replicas = len(self.ladder)
+        self.swap_every = swap_every
+        kwargs["cooling"] = 1.0
+        super().__init__(objective, n_chains=n_systems * self.n_replicas, **kwargs)
+        self.temperature = np.tile(self.ladder, n_systems).astype(self.dtype)
+        self._index = np.arange(self.n).reshape(n_systems, self.n_replicas)
+        self.swap_attempts = np.zeros(self.n_replicas - 1, dtype=np.int64)
+        self.swap_accepts = np.zeros(self.n_replicas - 1, dtype=np.int64)
+
+    def swap(self):
+        S, K = self.n_systems, self.n_replicas
+        lo = np.arange(self.iteration // self.swap_every % 2, K - 1, 2)
+        if not len(lo):
+            return
+        energy = self.energy.reshape(S, K)
+        # 阶梯中有 T = 0 时 β = inf：低温副本能量更高则必然交换，否则不交换（inf·0 为 nan，也不交换）
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = 1.0 / self.ladder
+            d = (beta[lo] - beta[lo + 1]) * (energy[:, lo] - energy[:, lo + 1])
+        accept = self.rng.random(d.shape) < np.exp(np.minimum(d, 0.0))
+        self.swap_attempts[lo] += S
+        self.swap_accepts[lo] += accept.sum(axis=0)
+
+        # 被接受的相邻对互换状态，温度留在原位：下标 k 取 k+1 处的状态，k+1 取 k 处的
+        shift = np.zeros((S, K), dtype=np.intp)
+        shift[:, lo] = accept
+        shift[:, lo + 1] -= accept
+        flat = (self._index + shift).ravel()
+        self.x = np.take(self.x, flat, axis=0)
+        self.energy = np.take(self.energy, flat)
+
+    def step(self):
+        accept, delta = self.metropolis()
+        if (self.iteration + 1) % self.swap_every == 0:
+            self.swap()
+        self.iteration += 1
+        self.history.append(float(self.best_energy.min()))
+        return accept, delta
+
+    def coldest(self):
+        # 每个系统最低温度副本的当前解 (S, D)
+        return self.x.reshape(self.n_systems, self.n_replicas, self.dim)[:, 0]
+
+    def system_best(self):
+        # 每个系统所有副本历史最优中的最好者 (S, D)
+        energy = self.best_energy.reshape(self.n_systems, self.n_replicas)
+        k = np.argmin(energy, axis=1)
+        return self.best_x.reshape(self.n_systems, self.n_replicas, self.dim)[np.arange(self.n_systems), k]
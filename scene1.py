@@ -1,14 +1,44 @@
 from manim import *
 import numpy as np
-import random
 
-class SA_Introduction(Scene):
+from objectives import AnnealingLandscape, HillClimbingLandscape
+from readout import Readout, atlas_source
+from scene_base import BaseScene
+from text_cache import CachedText as Text
+from traces import trace
+
+def histogram_bars(axes, samples, scale, bins=50, x_range=(0, 10), color=BLUE):
+    # 最终位置的直方图：每个柱是坐标系中的一个矩形，高度 = 频率 × scale
+    counts, edges = np.histogram(samples, bins=bins, range=x_range)
+    heights = counts / len(samples) * scale
+    bars = VGroup()
+    for h, x0, x1 in zip(heights, edges[:-1], edges[1:]):
+        if h > 0:
+            bars.add(Polygon(axes.c2p(x0, 0), axes.c2p(x1, 0), axes.c2p(x1, h), axes.c2p(x0, h),
+                             color=color, fill_opacity=0.6, stroke_width=1))
+    return bars
+
+def thin_path(path, min_gap=0.3):
+    # 爬山路径中步长缩小后的微小移动画不出箭头：只保留与上一个保留点相距至少 min_gap 的点，
+    # 终点替换掉离它太近的最后一个保留点
+    kept = [path[0]]
+    for x in path[1:]:
+        if abs(x - kept[-1]) >= min_gap:
+            kept.append(x)
+    if len(kept) > 1 and abs(path[-1] - kept[-1]) < min_gap:
+        kept[-1] = path[-1]
+    elif kept[-1] != path[-1]:
+        kept.append(path[-1])
+    return [float(x) for x in kept]
+
+class SA_Introduction(BaseScene):
+    seed = 20
+
     def construct(self):
         chinese_font = "SimHei"
-        random.seed(20)      # 固定 Python 的随机数
-        np.random.seed(20)   # 固定 NumPy 的随机数
 
         # ---------------- 第一屏：爬山算法 ----------------
+        self.next_section("爬山算法")
         title = Text("模拟退火算法", font_size=48, color=BLUE, font=chinese_font)
         self.play(Write(title))
         self.wait(1)
@@ -37,9 +67,13 @@ class SA_Introduction(Scene):
             axis_config={"color": BLUE},
         )
         
-        # 定义一个多峰函数
-        def func(x):
-            return 2 * np.sin(x) + 3 * np.cos(0.5 * x) + 4
+        # 定义一个多峰函数：2sin(x) + 3cos(0.5x) + 4
+        landscape = HillClimbingLandscape()
+        func = landscape.at
+        # 爬山过程在场景外运行（步长 0.5，无更优邻居时减半），同时统计 10000 个随机起点的吸引盆
+        hc = trace("hc", starts=[3.0, 7.0], step=0.5, seed=self.seed)
+        optima = hc["basin_x"][np.argsort(-hc["basin_value"])]
+        global_x, local_x = float(optima[0]), float(optima[1])
         
         graph = axes.plot(func, color=WHITE, x_range=[0, 10])
         
@@ -55,8 +89,8 @@ class SA_Introduction(Scene):
         self.wait(1)
         
         # 标记全局最优和局部最优
-        global_optimum = Dot(axes.c2p(1.15, func(1.15)), color=GREEN, radius=0.1)
-        local_optimum = Dot(axes.c2p(8.61, func(8.61)), color=RED, radius=0.1)
+        global_optimum = Dot(axes.c2p(global_x, func(global_x)), color=GREEN, radius=0.1)
+        local_optimum = Dot(axes.c2p(local_x, func(local_x)), color=RED, radius=0.1)
         
         
         global_label = Text("全局最优", font=chinese_font, font_size=24, color=GREEN).next_to(global_optimum, UP)
@@ -79,7 +113,7 @@ class SA_Introduction(Scene):
         
         # 模拟爬山过程
         current_x = 3.0
-        steps = [3.0, 2.5, 2.0, 1.5, 1.15]
+        steps = thin_path(hc["paths"][0])
         dots = VGroup(start_point)
         arrows = VGroup()
         
@@ -119,7 +153,7 @@ class SA_Introduction(Scene):
         
         # 模拟爬山过程（陷入局部最优）
         current_x = 7.0
-        steps2 = [7.0, 7.5, 8.0, 8.61]
+        steps2 = thin_path(hc["paths"][1])
         dots2 = VGroup(start_point2)
         arrows2 = VGroup()
         
@@ -143,10 +177,19 @@ class SA_Introduction(Scene):
                 self.play(Write(stuck_text))
                 self.wait(1)
                 self.play(FadeOut(stuck_text))
+
+        # 吸引盆统计：随机起点最终到达各局部最优的比例
+        shares = hc["basin_share"][np.argsort(-hc["basin_value"])]
+        basin_text = Text(
+            f"{hc['params']['n_starts']} 个随机起点: {shares[0]:.0%} 到达全局最优, {shares[1]:.0%} 陷入局部最优",
+            font=chinese_font, font_size=24
+        ).to_edge(DOWN)
+        self.play(Write(basin_text))
         
         self.wait(5)
 
         # ---------------- 第二屏：模拟退火 ----------------
+        self.next_section("模拟退火")
         self.clear()
         sa_text = Text("模拟退火算法 (Simulated Annealing)", font_size=36, color=GREEN, font=chinese_font)
         self.play(Write(sa_text))
@@ -164,6 +207,7 @@ class SA_Introduction(Scene):
         self.play(FadeOut(VGroup(sa_text, sa_points)))
 
         # ---------------- 第三屏：对比表格 ----------------
+        self.next_section("对比表格")
         comparison_title = Text("对比:", font_size=32, color=PURPLE, font=chinese_font)
         self.play(Write(comparison_title))
 
@@ -190,6 +234,7 @@ class SA_Introduction(Scene):
         self.play(FadeOut(comparison_group))
 
         # ---------------- 第四屏：核心公式 ----------------
+        self.next_section("核心公式")
         formula_title = Text("模拟退火核心公式", font_size=36, color=BLUE, font=chinese_font)
         formula_title.to_edge(UP)
         self.play(Write(formula_title))
@@ -322,6 +367,7 @@ class SA_Introduction(Scene):
         self.play(Write(explanation_text))
         self.wait(10)
         # ---------------- 第五屏：模拟退火算法寻找函数最低点 ----------------
+        self.next_section("寻找最低点")
         self.clear()
 
         function_formula = MathTex(
@@ -348,12 +394,12 @@ class SA_Introduction(Scene):
             axis_config={"color": BLUE},
         )
 
-        # 定义函数
-        def func(x):
-            return 3 + 2 * np.sin(x) + 1.5 * np.sin(2.5 * x)
+        # 定义函数：3 + 2sin(x) + 1.5sin(2.5x)，整条曲线一次计算
+        energy = AnnealingLandscape()
+        func = energy.at
 
         x_vals = np.linspace(0, 10, 200)
-        y_vals = [func(x) for x in x_vals]
+        y_vals = energy(x_vals[:, None])
 
         graph = axes.plot_line_graph(
             x_values=x_vals,
@@ -379,7 +425,7 @@ class SA_Introduction(Scene):
 
         # 温度指示器
         temperature = 10.0
-        temp_text = Tex(f"温度: {temperature:.2f}", tex_template=TexTemplateLibrary.ctex, font_size=24).to_corner(UR)
+        temp_text = Readout(temperature, prefix="温度:", tex_template=TexTemplateLibrary.ctex, font_size=24).to_corner(UR)
         self.play(Write(temp_text))
 
         # 全局最优解
@@ -396,70 +442,86 @@ class SA_Introduction(Scene):
         # 减少迭代次数到8次
         iterations = 20
         speed_1d5 = 1/2
-        # 模拟退火过程
+        # 模拟退火过程先在场景外运行（每轮降温 ×0.85），这里只回放每轮的记录
+        sa = trace("sa", x0=current_x, n_iterations=iterations, t0=temperature, cooling=0.85,
+                   step=1.0, bounds=(0, 10), seed=self.seed)
+        # 循环中要显示的 LaTeX 先全部登记，按模板各批量编译一次
+        for text in ("新解", "接受新解!", "拒绝新解"):
+            self.tex_batch.add_tex(text, tex_template=TexTemplateLibrary.ctex)
+        # 每轮变化的数值用 Readout 显示，只需登记各前缀的字形表
+        self.tex_batch.add_tex(atlas_source("$\\Delta E =$"))
+        for prefix in ("$P(接受) =$", "温度:"):
+            self.tex_batch.add_tex(atlas_source(prefix), tex_template=TexTemplateLibrary.ctex)
+        self.tex_batch.compile()
         for i in range(iterations):
+            # 每轮的所有动画按时间顺序放进 steps，最后合成一个 Succession 只 play 一次
+            steps = []
+
             # 生成新解
-            new_x = current_x + random.uniform(-1, 1)
-            new_x = max(0, min(10, new_x))
+            new_x = float(sa["proposed_x"][i])
 
             new_point = Dot(axes.coords_to_point(new_x, func(new_x)), color=BLUE)
             new_label = Tex("新解", tex_template=TexTemplateLibrary.ctex, font_size=20).next_to(new_point, UP)
 
-            self.play(Create(new_point), Write(new_label), run_time=1*speed_1d5)
+            steps.append(AnimationGroup(Create(new_point), Write(new_label), run_time=1*speed_1d5))
 
-            # 计算能量差
-            delta_e = func(new_x) - func(current_x)
-
-            # 计算接受概率
-            if delta_e < 0:
-                accept_prob = 1.0
-            else:
-                accept_prob = np.exp(-delta_e / temperature)
+            # 能量差与接受概率：ΔE < 0 时必然接受，否则 P = exp(-ΔE / T)
+            delta_e = float(sa["delta_e"][i])
+            accept_prob = float(sa["accept_prob"][i])
 
             # 显示概率信息
-            delta_text = Tex(f"$\\Delta E = {delta_e:.2f}$", font_size=20)
-            prob_text = Tex(f"$P(接受) = {accept_prob:.2f}$", font_size=20, tex_template=TexTemplateLibrary.ctex)
+            # 数字由预编译的字形拼出，不为每轮的数值单独调用 LaTeX
+            delta_text = Readout(delta_e, prefix="$\\Delta E =$", font_size=20)
+            prob_text = Readout(accept_prob, prefix="$P(接受) =$", tex_template=TexTemplateLibrary.ctex, font_size=20)
 
             # 清除旧的概率信息
+            old_prob_info = prob_info
             if len(prob_info) > 0:
-                self.play(FadeOut(prob_info), run_time=1*speed_1d5)
+                steps.append(FadeOut(prob_info, run_time=1*speed_1d5))
 
             prob_info = VGroup(delta_text, prob_text).arrange(DOWN, aligned_edge=LEFT).to_corner(UL)
-            self.play(Write(prob_info), run_time=1*speed_1d5)
+            steps.append(Write(prob_info, run_time=1*speed_1d5))
 
             # 是否接受
-            if delta_e < 0 or random.random() < accept_prob:
+            if sa["accepted"][i]:
                 # 接受新解
                 accept_text = Tex("接受新解!", tex_template=TexTemplateLibrary.ctex, color=GREEN, font_size=24).to_edge(DOWN)
-                self.play(Write(accept_text), run_time=1*speed_1d5)
+                steps.append(Write(accept_text, run_time=1*speed_1d5))
 
                 # 更新当前点和标签的位置，不改变样式
                 new_pos = axes.coords_to_point(new_x, func(new_x))
-                self.play(
+                steps.append(AnimationGroup(
                     current_point.animate.move_to(new_pos),
                     current_label.animate.next_to(new_pos, UP),
                     FadeOut(new_point),
                     FadeOut(new_label),
                     run_time=1*speed_1d5
-                )
+                ))
                 current_x = new_x
-                self.play(FadeOut(accept_text), run_time=1*speed_1d5)
+                steps.append(FadeOut(accept_text, run_time=1*speed_1d5))
             else:
                 reject_text = Tex("拒绝新解", tex_template=TexTemplateLibrary.ctex, color=RED, font_size=24).to_edge(DOWN)
-                self.play(Write(reject_text), run_time=1*speed_1d5)
-                self.play(FadeOut(new_point), FadeOut(new_label), run_time=1*speed_1d5)
-                self.play(FadeOut(reject_text), run_time=1*speed_1d5)
+                steps.append(Write(reject_text, run_time=1*speed_1d5))
+                steps.append(AnimationGroup(FadeOut(new_point), FadeOut(new_label), run_time=1*speed_1d5))
+                steps.append(FadeOut(reject_text, run_time=1*speed_1d5))
 
             # 降温
-            temperature *= 0.85
-            new_temp_text = Tex(f"温度: {temperature:.2f}", tex_template=TexTemplateLibrary.ctex, font_size=24).to_corner(UR)
-            self.play(Transform(temp_text, new_temp_text), run_time=1*speed_1d5)
+            temperature = float(sa["temperature"][i + 1])
+            new_temp_text = Readout(temperature, prefix="温度:", tex_template=TexTemplateLibrary.ctex, font_size=24).to_corner(UR)
+            steps.append(Transform(temp_text, new_temp_text, run_time=1*speed_1d5))
 
             # 每2步展示一次全局最优位置
             if i % 2 == 0:
-                self.play(Create(global_optimum_point), Write(global_optimum_label), run_time=1*speed_1d5)
-                self.wait(0.5*speed_1d5)
-                self.play(FadeOut(global_optimum_point), FadeOut(global_optimum_label), run_time=1*speed_1d5)
+                steps.append(AnimationGroup(Create(global_optimum_point), Write(global_optimum_label), run_time=1*speed_1d5))
+                steps.append(Wait(0.5*speed_1d5))
+                steps.append(AnimationGroup(FadeOut(global_optimum_point), FadeOut(global_optimum_label), run_time=1*speed_1d5))
+
+            # 整轮只写一个分段视频文件。group 只放本轮开始时已在画面上、会被改动的对象；
+            # 本轮新建的对象由各自的 Create/Write 在轮到时加入场景，之前不会提前显示
+            on_screen = VGroup(current_point, current_label, temp_text, old_prob_info)
+            self.play(Succession(*steps, group=on_screen))
+            # 旧概率信息淡出时 group 会被拆开、成员重复留在场景列表里，重新加入一次去重
+            self.add(current_point, current_label, temp_text)
 
 
         # 最终状态
@@ -485,6 +547,26 @@ class SA_Introduction(Scene):
         self.play(Write(formula), Write(formula_explanation))
         self.wait(2)
 
+        # 多链对比：同样的计算量下，1万条独立退火链 vs 1250个并行回火系统（每个8个温度副本），
+        # 画出最终位置的分布，并统计落在全局最优附近的比例
+        ensemble = trace("sa_ensemble", n_chains=10000, n_iterations=200, seed=self.seed)
+        self.play(FadeOut(formula), FadeOut(formula_explanation), FadeOut(final_text))
+        peak = max(np.histogram(ensemble[k], bins=50, range=(0, 10))[0].max() / len(ensemble[k])
+                   for k in ("sa_final", "pt_final"))
+        sa_bars = histogram_bars(axes, ensemble["sa_final"], scale=6 / peak, color=BLUE)
+        pt_bars = histogram_bars(axes, ensemble["pt_final"], scale=6 / peak, color=GREEN)
+        sa_rate = Tex(f"独立退火链: {100 * float(ensemble['sa_success']):.1f}\\% 找到全局最优",
+                      tex_template=TexTemplateLibrary.ctex, font_size=24, color=BLUE)
+        pt_rate = Tex(f"并行回火: {100 * float(ensemble['pt_success']):.1f}\\% 找到全局最优",
+                      tex_template=TexTemplateLibrary.ctex, font_size=24, color=GREEN)
+        rates = VGroup(sa_rate, pt_rate).arrange(DOWN, aligned_edge=LEFT).to_edge(RIGHT).shift(UP)
+
+        self.play(Create(sa_bars), Write(sa_rate))
+        self.wait(2)
+        self.play(ReplacementTransform(sa_bars, pt_bars), Write(pt_rate))
+        self.wait(2)
+        self.play(FadeOut(pt_bars), FadeOut(rates))
+
         # 总结
         summary_text = Tex(
             "模拟退火算法通过控制温度参数，\\\
@@ -0,0 +1,37 @@
+from manim import *
+
+from draft import draft_mode
+from hold_frames import HoldFrames
+from parallel_render import SectionPlan
+from tex_batch import TexBatch
+from text_cache import TEXT_CACHE
+
+# 各场景共用的基类：setup / tear_down 中挂上 LaTeX 批量编译、静止帧复制、草稿模式与分段记录，
+# 场景只需继承 BaseScene 并设置自己的 seed。新的渲染钩子加在这里，三个场景同时生效。
+
+
+class BaseScene(Scene):
+    # 场景的随机种子：所有轨迹都用它模拟，也是轨迹缓存的键；不改种子时重新渲染的画面与上次完全相同
+    seed = 0
+
+    def setup(self):
+        # 先把本场景用到的 LaTeX 按模板各编译一次（首次渲染或代码改动后先空跑一遍场景收集字符串），
+        # 并记录本次用到的字符串
+        self.tex_batch = TexBatch(type(self).__name__)
+        self.tex_batch.prepass(self)
+        self.tex_batch.compile()
+        self.tex_batch.record()
+        # 较长的静止等待只编码 1 秒的画面，其余时长复制已编码的数据包
+        self.hold_frames = HoldFrames(self)
+        self.hold_frames.install()
+        # 草稿模式（launcher render --draft）下缩短所有等待与动画
+        self.draft = draft_mode(self)
+        # 记录各段的起始动画，供分段并行渲染（launcher render --jobs）使用
+        self.section_plan = SectionPlan(self)
+        self.section_plan.install()
+
+    def tear_down(self):
+        self.tex_batch.save()
+        self.section_plan.save()
+        # 字形缓存超过上限时按最近使用时间淘汰
+        TEXT_CACHE.evict()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from aco_engine import (AntSystem, CompactPheromone, DensePheromone, ElitistUpdate, MaxMinUpdate,
+                        RankBasedUpdate, distance_matrix, nearest_neighbours)
+
+
+def cities(n, seed=0):
+    return np.random.default_rng(seed).random((n, 2))
+
+
+@pytest.mark.parametrize("update", [None, ElitistUpdate(), RankBasedUpdate(), MaxMinUpdate()])
+def test_best_tour_is_permutation(update):
+    colony = AntSystem(cities(12), update=update, rng=np.random.default_rng(1))
+    tour, length = colony.run(10)
+    assert sorted(tour) == list(range(12))
+    assert length == pytest.approx(colony.tour_lengths(tour)[0])
+    # 全局最优长度不增
+    assert np.all(np.diff(colony.history) <= 0)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 8])
+def test_max_min_bounds_small_instances(n):
+    colony = AntSystem(cities(n), update=MaxMinUpdate(), rng=np.random.default_rng(1))
+    colony.run(3)
+    tau_min, tau_max = colony.update.bounds(colony)
+    assert 0 < tau_min <= tau_max
+    assert np.all(colony.pheromone.data >= tau_min * (1 - 1e-12))
+
+
+@pytest.mark.parametrize("n", [6, 20])
+def test_compact_storage_matches_dense(n):
+    rng = np.random.default_rng(n)
+    cand, _ = nearest_neighbours(cities(n), n - 1)
+    dense = DensePheromone(n, 0.5)
+    compact = CompactPheromone(cand, 0.5, dtype=np.float64, renormalize_below=0.2)
+    for _ in range(20):
+        src = rng.integers(n, size=10)
+        dst = (src + rng.integers(1, n, size=10)) % n
+        amount = rng.random(10)
+        for storage in (dense, compact):
+            storage.evaporate(0.7)
+            storage.deposit(src, dst, amount)
+            storage.clip(0.01, 2.0)
+    i, j = np.triu_indices(n, k=1)
+    assert np.allclose(compact.values(i, j), dense.values(i, j), rtol=1e-12)
+    assert np.allclose(compact.values(j, i), dense.values(j, i), rtol=1e-12)
+    assert np.allclose(compact.candidate_values(), dense.candidate_values(cand), rtol=1e-12)
+    assert np.allclose(compact.rows([0, n - 1]), dense.rows([0, n - 1]), rtol=1e-12)
+
+
+@pytest.mark.parametrize("dtype, rtol", [(np.float64, 1e-9), (np.float32, 1e-4)])
+def test_compact_colony_matches_dense(dtype, rtol):
+    # 候选表包含所有城市时，两种存储的信息素与路径应相同（float32 只差舍入）
+    n = 10
+    runs = {}
+    for storage in ("dense", "compact"):
+        colony = AntSystem(cities(n, 4), candidates=n - 1, storage=storage,
+                           dtype=dtype if storage == "compact" else None, rng=np.random.default_rng(9))
+        tours, _ = colony.step()
+        runs[storage] = colony, tours
+    (dense, dense_tours), (compact, compact_tours) = runs["dense"], runs["compact"]
+    assert np.array_equal(dense_tours, compact_tours)
+    i, j = np.triu_indices(n, k=1)
+    assert np.allclose(compact.pheromone.values(i, j), dense.pheromone.values(i, j), rtol=rtol)
+
+
+@pytest.mark.parametrize("n, k", [(30, 5), (200, 8), (50, 60)])
+def test_nearest_neighbours_exact(n, k):
+    points = cities(n, 5)
+    idx, dist = nearest_neighbours(points, k)
+    d = distance_matrix(points)
+    np.fill_diagonal(d, np.inf)
+    k = min(k, n - 1)
+    assert np.allclose(dist, np.sort(d, axis=1)[:, :k])
+    assert np.allclose(np.take_along_axis(d, idx, axis=1), dist)
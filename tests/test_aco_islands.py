@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from aco_engine import distance_matrix, tour_lengths
+from aco_islands import run_islands
+
+
+@pytest.fixture(scope="module")
+def points():
+    return np.random.default_rng(11).random((15, 2))
+
+
+@pytest.mark.parametrize("migration, storage", [("best", "dense"), ("blend", "dense"), ("blend", "compact")])
+def test_islands_return_consistent_tours(points, migration, storage):
+    kwargs = dict(candidates=6, storage="compact") if storage == "compact" else {}
+    result = run_islands(points, n_islands=3, n_iterations=12, exchange_every=4, migration=migration,
+                         seed=1, **kwargs)
+    dist = distance_matrix(points)
+    assert result.island_tours.shape == (3, 15)
+    for tour, length in zip(result.island_tours, result.island_lengths):
+        assert sorted(tour) == list(range(15))
+        assert length == pytest.approx(tour_lengths(dist, tour)[0])
+    assert result.history.shape == (3, 12)
+    assert np.all(np.diff(result.history, axis=1) <= 1e-12)
+    # 交换点 4、8 轮与最后一轮各有一张快照
+    assert result.snapshots.shape == (3, 3, 15)
+    assert result.best_length == pytest.approx(result.island_lengths.min())
+
+
+def test_best_migration_spreads_along_ring(points):
+    result = run_islands(points, n_islands=4, n_iterations=20, exchange_every=2, seed=2)
+    # 每次交换后各岛屿的最优不差于上一个岛屿交换前的最优
+    snapshots = result.snapshots
+    dist = distance_matrix(points)
+    lengths = np.array([[tour_lengths(dist, t)[0] for t in island] for island in snapshots])
+    for i in range(4):
+        assert np.all(lengths[i, 1:] <= lengths[i - 1, :-1] + 1e-9)
+
+
+def test_islands_reproducible(points):
+    a = run_islands(points, n_islands=2, n_iterations=6, exchange_every=3, seed=5)
+    b = run_islands(points, n_islands=2, n_iterations=6, exchange_every=3, seed=5)
+    assert np.array_equal(a.island_tours, b.island_tours)
+    assert np.array_equal(a.history, b.history)
+
+
+def test_unknown_migration(points):
+    with pytest.raises(ValueError):
+        run_islands(points, migration="swap")
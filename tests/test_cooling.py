@@ -0,0 +1,50 @@
+import numpy as np
+
+from sa_engine import AdaptiveCooling, Annealer, GeometricCooling, LogarithmicCooling, LundyMeesCooling
+
+
+def energy(x):
+    return np.sin(3.0 * x[:, 0]) + 0.1 * (x[:, 0] - 5.0) ** 2
+
+
+def annealer(schedule, n_chains=4, t0=10.0):
+    return Annealer(energy, n_chains=n_chains, t0=t0, schedule=schedule, rng=np.random.default_rng(0))
+
+
+def test_geometric():
+    sa = annealer(GeometricCooling(0.9))
+    sa.run(5)
+    assert np.allclose(sa.temperature, 10.0 * 0.9 ** 5)
+
+
+def test_logarithmic():
+    sa = annealer(LogarithmicCooling(c=2.0))
+    sa.run(7)
+    # 第 k 次降温后 T = T0 / (1 + c·ln(1 + k))，k 从 1 开始
+    assert np.allclose(sa.temperature, 10.0 / (1.0 + 2.0 * np.log(8)))
+
+
+def test_lundy_mees():
+    sa = annealer(LundyMeesCooling(beta=0.1))
+    t = 10.0
+    for _ in range(6):
+        sa.step()
+        t = t / (1.0 + 0.1 * t)
+    assert np.allclose(sa.temperature, t)
+
+
+def test_adaptive_tracks_target():
+    # 接受率高于目标时降温
+    schedule = AdaptiveCooling(target=0.05, decay=1.0, window=10, patience=10 ** 6)
+    sa = annealer(schedule, n_chains=64, t0=100.0)
+    sa.run(100)
+    assert np.all(sa.temperature < 100.0)
+    assert schedule.acceptance_rate().shape == (64,)
+
+
+def test_adaptive_reheats_stalled_chains():
+    schedule = AdaptiveCooling(target=0.0, min_target=0.0, decay=1.0, gain=5.0, patience=20, reheat=0.5)
+    sa = annealer(schedule, n_chains=8)
+    sa.run(300)
+    assert schedule.reheats.sum() > 0
+    assert np.all(schedule.stall < 20)
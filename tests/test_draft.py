@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import FadeIn, Scene, Square, Succession, Wait                # noqa: E402
+
+from draft import Draft, draft_mode                                      # noqa: E402
+
+
+def test_run_time_scaling():
+    draft = Draft(None, wait_factor=0.25, run_time_factor=0.5, max_wait=0.5)
+    assert draft.run_time(Wait(20)) == 0.5
+    assert draft.run_time(Wait(1)) == 0.25
+    assert draft.run_time(FadeIn(Square(), run_time=2)) == 1.0
+    # Succession 按整体时长缩放，其中的 Wait 一起缩短
+    assert draft.run_time(Succession(FadeIn(Square()), Wait(3))) == 2.0
+
+
+def test_draft_mode_from_environment(monkeypatch):
+    monkeypatch.delenv("MANIM_DRAFT", raising=False)
+    assert draft_mode(Scene()) is None
+    monkeypatch.setenv("MANIM_DRAFT", "0")
+    assert draft_mode(Scene()) is None
+
+    monkeypatch.setenv("MANIM_DRAFT", "1")
+    monkeypatch.setenv("MANIM_DRAFT_MAX_WAIT", "0.2")
+    monkeypatch.setenv("MANIM_DRAFT_RUN_TIME_FACTOR", "0.25")
+    scene = Scene()
+    draft = draft_mode(scene)
+    assert draft.max_wait == 0.2 and draft.run_time_factor == 0.25
+    assert scene.compile_animations(Wait(3))[0].run_time == 0.2
+    assert scene.compile_animations(FadeIn(Square()), run_time=2)[0].run_time == 0.5
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from hc_engine import HillClimber, basins
+from objectives import OBJECTIVES, HillClimbingLandscape
+
+
+@pytest.mark.parametrize("mode", ["steepest", "first"])
+@pytest.mark.parametrize("maximize", [False, True])
+def test_climbers_never_worsen(mode, maximize):
+    landscape = HillClimbingLandscape()
+    climber = HillClimber(landscape, n_starts=50, mode=mode, maximize=maximize, rng=np.random.default_rng(0))
+    start = climber.value.copy()
+    climber.run()
+    sign = -1.0 if maximize else 1.0
+    assert climber.converged.all()
+    assert np.all(sign * climber.value <= sign * start)
+    assert np.all(np.diff(sign * np.array(climber.history)) <= 0)
+    assert np.allclose(climber.value, landscape(climber.x))
+
+
+def test_steepest_finds_local_optimum():
+    landscape = HillClimbingLandscape()
+    climber = HillClimber(landscape, n_starts=1, x0=[[3.0]], min_step=1e-6, maximize=True,
+                          rng=np.random.default_rng(0))
+    x, value = climber.run()
+    # 局部最大值处两侧的函数值都不更大
+    assert value >= landscape.at(x[0] - 1e-4) and value >= landscape.at(x[0] + 1e-4)
+
+
+def test_restart_keeps_best():
+    rastrigin = OBJECTIVES["rastrigin"](2)
+    climber = HillClimber(rastrigin, n_starts=4, dim=2, bounds=(-5.12, 5.12), restart=True,
+                          rng=np.random.default_rng(1))
+    climber.run(300)
+    assert climber.restarts.sum() > 0
+    assert np.allclose(climber.best_value, rastrigin(climber.best_x))
+    assert np.all(np.diff(climber.history) <= 0)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        HillClimber(HillClimbingLandscape(), mode="random")
+
+
+def test_basins_group_endpoints():
+    x = np.array([1.0, 1.01, 0.99, 5.0, 5.02, 9.0])
+    value = np.array([3.0, 2.9, 2.95, 7.0, 7.1, 1.0])
+    centers, values, share = basins(x, value, tolerance=0.05)
+    assert np.allclose(share, [3 / 6, 2 / 6, 1 / 6])
+    # 代表点取函数值居中的终点
+    assert np.allclose(centers[:, 0], [0.99, 5.02, 9.0])
+    assert np.allclose(values, [2.95, 7.1, 1.0])
+    assert share.sum() == pytest.approx(1.0)
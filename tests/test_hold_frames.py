@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("manim")
+
+import av                                                                # noqa: E402
+from manim import Circle, FadeIn, Scene, Square, tempconfig              # noqa: E402
+
+from hold_frames import HoldFrames                                       # noqa: E402
+
+
+class Still(Scene):
+    def setup(self):
+        self.hold_frames = HoldFrames(self)
+        self.hold_frames.install()
+
+    def construct(self):
+        self.add(Square())
+        self.wait(3.4)
+        self.wait(0.5)
+        self.play(FadeIn(Circle()), run_time=0.5)
+
+
+def decoded(path):
+    with av.open(str(path)) as container:
+        return [frame.pts for frame in container.decode(video=0)]
+
+
+@pytest.fixture(scope="module")
+def rendered(tmp_path_factory):
+    media = tmp_path_factory.mktemp("media")
+    with tempconfig({"media_dir": str(media), "frame_rate": 15, "pixel_width": 320, "pixel_height": 180,
+                     "disable_caching": True}):
+        scene = Still()
+        scene.render()
+        writer = scene.renderer.file_writer
+        return scene, list(writer.partial_movie_files), writer.movie_file_path
+
+
+def test_only_long_still_wait_is_copied(rendered):
+    scene, _, _ = rendered
+    # 3.4 s × 15 fps = 51 帧：编码 15 帧的单位片段与 6 帧的余数，其余 30 帧复制
+    assert scene.hold_frames.holds == 1
+    assert scene.hold_frames.copied_frames == 30
+
+
+def test_remuxed_partial_has_every_frame(rendered):
+    _, partials, _ = rendered
+    pts = decoded(partials[0])
+    assert len(pts) == 51
+    assert all(a < b for a, b in zip(pts, pts[1:]))
+    # 短等待与动画照常编码
+    assert len(decoded(partials[1])) == 7
+
+
+def test_combined_movie_duration(rendered):
+    _, partials, movie = rendered
+    expected = sum(len(decoded(p)) for p in partials)
+    assert len(decoded(movie)) == expected
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from objectives import OBJECTIVES
+
+
+@pytest.mark.parametrize("name", sorted(OBJECTIVES))
+def test_batch_matches_scalar(name):
+    objective = OBJECTIVES[name](3)
+    lo, hi = objective.bounds
+    X = np.random.default_rng(0).uniform(lo, hi, (20, objective.dim))
+    values = objective(X)
+    assert values.shape == (20,)
+    assert np.allclose(values, [objective.at(*x) for x in X])
+
+
+@pytest.mark.parametrize("name", ["sphere", "rastrigin", "rosenbrock", "ackley", "griewank"])
+@pytest.mark.parametrize("dim", [1, 2, 10])
+def test_optimum(name, dim):
+    objective = OBJECTIVES[name](dim)
+    x = objective.optimum_position()
+    assert objective.at(*x) == pytest.approx(objective.optimum, abs=1e-12)
+    # 最优点附近的随机点都不更好
+    X = x + np.random.default_rng(1).normal(scale=0.1, size=(50, dim))
+    assert np.all(objective(X) >= objective.optimum - 1e-12)
+
+
+@pytest.mark.parametrize("name", ["hill", "annealing"])
+def test_scene_landscapes_are_one_dimensional(name):
+    landscape = OBJECTIVES[name](5)
+    assert landscape.dim == 1
+    assert landscape.optimum_position() is None
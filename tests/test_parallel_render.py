@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Scene, tempconfig                                      # noqa: E402
+
+from parallel_render import SectionPlan, section_movies, section_ranges, worker_args  # noqa: E402
+
+
+def test_section_ranges():
+    plan = dict(sections=[["介绍", 0, 0.0], ["空段", 3, 5.0], ["流程", 3, 5.0], ["总结", 7, 20.0]],
+                plays=9, duration=26.0)
+    assert section_ranges(plan) == [("介绍", 0, 2, 5.0), ("流程", 3, 6, 15.0), ("总结", 7, 8, 6.0)]
+
+
+def test_section_ranges_with_leading_plays():
+    plan = dict(sections=[["正文", 2, 4.0]], plays=5, duration=10.0)
+    assert section_ranges(plan) == [("", 0, 1, 4.0), ("正文", 2, 4, 6.0)]
+    assert section_ranges(dict(sections=[], plays=3, duration=2.0)) == [("", 0, 2, 2.0)]
+
+
+def test_worker_args_strip_preview():
+    assert worker_args(["-pql", "--fps", "30"]) == ["-ql", "--fps", "30"]
+    assert worker_args(["-p", "-qh", "-f", "--preview"]) == ["-qh"]
+    assert worker_args(["-pf"]) == []
+    assert worker_args(["--format", "mp4"]) == ["--format", "mp4"]
+
+
+class Sections(Scene):
+    def construct(self):
+        self.next_section("一")
+        self.wait(0.5)
+        self.wait(0.5)
+        self.next_section("二")
+        self.wait(1)
+
+
+def test_section_plan_records_and_saves(tmp_path):
+    with tempconfig({"media_dir": str(tmp_path / "media"), "dry_run": True}):
+        scene = Sections()
+        plan = SectionPlan(scene, plan_dir=str(tmp_path))
+        plan.install()
+        scene.construct()
+        plan.save()
+    with open(tmp_path / "Sections.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert [s[:2] for s in saved["sections"]] == [["一", 0], ["二", 2]]
+    assert saved["plays"] == 3 and saved["duration"] == pytest.approx(2.0)
+    assert section_ranges(saved) == [("一", 0, 1, pytest.approx(1.0)), ("二", 2, 2, pytest.approx(1.0))]
+
+
+def test_section_movies(tmp_path):
+    for name in ["Sections.mp4", "Sections_section00.mp4", "Sections_section01.mov", "Sections_section02.mp4",
+                 "Other_section00.mp4"]:
+        (tmp_path / name).write_bytes(b"")
+    plan = dict(movie_dir=str(tmp_path))
+    # 只返回本次各段的成片，整个场景的成片与其他场景的文件不动
+    found = sorted(p.rsplit("/", 1)[-1] for p in section_movies(plan, "Sections", 2))
+    assert found == ["Sections_section00.mp4", "Sections_section01.mov"]
+    assert section_movies(dict(movie_dir=None), "Sections", 2) == []
+    assert section_movies(dict(movie_dir=str(tmp_path / "missing")), "Sections", 2) == []
+
+
+def test_section_plan_not_saved_for_partial_render(tmp_path):
+    with tempconfig({"media_dir": str(tmp_path / "media"), "dry_run": True, "upto_animation_number": 1}):
+        plan = SectionPlan(Sections(), plan_dir=str(tmp_path))
+        plan.save()
+    assert not (tmp_path / "Sections.json").exists()
@@ -0,0 +1,94 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from objectives import OBJECTIVES
+from pso_engine import (GlobalTopology, ParticleSwarm, RandomTopology, RingTopology,
+                        VonNeumannTopology)
+
+
+class Swarm:
+    def __init__(self, n, seed=0):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 9, 12, 30])
+def test_von_neumann_is_torus(n):
+    topology = VonNeumannTopology()
+    topology.initialize(Swarm(n))
+    nbr = topology.neighbours
+    assert np.array_equal(nbr[:, 0], np.arange(n))
+    # 环面网格上的邻接关系对称
+    adjacent = np.zeros((n, n), dtype=bool)
+    adjacent[np.arange(n)[:, None], nbr] = True
+    assert np.array_equal(adjacent, adjacent.T)
+
+
+def test_von_neumann_square_grid():
+    topology = VonNeumannTopology()
+    topology.initialize(Swarm(16))
+    # 4×4 网格：第 0 行第 0 列的左邻是第 3 列，上邻是第 3 行
+    assert topology.neighbours[0].tolist() == [0, 3, 1, 12, 4]
+    assert topology.neighbours[7].tolist() == [7, 6, 4, 3, 11]
+
+
+@pytest.mark.parametrize("n, k", [(2, 3), (5, 3), (20, 3), (20, 19)])
+def test_random_informants_distinct(n, k):
+    topology = RandomTopology(k)
+    topology.initialize(Swarm(n))
+    nbr = topology.neighbours
+    assert nbr.shape == (n, min(k, n - 1) + 1)
+    for i, row in enumerate(nbr.tolist()):
+        assert row[0] == i
+        assert i not in row[1:]
+        assert len(set(row)) == len(row)
+
+
+def test_random_topology_large_swarm():
+    # 十万个粒子：邻接表只占 (N, k+1)，不能构建 N×N 的中间矩阵
+    n, k = 100_000, 3
+    tracemalloc.start()
+    try:
+        topology = RandomTopology(k)
+        topology.initialize(Swarm(n))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    nbr = topology.neighbours
+    assert nbr.shape == (n, k + 1)
+    assert peak < 10 * n * (k + 1) * nbr.itemsize
+    assert np.array_equal(nbr[:, 0], np.arange(n))
+    others = np.sort(nbr[:, 1:], axis=1)
+    assert np.all(others[:, 1:] != others[:, :-1])
+    assert not np.any(nbr[:, 1:] == nbr[:, :1])
+
+
+
+def test_swarm_state_is_consistent():
+    objective = OBJECTIVES["rastrigin"](3)
+    swarm = ParticleSwarm(objective, n_particles=15, dim=3, w=0.7, c1=1.5, c2=1.5, v_max=1.0,
+                          clip=True, rng=np.random.default_rng(4))
+    swarm.run(40)
+    assert swarm.positions.shape == swarm.velocities.shape == (15, 3)
+    assert np.all(np.abs(swarm.velocities) <= 1.0)
+    assert np.all((swarm.positions >= -3.0) & (swarm.positions <= 3.0))
+    assert np.allclose(swarm.pbest_fitness, objective(swarm.pbest_positions))
+    assert swarm.gbest_fitness == pytest.approx(swarm.pbest_fitness.min())
+    assert np.all(np.diff(swarm.history) <= 0)
+
+
+def test_swarm_reproducible():
+    runs = [ParticleSwarm(OBJECTIVES["sphere"](2), n_particles=5, rng=np.random.default_rng(6)).run(10)
+            for _ in range(2)]
+    assert np.array_equal(runs[0][0], runs[1][0]) and runs[0][1] == runs[1][1]
+
+
+@pytest.mark.parametrize("topology", [GlobalTopology, RingTopology, VonNeumannTopology, RandomTopology])
+def test_pbest_never_worsens(topology):
+    swarm = ParticleSwarm(OBJECTIVES["sphere"](2), n_particles=20, dim=2, w=0.7, c1=1.5, c2=1.5,
+                          topology=topology(), rng=np.random.default_rng(3))
+    before = swarm.pbest_fitness.copy()
+    swarm.run(30)
+    assert np.all(swarm.pbest_fitness <= before)
@@ -0,0 +1,51 @@
+import shutil
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+if shutil.which("latex") is None:
+    pytest.skip("需要 LaTeX 编译字形表", allow_module_level=True)
+
+from manim import RIGHT, TexTemplate, TexTemplateLibrary                 # noqa: E402
+
+from readout import CHARS, GlyphAtlas, Readout, atlas_key                # noqa: E402
+
+
+def test_atlas_has_every_char():
+    atlas = GlyphAtlas.get()
+    assert set(atlas.points) == set(CHARS)
+    assert GlyphAtlas.get() is atlas
+
+
+def test_atlas_key_uses_template_content():
+    # 内容相同的模板对象共用一个键，内容不同的模板不会命中旧字形表
+    assert atlas_key("x", TexTemplate()) == atlas_key("x", TexTemplate())
+    assert atlas_key("x", TexTemplate()) != atlas_key("x", TexTemplateLibrary.ctex)
+    assert atlas_key("x", TexTemplate(), 24) != atlas_key("x", TexTemplate(), 48)
+
+
+
+def test_set_value_resizes_slots():
+    readout = Readout(3.14159, num_decimal_places=2)
+    assert readout.text == "3.14" and len(readout.chars) == 4
+    readout.set_value(-120.5)
+    assert readout.text == "-120.50" and len(readout.chars) == 7
+    assert readout.get_value() == -120.5
+    readout.set_value(0)
+    assert len(readout.chars) == 4
+
+
+def test_set_value_keeps_position_and_scale():
+    readout = Readout(1.0, prefix="$T =$")
+    readout.scale(2).shift(3 * RIGHT)
+    left, width = readout.get_left()[0], readout.chars[0].width
+    readout.set_value(8.0)
+    assert readout.get_left()[0] == pytest.approx(left)
+    assert readout.chars[0].width == pytest.approx(2 * GlyphAtlas.get("$T =$").widths["8"])
+    assert width == pytest.approx(2 * GlyphAtlas.get("$T =$").widths["1"])
+
+
+def test_rejects_unprintable_value():
+    with pytest.raises(ValueError):
+        Readout(np.nan)
@@ -0,0 +1,56 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from objectives import AnnealingLandscape
+from sa_engine import (AdaptiveCooling, Annealer, GeometricCooling, LogarithmicCooling,
+                       LundyMeesCooling, ParallelTempering)
+
+
+def energy(x):
+    return np.sin(3.0 * x[:, 0]) + 0.1 * (x[:, 0] - 5.0) ** 2
+
+
+@pytest.mark.parametrize("schedule", [GeometricCooling, LogarithmicCooling, LundyMeesCooling, AdaptiveCooling])
+def test_best_energy_never_increases(schedule):
+    sa = Annealer(energy, n_chains=16, schedule=schedule(), rng=np.random.default_rng(0))
+    sa.run(200)
+    assert np.all(np.diff(sa.history) <= 0)
+    assert np.allclose(sa.best_energy, energy(sa.best_x))
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_zero_temperature_is_greedy(dtype):
+    # α = 0.01 时温度几轮后就下溢为 0
+    sa = Annealer(energy, n_chains=32, schedule=GeometricCooling(0.01), dtype=dtype,
+                  rng=np.random.default_rng(1))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        sa.run(400)
+        assert np.all(sa.temperature == 0)
+        for _ in range(50):
+            before = sa.energy.copy()
+            sa.step()
+            assert np.all(sa.energy <= before)
+
+
+def test_parallel_tempering_with_zero_rung():
+    pt = ParallelTempering(energy, n_systems=4, temperatures=[0.0, 0.5, 2.0, 8.0],
+                           rng=np.random.default_rng(2))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        pt.run(200)
+    assert pt.swap_accepts.sum() > 0
+    # 交换只重排状态，每条链的能量仍与其解一致
+    assert np.allclose(pt.energy, energy(pt.x))
+    assert pt.coldest().shape == (4, 1)
+
+
+def test_parallel_tempering_finds_landscape_minimum():
+    landscape = AnnealingLandscape()
+    pt = ParallelTempering(landscape, n_systems=2, n_replicas=6, step=1.0,
+                           rng=np.random.default_rng(3))
+    pt.run(500)
+    xs = np.linspace(0.0, 10.0, 10001)[:, None]
+    assert pt.best_energy.min() == pytest.approx(landscape(xs).min(), abs=1e-2)
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import MathTex, Scene, Tex, config, tempconfig                 # noqa: E402
+from manim.mobject.text import tex_mobject                                # noqa: E402
+from manim.utils.tex_file_writing import generate_tex_file                # noqa: E402
+
+import tex_batch                                                          # noqa: E402
+from tex_batch import TexBatch                                            # noqa: E402
+
+
+class Formulas(Scene):
+    def construct(self):
+        self.add(MathTex("E", "=", "mc^2"), Tex("hello"))
+        self.wait(0.1)
+
+
+class Indexing(Scene):
+    # 按下标取字形：空跑时占位 SVG 只有一个字形，会抛出 IndexError
+    runs = 0
+
+    def construct(self):
+        type(self).runs += 1
+        self.add(Tex("ab")[0][1])
+
+
+class Broken(Scene):
+    runs = 0
+
+    def construct(self):
+        type(self).runs += 1
+        self.add(Tex("broken"))
+        raise RuntimeError("construct 本身的错误")
+
+
+@pytest.fixture
+def batches(tmp_path, monkeypatch):
+    # 不调用 LaTeX，只记录每次批量编译的字符串
+    calls = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tex_batch, "compile_batch", lambda tex_template, items: calls.append(items) or 1)
+    return calls
+
+
+def test_prepass_collects_before_construct(tmp_path, batches):
+    original = tex_mobject.tex_to_svg_file
+    with tempconfig({"media_dir": str(tmp_path / "media")}):
+        batch = TexBatch("Formulas", manifest_dir=str(tmp_path / "manifest"))
+        batch.prepass(Formulas())
+    assert tex_mobject.tex_to_svg_file is original
+    # 整串与每一段各一项，Tex 一项；两个环境同一模板，一次编译
+    assert len(batches) == 1
+    expressions = {e for e, _ in batches[0]}
+    assert {"E", "=", "mc^2", "hello"} <= expressions
+    assert batch.processes == 1
+
+
+@pytest.fixture
+def svg_batches(tmp_path, monkeypatch):
+    # 批量编译时写出占位 SVG，再次空跑时这些字符串不再登记
+    calls = []
+    monkeypatch.chdir(tmp_path)
+
+    def compile_batch(tex_template, items):
+        calls.append(items)
+        for expression, environment in items:
+            svg = generate_tex_file(expression, environment, tex_template).with_suffix(".svg")
+            svg.write_text(tex_batch.PLACEHOLDER_SVG)
+        return 1
+
+    monkeypatch.setattr(tex_batch, "compile_batch", compile_batch)
+    return calls
+
+
+@pytest.mark.parametrize("scene, runs", [(Indexing, 2), (Broken, 1)])
+def test_prepass_retries_only_placeholder_errors(tmp_path, monkeypatch, svg_batches, scene, runs):
+    warnings = []
+    monkeypatch.setattr(tex_batch.logger, "warning", lambda *args, **kwargs: warnings.append(args))
+    monkeypatch.setattr(scene, "runs", 0)
+    with tempconfig({"media_dir": str(tmp_path / "media")}):
+        TexBatch(scene.__name__, manifest_dir=str(tmp_path / "manifest")).prepass(scene(), rounds=3)
+    # 占位字形上的 IndexError 编译后重跑一轮，第二轮没有新字符串就停止；其他异常只跑一轮并给出警告
+    assert scene.runs == runs
+    assert len(svg_batches) == 1
+    assert len(warnings) == (scene is Broken)
+
+
+def test_prepass_skipped_with_fresh_manifest(tmp_path, batches):
+    manifest = tmp_path / "manifest"
+    manifest.mkdir()
+    (manifest / "Formulas.json").write_text(json.dumps(dict(templates={}, entries=[])))
+    TexBatch("Formulas", manifest_dir=str(manifest)).prepass(Formulas())
+    assert batches == []
+
+
+def test_save_skips_partial_render(tmp_path):
+    batch = TexBatch("Formulas", manifest_dir=str(tmp_path))
+    with tempconfig({"upto_animation_number": 3}):
+        batch.save()
+    assert not (tmp_path / "Formulas.json").exists()
+    assert config.upto_animation_number < 0
+    batch.save()
+    assert (tmp_path / "Formulas.json").exists()
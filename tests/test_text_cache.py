@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import FadeIn, Text, VMobject                                # noqa: E402
+from manim.camera.camera import Camera                                  # noqa: E402
+from manim.utils.hashing import get_hash_from_play_call                 # noqa: E402
+
+from text_cache import CachedText, GlyphCache                           # noqa: E402
+
+
+def play_hash(mobject):
+    return get_hash_from_play_call(object(), Camera(), [FadeIn(mobject)], [mobject])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GlyphCache(cache_dir=str(tmp_path / "glyphs"))
+
+
+def test_cold_and_warm_hashes_match(cache):
+    cold = CachedText("蚁群算法 ACO", font_size=36, color="#FFFF00", cache=cache)
+    assert cache.misses == 1 and cache.hits == 0
+    warm = CachedText("蚁群算法 ACO", font_size=36, color="#FFFF00", cache=cache)
+    assert cache.hits == 1
+    assert all(type(m) is VMobject for m in cold.submobjects + warm.submobjects)
+    assert play_hash(cold) == play_hash(warm)
+
+    # 新进程只能从磁盘读取
+    reloaded = CachedText("蚁群算法 ACO", font_size=36, color="#FFFF00",
+                          cache=GlyphCache(cache_dir=cache.cache_dir))
+    assert play_hash(reloaded) == play_hash(cold)
+
+
+def test_hit_has_same_outlines_and_color(cache):
+    cold = CachedText("L = 12.34", cache=cache)
+    warm = CachedText("L = 12.34", cache=cache)
+    assert len(cold.submobjects) == len(warm.submobjects)
+    for a, b in zip(cold.submobjects, warm.submobjects):
+        assert np.allclose(a.points, b.points)
+        assert a.get_fill_color() == b.get_fill_color()
+    # 颜色不参与缓存键
+    red = CachedText("L = 12.34", color="#FF0000", cache=cache)
+    assert cache.hits == 2
+    assert red.submobjects[0].get_fill_color().to_hex() == "#FF0000"
+
+
+def test_evicts_least_recently_used(cache):
+    glyph = [np.zeros((400, 3))]
+    cache.put("a", glyph)
+    cache.put("b", glyph)
+    os.utime(cache.path("a"), (1, 1))
+    os.utime(cache.path("b"), (2, 2))
+    cache.max_bytes = cache.stats()["bytes"]
+    # 从磁盘读取时刷新最近使用时间，a 变为最新
+    assert GlyphCache(cache_dir=cache.cache_dir).get("a") is not None
+    cache.put("c", glyph)
+    cache.evict()
+    assert sorted(p.rsplit("/", 1)[-1] for p, _, _ in cache.entries()) == ["a.npz", "c.npz"]
+    assert cache.evictions == 1
+
+
+def test_evicts_every_few_writes(tmp_path, monkeypatch):
+    cache = GlyphCache(cache_dir=str(tmp_path), max_bytes=0, evict_every=3)
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, "entries", lambda: scans.append(1) or entries())
+    for key in "abcd":
+        cache.put(key, [np.zeros((4, 3))])
+    # 第 3 次写入时检查一次（上限为 0，全部淘汰），第 4 次写入不再列目录
+    assert len(scans) == 1
+    assert cache.evictions == 3 and os.path.exists(cache.path("d"))
+
+
+@pytest.mark.parametrize("style", [dict(fill_opacity=0.4), dict(stroke_width=2, stroke_color="#FF0000"),
+                                   dict(stroke_width=1.5, stroke_opacity=0.3, fill_opacity=0.0)])
+def test_style_kwargs_pass_through(cache, style):
+    plain = Text("PSO 粒子群", **style)
+    for text in (CachedText("PSO 粒子群", cache=cache, **style), CachedText("PSO 粒子群", cache=cache, **style)):
+        assert len(text.submobjects) == len(plain.submobjects)
+        for a, b in zip(text.submobjects, plain.submobjects):
+            assert a.get_fill_opacity() == pytest.approx(b.get_fill_opacity())
+            assert a.get_stroke_width() == pytest.approx(b.get_stroke_width())
+            assert a.get_stroke_opacity() == pytest.approx(b.get_stroke_opacity())
+            if "stroke_color" in style:
+                assert a.get_stroke_color() == b.get_stroke_color()
+    assert cache.hits == 1
@@ -0,0 +1,129 @@
+import functools
+import os
+
+import numpy as np
+import pytest
+
+import traces
+from traces import compact, frame, load_trace, save_trace, trace, trace_path, trace_params
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 精确解缓存等写在当前目录的 media/ 下
+    monkeypatch.chdir(tmp_path)
+
+
+def test_compact_dtypes():
+    assert compact(np.arange(3.0)).dtype == np.float32
+    assert compact(np.arange(3)).dtype == np.int16
+    assert compact(np.array([0, 1 << 20])).dtype == np.int32
+    assert compact(np.array([True])).dtype == np.bool_
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / "t.npz"
+    arrays = dict(x=np.linspace(0, 1, 7), tours=np.arange(12).reshape(3, 4), ok=np.array([True, False]))
+    save_trace(str(path), {"seed": 1, "bounds": [0, 10]}, "abc", **arrays)
+    loaded = load_trace(str(path))
+    assert loaded["params"] == {"seed": 1, "bounds": [0, 10]}
+    assert loaded["engine"] == "abc"
+    assert np.array_equal(loaded["x"], arrays["x"].astype(np.float32))
+    assert np.array_equal(loaded["tours"], arrays["tours"])
+    assert np.array_equal(loaded["ok"], arrays["ok"])
+
+
+def test_trace_replays_simulation(tmp_path):
+    fresh = traces.simulate_pso(n_iterations=4, seed=5)
+    first = trace("pso", trace_dir=str(tmp_path), n_iterations=4, seed=5)
+    second = trace("pso", trace_dir=str(tmp_path), n_iterations=4, seed=5)
+    for key, value in fresh.items():
+        assert np.array_equal(first[key], compact(value))
+        assert np.array_equal(second[key], first[key])
+    assert first["positions"].shape == (5, 3, 2)
+    assert np.array_equal(frame(first, 2).positions, first["positions"][2])
+
+
+def test_trace_resimulates_on_change(tmp_path, monkeypatch):
+    calls = []
+    simulate = traces.SIMULATORS["sa"]
+
+    @functools.wraps(simulate)
+    def counted(**params):
+        calls.append(params)
+        return simulate(**params)
+
+    monkeypatch.setitem(traces.SIMULATORS, "sa", counted)
+    monkeypatch.setattr(traces, "engine_version", lambda kind: "v1")
+    trace("sa", trace_dir=str(tmp_path), seed=20)
+    trace("sa", trace_dir=str(tmp_path), seed=20)
+    assert len(calls) == 1
+    # 参数不同
+    trace("sa", trace_dir=str(tmp_path), seed=20, n_iterations=5)
+    assert len(calls) == 2
+    # 引擎代码不同
+    monkeypatch.setattr(traces, "engine_version", lambda kind: "v2")
+    trace("sa", trace_dir=str(tmp_path), seed=20, n_iterations=5)
+    assert len(calls) == 3
+
+
+def test_trace_params_fill_defaults():
+    params = trace_params("sa", {"seed": 3})
+    assert params["n_iterations"] == 20 and params["bounds"] == [0, 10]
+    path = trace_path("sa", params, trace_dir="d")
+    assert os.path.basename(path).startswith("sa-3-") and path.endswith(".npz")
+    # 同一种子、不同参数的轨迹存在不同的文件里
+    assert trace_path("sa", trace_params("sa", {"seed": 3, "n_iterations": 5}), trace_dir="d") != path
+    assert trace_path("sa", trace_params("sa", {"seed": 3}), trace_dir="d") == path
+
+
+@pytest.mark.parametrize("content", [b"", b"PK\x03\x04 truncated"])
+def test_trace_recovers_from_corrupt_file(tmp_path, content):
+    good = trace("pso", trace_dir=str(tmp_path), n_iterations=2, seed=1)
+    path = trace_path("pso", trace_params("pso", {"n_iterations": 2, "seed": 1}), trace_dir=str(tmp_path))
+    with open(path, "wb") as f:
+        f.write(content)
+    again = trace("pso", trace_dir=str(tmp_path), n_iterations=2, seed=1)
+    assert np.array_equal(again["positions"], good["positions"])
+    assert load_trace(path)["params"] == good["params"]
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+@pytest.mark.parametrize("kind", sorted(traces.SIMULATORS))
+def test_engine_version_is_stable(kind):
+    assert traces.engine_version(kind) == traces.engine_version(kind)
+
+
+def test_islands_trace_is_deterministic(tmp_path):
+    kwargs = dict(n_iterations=6, exchange_every=2, seed=7)
+    a = traces.simulate_islands(**kwargs)
+    b = traces.simulate_islands(**kwargs)
+    for key in a:
+        assert np.array_equal(a[key], b[key])
+    assert a["island_tours"].shape == (4, 8)
+    assert a["snapshots"].shape == (4, 3, 8)
+    for tour in a["island_tours"]:
+        assert sorted(tour) == list(range(8))
+    replay = trace("islands", trace_dir=str(tmp_path), **kwargs)
+    assert np.allclose(replay["island_lengths"], a["island_lengths"], rtol=1e-6)
+
+
+def test_sa_trace_follows_annealer():
+    sa = traces.simulate_sa(n_iterations=30, seed=3)
+    assert np.array_equal(sa["current_x"], traces.simulate_sa(n_iterations=30, seed=3)["current_x"])
+    assert np.allclose(sa["temperature"], 10.0 * 0.85 ** np.arange(31))
+    for i, accepted in enumerate(sa["accepted"]):
+        # 接受则移动到提出的新解，否则原地不动
+        expected = sa["proposed_x"][i] if accepted else sa["current_x"][i]
+        assert sa["current_x"][i + 1] == expected
+    assert np.all(sa["accepted"][sa["delta_e"] <= 0])
+    assert np.all((sa["accept_prob"] > 0) & (sa["accept_prob"] <= 1))
+
+
+def test_city_layout_from_seed():
+    a = traces.simulate_aco(n_iterations=2, seed=11)
+    b = traces.simulate_islands(n_iterations=2, exchange_every=1, seed=11)
+    assert np.array_equal(a["cities"], b["cities"])
+    assert not np.array_equal(a["cities"], traces.simulate_aco(n_iterations=2, seed=12)["cities"])
+    i, j = np.triu_indices(len(a["cities"]), k=1)
+    assert np.linalg.norm(a["cities"][i] - a["cities"][j], axis=1).min() >= 0.8
@@ -0,0 +1,65 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+import tsp_exact
+from aco_engine import distance_matrix, tour_lengths
+from tsp_exact import held_karp, minimum_one_tree, one_tree_bound, reference
+
+
+def cities(n, seed):
+    return np.random.default_rng(seed).random((n, 2)) * 10
+
+
+def brute_force(dist):
+    n = len(dist)
+    tours = np.array([(0,) + p for p in permutations(range(1, n))])
+    return tour_lengths(dist, tours).min()
+
+
+@pytest.mark.parametrize("n", range(2, 9))
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_held_karp_matches_brute_force(n, seed):
+    dist = distance_matrix(cities(n, seed))
+    length, tour = held_karp(dist)
+    assert sorted(tour) == list(range(n))
+    assert length == pytest.approx(tour_lengths(dist, tour)[0])
+    assert length == pytest.approx(brute_force(dist))
+
+
+@pytest.mark.parametrize("n", [5, 8, 12])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_one_tree_bound_below_optimum(n, seed):
+    dist = distance_matrix(cities(n, seed))
+    optimum, _ = held_karp(dist)
+    total, degree = minimum_one_tree(dist)
+    assert total <= optimum + 1e-9
+    assert degree.sum() == 2 * n
+    assert one_tree_bound(dist, upper=optimum) <= optimum + 1e-9
+
+
+def test_reference_caches_on_disk(tmp_path):
+    points = cities(7, 3)
+    length, tour, exact = reference(points, cache_dir=str(tmp_path))
+    assert exact and sorted(tour) == list(range(7))
+    assert len(list(tmp_path.iterdir())) == 1
+    # 大于 exact_limit 时返回下界
+    bound, tour, exact = reference(cities(9, 3), exact_limit=8, cache_dir=None)
+    assert not exact and tour is None
+    assert bound <= held_karp(distance_matrix(cities(9, 3)))[0] + 1e-9
+
+
+def test_reference_keys_on_method(tmp_path, monkeypatch):
+    monkeypatch.setattr(tsp_exact, "_cache", {})
+    points = cities(8, 5)
+    optimum = held_karp(distance_matrix(points))[0]
+    bound, _, exact = reference(points, exact_limit=4, cache_dir=str(tmp_path))
+    assert not exact and bound <= optimum + 1e-9
+    # 同一组城市再求精确解不能拿到缓存的下界，反之亦然；内存缓存清空后从磁盘读取也一样
+    for _ in range(2):
+        length, tour, exact = reference(points, cache_dir=str(tmp_path))
+        assert exact and length == pytest.approx(optimum) and sorted(tour) == list(range(8))
+        assert reference(points, exact_limit=4, cache_dir=str(tmp_path)) == (bound, None, False)
+        monkeypatch.setattr(tsp_exact, "_cache", {})
+    assert len(list(tmp_path.iterdir())) == 2
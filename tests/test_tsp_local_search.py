@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from aco_engine import AntSystem, distance_matrix, tour_lengths
+from tsp_local_search import LocalSearch
+
+
+@pytest.mark.parametrize("n", [4, 5, 12, 60])
+@pytest.mark.parametrize("or_opt", [False, True])
+@pytest.mark.parametrize("dense_limit", [0, 2000])
+def test_improve_returns_shorter_permutation(n, or_opt, dense_limit):
+    rng = np.random.default_rng(n)
+    points = rng.random((n, 2))
+    dist = distance_matrix(points)
+    search = LocalSearch(points, k=8, or_opt=or_opt, dense_limit=dense_limit)
+    for _ in range(5):
+        tour = rng.permutation(n)
+        improved = search.improve(tour)
+        assert sorted(improved) == list(range(n))
+        assert tour_lengths(dist, improved)[0] <= tour_lengths(dist, tour)[0] + 1e-9
+
+
+def test_improve_is_idempotent_at_local_optimum():
+    points = np.random.default_rng(7).random((40, 2))
+    search = LocalSearch(points)
+    once = search.improve(np.arange(40))
+    twice = search.improve(once)
+    dist = distance_matrix(points)
+    assert tour_lengths(dist, twice)[0] == pytest.approx(tour_lengths(dist, once)[0])
+
+
+def test_colony_with_local_search():
+    points = np.random.default_rng(8).random((30, 2))
+    colony = AntSystem(points, n_ants=5, local_search=LocalSearch(points), rng=np.random.default_rng(0))
+    tour, length = colony.run(3)
+    assert sorted(tour) == list(range(30))
+    assert length == pytest.approx(tour_lengths(distance_matrix(points), tour)[0])
@@ -0,0 +1,235 @@
+import inspect
+import json
+import os
+import re
+import subprocess
+
+import manim.mobject.text.tex_mobject as tex_mobject
+from manim import *
+from manim.utils.exceptions import EndSceneEarlyException
+from manim.utils.tex_file_writing import compile_tex, delete_nonsvg_files, generate_tex_file, tex_hash
+
+# LaTeX 批量预编译：把一个场景要用到的 Tex / MathTex 字符串按模板分组，
+# 每个模板拼成一个多页文档（standalone 的 multi 模式，每个字符串一页），
+# 只调用一次 latex/xelatex 和一次 dvisvgm，再把每页的 SVG 改名为 manim 按 .tex 内容哈希得到的文件名。
+# 之后创建 Tex 时 manim 发现 SVG 已存在，就不再单独编译。
+# 首次渲染（没有清单）或场景代码比清单新时，先跳过所有动画把 construct 空跑一遍：
+# 还没有 SVG 的字符串不调用 LaTeX，只登记下来并返回一个占位 SVG，空跑结束后再按模板批量编译。
+# 场景渲染时记录实际编译过的所有字符串（清单存在 media/tex_manifest/<场景名>.json），
+# 下次渲染开始时先批量编译清单中缺少的 SVG；循环中由轨迹数据决定的字符串可用 add_tex 提前登记。
+
+MANIFEST_DIR = os.path.join("media", "tex_manifest")
+PAGE_ENV = "manimpage"
+# 空跑时代替未编译公式的 SVG：只有一个方块字形
+PLACEHOLDER_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1" viewBox="0 0 1 1">'
+                   '<path d="M0 0H1V1H0Z"/></svg>\n')
+# 场景代码按下标取公式的子对象时，占位 SVG 可能使空跑中途出错；
+# 这时先编译已登记的字符串，带着真实的 SVG 再空跑一轮，最多这么多轮
+PREPASS_ROUNDS = 3
+
+
+def modified_expression(tex_string):
+    # 与 SingleStringMathTex 编译前对字符串的处理相同（去空白、补全特殊写法等）
+    mob = tex_mobject.SingleStringMathTex.__new__(tex_mobject.SingleStringMathTex)
+    return mob._get_modified_expression(tex_string)
+
+
+def template_fields(tex_template):
+    return dict(body=tex_template.body, tex_compiler=tex_template.tex_compiler,
+                output_format=tex_template.output_format, placeholder_text=tex_template.placeholder_text)
+
+
+def template_from_fields(fields):
+    tex_template = TexTemplate(tex_compiler=fields["tex_compiler"], output_format=fields["output_format"],
+                               placeholder_text=fields["placeholder_text"])
+    tex_template.body = fields["body"]
+    return tex_template
+
+
+def wrap_in_environment(expression, environment):
+    # 与模板中 \begin{环境} 表达式 \end{环境} 的写法一致
+    if environment is None:
+        return expression
+    probe = TexTemplate()
+    probe.body = probe.placeholder_text
+    return probe.get_texcode_for_expression_in_env(expression, environment)
+
+
+def compile_batch(tex_template, items):
+    # items 为 [(表达式, 环境)]；返回本次调用的 LaTeX 进程数（0 或 1）
+    pending = {}
+    for expression, environment in items:
+        svg = generate_tex_file(expression, environment, tex_template).with_suffix(".svg")
+        if not svg.exists():
+            pending.setdefault(svg, (expression, environment))
+    body = tex_template.body
+    # 只剩一个字符串或模板不是 standalone 文档时交给 manim 照常逐个编译
+    if len(pending) < 2 or not re.search(r"\\documentclass(\[[^\]]*\])?\{standalone\}", body):
+        return 0
+
+    pages = "\n".join(f"\\begin{{{PAGE_ENV}}}\n{wrap_in_environment(e, env)}\n\\end{{{PAGE_ENV}}}"
+                      for e, env in pending.values())
+    source = re.sub(r"\\documentclass(\[([^\]]*)\])?\{standalone\}",
+                    lambda m: f"\\documentclass[{m.group(2) + ',' if m.group(2) else ''}multi={PAGE_ENV}]{{standalone}}",
+                    body, count=1)
+    source = source.replace("\\begin{document}",
+                            f"\\newenvironment{{{PAGE_ENV}}}{{}}{{}}\n\\begin{{document}}", 1)
+    source = source.replace(tex_template.placeholder_text, pages)
+
+    tex_dir = config.get_dir("tex_dir")
+    batch_file = tex_dir / f"batch_{tex_hash(source)}.tex"
+    batch_file.write_text(source, encoding="utf-8")
+    try:
+        dvi_file = compile_tex(batch_file, tex_template.tex_compiler, tex_template.output_format)
+    except ValueError as error:
+        logger.warning(f"批量编译失败，改为逐个编译: {error}")
+        batch_file.unlink()
+        return 1
+    output = tex_dir / f"{batch_file.stem}-%p.svg"
+    subprocess.run(["dvisvgm", *(["--pdf"] if tex_template.output_format == ".pdf" else []),
+                    "--page=1-", "--no-fonts", "--verbosity=0", f"--output={output.as_posix()}",
+                    dvi_file.as_posix()], stdout=subprocess.DEVNULL)
+
+    # dvisvgm 的页码可能补零，按数字排序后与字符串一一对应
+    page_files = sorted(tex_dir.glob(f"{batch_file.stem}-*.svg"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+    if len(page_files) == len(pending):
+        for page_file, svg in zip(page_files, pending):
+            os.replace(page_file, svg)
+    else:
+        logger.warning(f"批量编译得到 {len(page_files)} 页，应为 {len(pending)} 页，改为逐个编译")
+        for page_file in page_files:
+            page_file.unlink()
+    batch_file.unlink()
+    if not config["no_latex_cleanup"]:
+        delete_nonsvg_files()
+    return 1
+
+
+def placeholder_svg():
+    path = config.get_dir("tex_dir") / "tex_batch_placeholder.svg"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(PLACEHOLDER_SVG)
+    return path
+
+
+class TexBatch:
+    # 在场景的 setup 中创建并依次调用 prepass(场景)、compile() 与 record()，在 tear_down 中调用 save()（见 scene_base.py）
+    def __init__(self, name, manifest_dir=MANIFEST_DIR):
+        self.path = os.path.join(manifest_dir, f"{name}.json")
+        self.templates = {}      # 模板键 -> TexTemplate
+        self.pending = {}        # 模板键 -> {(表达式, 环境)}，待编译
+        self.seen = {}           # 模板键 -> {(表达式, 环境)}，本次渲染实际用到的
+        self.processes = 0       # 已调用的 LaTeX 进程数
+        self._original = None
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            for key, fields in manifest["templates"].items():
+                self.templates[key] = template_from_fields(fields)
+            for expression, environment, key in manifest["entries"]:
+                self.pending.setdefault(key, {})[(expression, environment)] = None
+
+    def template_key(self, tex_template):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        key = tex_hash(json.dumps(template_fields(tex_template), sort_keys=True))
+        self.templates.setdefault(key, tex_template)
+        return key
+
+    def add(self, expression, environment=None, tex_template=None):
+        self.pending.setdefault(self.template_key(tex_template), {})[(expression, environment)] = None
+
+    def add_tex(self, *tex_strings, arg_separator="", tex_environment="center", tex_template=None):
+        # 参数与 Tex 相同：manim 先编译拼接后的整串，再单独编译每一段（{{ }} 也会拆段）
+        pieces = [p for t in tex_strings for p in re.split("{{(.*?)}}", str(t)) if p]
+        self.add(modified_expression(arg_separator.join(pieces)), tex_environment, tex_template)
+        for piece in pieces:
+            self.add(modified_expression(piece), tex_environment, tex_template)
+
+    def add_math_tex(self, *tex_strings, arg_separator=" ", tex_environment="align*", tex_template=None):
+        self.add_tex(*tex_strings, arg_separator=arg_separator, tex_environment=tex_environment,
+                     tex_template=tex_template)
+
+    def compile(self):
+        for key, items in self.pending.items():
+            self.processes += compile_batch(self.templates[key], list(items))
+        self.pending = {}
+
+    def stale(self, scene):
+        # 没有清单，或场景所在的源文件在清单写出之后改过
+        if not os.path.exists(self.path):
+            return True
+        return os.path.getmtime(inspect.getfile(type(scene))) > os.path.getmtime(self.path)
+
+    def prepass(self, scene, rounds=PREPASS_ROUNDS):
+        # 用一个跳过所有动画的同类场景空跑 construct（不调用 setup；construct 中的 self.tex_batch 指向本对象），
+        # 期间还没有 SVG 的字符串登记到 pending 并返回占位 SVG，每轮结束后批量编译
+        if not self.stale(scene):
+            return
+        original = tex_mobject.tex_to_svg_file
+        placeholder = placeholder_svg()
+        collected = 0
+
+        def tex_to_svg_file(expression, environment=None, tex_template=None):
+            nonlocal collected
+            template = tex_template if tex_template is not None else config["tex_template"]
+            svg = generate_tex_file(expression, environment, template).with_suffix(".svg")
+            if svg.exists():
+                return svg
+            collected += 1
+            self.add(expression, environment, tex_template)
+            return placeholder
+
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+        try:
+            for _ in range(rounds):
+                dry = type(scene)(skip_animations=True)
+                dry.tex_batch = self
+                retry = False
+                try:
+                    dry.construct()
+                except EndSceneEarlyException:
+                    pass
+                except (IndexError, ValueError) as error:
+                    # 占位 SVG 只有一个字形，按下标取子对象的代码会在这里出错：
+                    # 先编译已登记的字符串，有新字符串时再空跑一轮
+                    logger.debug(f"LaTeX 预编译空跑在占位字形上出错，编译后重试: {error!r}")
+                    retry = True
+                except Exception:
+                    # 其他异常多半是 construct 本身的问题，不再重试，留给正式渲染报错
+                    logger.warning(f"LaTeX 预编译空跑 {type(scene).__name__} 出错，停止空跑", exc_info=True)
+                pending = any(self.pending.values())
+                self.compile()
+                if not (retry and pending):
+                    break
+        finally:
+            tex_mobject.tex_to_svg_file = original
+        logger.info(f"LaTeX 预编译：空跑 {type(scene).__name__} 登记 {collected} 个字符串，"
+                    f"共调用 {self.processes} 次 LaTeX")
+
+    def record(self):
+        # 替换 Tex 使用的 tex_to_svg_file，记录每次请求的 (表达式, 环境, 模板)
+        original = self._original = tex_mobject.tex_to_svg_file
+
+        def tex_to_svg_file(expression, environment=None, tex_template=None):
+            self.seen.setdefault(self.template_key(tex_template), {})[(expression, environment)] = None
+            return original(expression, environment=environment, tex_template=tex_template)
+
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+    def save(self):
+        if self._original is not None:
+            tex_mobject.tex_to_svg_file = self._original
+            self._original = None
+        # 用 -n 提前结束时只走了一部分场景，不覆盖完整的清单
+        if config.upto_animation_number >= 0:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        manifest = dict(templates={key: template_fields(self.templates[key]) for key in self.seen},
+                        entries=[[e, env, key] for key, items in self.seen.items() for e, env in items])
+        # 先写临时文件再改名：并行渲染时其他进程可能正在读取清单
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import os
+
+import manim
+import numpy as np
+from manim import *
+
+# Text 字形轮廓的磁盘缓存：Pango 生成并解析出的每个字形的贝塞尔控制点按
+# (文字, 字体, 字号, 字重/斜体, 行距, t2f/t2s/t2w, 渲染器, manim 版本) 的哈希存成 .npz。
+# 颜色不参与哈希，命中时直接给字形上色，同一段文字换颜色也不必重新生成。
+# 命中时跳过 Pango 排版、SVG 解析和字体列表查询；缓存总大小超过上限时按最近使用时间淘汰（LRU），
+# 淘汰检查每写入 EVICT_EVERY 个条目做一次，场景结束时（scene_base.py 的 tear_down）再做一次。
+# 场景中用 from text_cache import CachedText as Text 替换 manim 的 Text 即可。
+#   python text_cache.py           查看缓存条目数与大小
+#   python text_cache.py --clear   清空缓存
+
+CACHE_DIR = os.path.join("media", "text_cache")
+MAX_BYTES = 64 * 2 ** 20
+EVICT_EVERY = 32
+
+
+class GlyphCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES, evict_every=EVICT_EVERY):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._memory = {}     # 本进程内已读取过的条目
+        self._writes = 0      # 上次淘汰检查之后写入的条目数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def entries(self):
+        # [(路径, 大小, 最近使用时间)]，按最近使用时间从旧到新排列
+        if not os.path.isdir(self.cache_dir):
+            return []
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                found.append((entry.path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda e: e[2])
+
+    def get(self, key):
+        # 返回每个字形的控制点数组列表；未命中返回 None
+        glyphs = self._memory.get(key)
+        if glyphs is None:
+            path = self.path(key)
+            try:
+                with np.load(path) as data:
+                    points, counts = data["points"], data["counts"]
+                os.utime(path)     # 刷新修改时间，作为 LRU 的最近使用时间
+            except (OSError, KeyError, ValueError):
+                self.misses += 1
+                return None
+            glyphs = np.split(points, np.cumsum(counts)[:-1])
+            self._memory[key] = glyphs
+        self.hits += 1
+        return glyphs
+
+    def put(self, key, glyphs):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        glyphs = [np.array(g, dtype=np.float64) for g in glyphs]
+        counts = np.array([len(g) for g in glyphs], dtype=np.int64)
+        points = np.concatenate(glyphs) if glyphs else np.zeros((0, 3))
+        # 先写临时文件再改名，避免中断时留下不完整的条目；临时文件名带进程号，并行渲染时互不覆盖
+        tmp = f"{self.path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, points=points, counts=counts)
+        os.replace(tmp, self.path(key))
+        self._memory[key] = glyphs
+        # 淘汰检查要列出并 stat 整个缓存目录，不在每次写入时做
+        self._writes += 1
+        if self._writes >= self.evict_every:
+            self.evict()
+
+    def evict(self):
+        self._writes = 0
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            self._memory.pop(os.path.basename(path)[:-4], None)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.remove(path)
+        self._memory.clear()
+
+    def stats(self):
+        entries = self.entries()
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                    entries=len(entries), bytes=sum(size for _, size, _ in entries))
+
+
+TEXT_CACHE = GlyphCache()
+# 已检查过的字体名 -> Text 修正大小写后的字体名，每个字体只查询一次系统字体列表
+_FONTS = {}
+# 正在构造的 CachedText 的查询状态（缓存对象、键、字形、颜色），由 Text.__init__ 中先后调用的
+# _text2svg 与 init_svg_mobject 共用。manim 按对象属性计算分段视频的哈希，缓存对象带命中计数，
+# 命中与否的临时数据也不同，所以这些值不放在文字对象上
+_BUILDS = []
+
+
+class CachedText(Text):
+    # 与 Text 用法相同；另可用 cache= 指定其他 GlyphCache。
+    # 使用 t2c / t2g 的文字各字符颜色不同，不走缓存
+    def __init__(self, text, cache=None, font="", warn_missing_font=True, **kwargs):
+        requested = font
+        if font in _FONTS:
+            font, warn_missing_font = _FONTS[font], False
+        _BUILDS.append(dict(cache=cache if cache is not None else TEXT_CACHE))
+        try:
+            super().__init__(text, font=font, warn_missing_font=warn_missing_font, **kwargs)
+        finally:
+            _BUILDS.pop()
+        _FONTS[requested] = self.font
+
+    def glyph_key(self):
+        settings = (self.text, self.font, self.slant, self.weight, self.t2f, self.t2s, self.t2w,
+                    self.line_spacing, self._font_size, self.disable_ligatures,
+                    str(config.renderer), manim.__version__)
+        return hashlib.sha256(repr(settings).encode()).hexdigest()[:32]
+
+    def _text2svg(self, color):
+        build = _BUILDS[-1]
+        cache = build["cache"]
+        key = None if self.t2c or self.t2g else self.glyph_key()
+        build.update(key=key, color=color, glyphs=cache.get(key) if key else None)
+        if build["glyphs"] is None:
+            return super()._text2svg(color)
+        # 命中时不生成 SVG；Text 之后仍会读写一次文件，给它一个空白 SVG
+        path = os.path.join(cache.cache_dir, "empty.svg")
+        if not os.path.exists(path):
+            os.makedirs(cache.cache_dir, exist_ok=True)
+            with open(path, "w") as f:
+                f.write('<svg xmlns="http://www.w3.org/2000/svg"></svg>\n')
+        return path
+
+    def glyph_mobjects(self, glyphs, color):
+        # 命中与未命中都换成同样的普通 VMobject：manim 解析 SVG 得到的 VMobjectFromSVGPath
+        # 还带着 path_obj 等属性，留着的话首次渲染与之后命中缓存时分段视频的哈希不同。
+        # 样式取调用方传给 Text 的 fill_opacity / stroke_*（SVGMobject 保存在同名属性上），
+        # 未指定的按 Pango 生成的 SVG：实心填充、无描边
+        style = dict(fill_color=color, fill_opacity=1.0 if self.fill_opacity is None else self.fill_opacity,
+                     stroke_width=0 if self.stroke_width is None else self.stroke_width)
+        if self.stroke_color is not None:
+            style["stroke_color"] = self.stroke_color
+        if self.stroke_opacity is not None:
+            style["stroke_opacity"] = self.stroke_opacity
+        return [VMobject(**style).set_points(np.array(points)) for points in glyphs]
+
+    def init_svg_mobject(self, use_svg_cache):
+        build = _BUILDS[-1]
+        glyphs = build["glyphs"]
+        if glyphs is None:
+            super().init_svg_mobject(use_svg_cache)
+            if not build["key"]:
+                return
+            glyphs = [np.array(m.points, dtype=np.float64) for m in self.submobjects]
+            self.remove(*self.submobjects)
+            build["cache"].put(build["key"], glyphs)
+        self.add(*self.glyph_mobjects(glyphs, build["color"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看或清空 Text 字形缓存")
+    parser.add_argument("--clear", action="store_true", help="删除所有缓存条目")
+    args = parser.parse_args()
+    if args.clear:
+        TEXT_CACHE.clear()
+    stats = TEXT_CACHE.stats()
+    print(f"{TEXT_CACHE.cache_dir}: {stats['entries']} entries, {stats['bytes'] / 2 ** 20:.1f} MiB "
+          f"(limit {TEXT_CACHE.max_bytes / 2 ** 20:.0f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import zipfile
+from types import SimpleNamespace
+
+import numpy as np
+
+import aco_engine
+import aco_islands
+import hc_engine
+import objectives
+import pso_engine
+import sa_engine
+import tsp_exact
+from aco_engine import AntSystem
+from aco_islands import run_islands
+from hc_engine import HillClimber, basins
+from objectives import OBJECTIVES, AnnealingLandscape, HillClimbingLandscape
+from pso_engine import ParticleSwarm
+from sa_engine import Annealer, ParallelTempering
+from tsp_exact import optimality_gap
+
+# 先模拟、后渲染：优化算法脱离场景单独运行，逐轮记录状态写入 .npz 轨迹文件
+# （浮点数组一律存为 float32，整数按取值范围选最小的类型）。
+# 场景只回放轨迹，改颜色、改排版重新渲染时不必重跑算法；
+# 模拟参数与引擎代码的摘要保存在文件中，参数或引擎代码变化时才重新模拟。
+# 每个场景只有一个随机种子（场景类的 seed 属性），传给场景中所有的 trace 调用；
+# 模拟函数用它创建 np.random.Generator 交给算法引擎。种子和模拟参数的摘要是文件名的一部分，
+# 不同种子、不同参数的轨迹各存一份，换回原来的设置时直接读取，画面与之前完全相同，manim 的分段缓存也能命中。
+#   python traces.py sa
+#   python traces.py pso --set n_particles=3 --set seed=1
+
+TRACE_DIR = os.path.join("media", "traces")
+
+
+def compact(array):
+    array = np.asarray(array)
+    if array.dtype.kind == "f":
+        return array.astype(np.float32)
+    if array.dtype.kind in "iu":
+        for dtype in (np.int16, np.int32):
+            if array.size == 0 or (array.min() >= np.iinfo(dtype).min and array.max() <= np.iinfo(dtype).max):
+                return array.astype(dtype)
+    return array
+
+
+def save_trace(path, params, engine=None, **arrays):
+    # 先写到本进程的临时文件再原子替换：渲染中断或多个分段渲染进程同时写入时不会留下半个文件
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    arrays = {k: compact(v) for k, v in arrays.items()}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, params=json.dumps(params, sort_keys=True), engine=str(engine), **arrays)
+    os.replace(tmp, path)
+
+
+def load_trace(path):
+    with np.load(path) as data:
+        trace = {k: data[k] for k in data.files if k not in ("params", "engine")}
+        trace["params"] = json.loads(str(data["params"]))
+        trace["engine"] = str(data["engine"]) if "engine" in data.files else None
+    return trace
+
+
+def frame(trace, t):
+    # 第 t 轮的状态：各逐轮数组取第 t 行，按属性访问（如 frame(trace, 0).positions）
+    return SimpleNamespace(**{k: v[t] for k, v in trace.items()
+                              if k not in ("params", "engine") and np.ndim(v)})
+
+
+def city_layout(n_cities, rng, min_distance=0.8):
+    # 城市坐标在 [-2.5, 2.5]² 内均匀分布；有两座城市相距不足 min_distance 时整组重抽，
+    # 免得画面上城市和标签挤在一起
+    while True:
+        cities = rng.uniform(-2.5, 2.5, (n_cities, 2))
+        i, j = np.triu_indices(n_cities, k=1)
+        if np.all(np.linalg.norm(cities[i] - cities[j], axis=1) >= min_distance):
+            return cities
+
+
+def tsp_seeds(seed):
+    # 由场景种子派生两个互不相关的种子：一个生成城市坐标，一个交给蚁群。
+    # simulate_aco 与 simulate_islands 种子相同时城市也相同
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(2)]
+
+
+def simulate_aco(n_cities=8, n_ants=4, n_iterations=50, alpha=1.0, beta=2.0, rho=0.5, start=0,
+                 seed=43):
+    city_seed, ant_seed = tsp_seeds(seed)
+    cities = city_layout(n_cities, np.random.default_rng(city_seed))
+    colony = AntSystem(cities, n_ants=n_ants, alpha=alpha, beta=beta, rho=rho, start=start,
+                       rng=np.random.default_rng(ant_seed))
+    # 信息素场画所有城市对之间的边，逐轮记录这些边上的 τ（第 0 行为初始值）
+    i, j = np.triu_indices(n_cities, k=1)
+    tours, lengths, best_lengths = [], [], []
+    pheromone = [colony.pheromone.values(i, j)]
+    for _ in range(n_iterations):
+        t, l = colony.step()
+        tours.append(t)
+        lengths.append(l)
+        best_lengths.append(colony.best_length)
+        pheromone.append(colony.pheromone.values(i, j))
+    gap, exact = optimality_gap(colony.best_length, cities, upper=colony.best_length)
+    return dict(cities=cities, tours=np.array(tours), lengths=np.array(lengths),
+                best_length=np.array(best_lengths), best_tour=colony.best_tour,
+                edges=np.stack([i, j], axis=1), pheromone=np.array(pheromone),
+                gap=np.float64(gap), exact=np.bool_(exact))
+
+
+def simulate_islands(n_cities=8, n_islands=4, n_iterations=30, exchange_every=10, migration="best",
+                     blend=0.1, n_ants=8, seed=43):
+    # 岛屿模型：城市与同一种子的 simulate_aco 相同，各岛屿在各自进程中运行，每 exchange_every 轮交换一次
+    city_seed, ant_seed = tsp_seeds(seed)
+    cities = city_layout(n_cities, np.random.default_rng(city_seed))
+    result = run_islands(cities, n_islands=n_islands, n_iterations=n_iterations,
+                         exchange_every=exchange_every, migration=migration, blend=blend, seed=ant_seed,
+                         n_ants=n_ants)
+    return dict(cities=cities, island_tours=result.island_tours, island_lengths=result.island_lengths,
+                history=result.history, snapshots=result.snapshots)
+
+
+def simulate_pso(objective="sphere", n_particles=3, dim=2, n_iterations=5, w=1.0, c1=1.0, c2=1.0,
+                 bounds=(-3, 3), v_bounds=(-1, 1), seed=0):
+    swarm = ParticleSwarm(OBJECTIVES[objective](dim), n_particles=n_particles, dim=dim, w=w,
+                          c1=c1, c2=c2, bounds=tuple(bounds), v_bounds=tuple(v_bounds),
+                          rng=np.random.default_rng(seed))
+    names = ("positions", "velocities", "fitness", "pbest_positions", "pbest_fitness",
+             "gbest_position", "gbest_fitness")
+    # 第 0 行为初始状态，第 t 行为第 t 轮迭代之后的状态
+    record = {name: [] for name in names}
+    for t in range(n_iterations + 1):
+        if t:
+            swarm.step()
+        for name in names:
+            record[name].append(np.copy(getattr(swarm, name)))
+    return {name: np.array(values) for name, values in record.items()}
+
+
+def simulate_hc(starts=(3.0, 7.0), step=0.5, min_step=1e-3, mode="steepest", n_starts=10000,
+                tolerance=0.05, seed=0):
+    # 爬山算法（求最大值）：记录从 starts 中各起点出发的路径（每行一条，先收敛的停在局部最优处），
+    # 以及 n_starts 个均匀随机起点落入各局部最优吸引盆的比例
+    landscape = HillClimbingLandscape()
+    climber = HillClimber(landscape, n_starts=len(starts), x0=np.array(starts)[:, None], step=step,
+                          min_step=min_step, mode=mode, maximize=True, rng=np.random.default_rng(seed))
+    paths = [climber.x[:, 0].copy()]
+    while not climber.converged.all():
+        climber.step()
+        paths.append(climber.x[:, 0].copy())
+    paths = np.array(paths).T
+
+    restarts = HillClimber(landscape, n_starts=n_starts, step=step, min_step=min_step, mode=mode,
+                           maximize=True, rng=np.random.default_rng(seed))
+    restarts.run()
+    basin_x, basin_value, basin_share = basins(restarts.x, restarts.value, tolerance)
+    return dict(paths=paths, basin_x=basin_x[:, 0], basin_value=basin_value, basin_share=basin_share)
+
+
+def simulate_sa(x0=6.5, n_iterations=20, t0=10.0, cooling=0.85, step=1.0, bounds=(0, 10), seed=20):
+    # 单条马尔可夫链：由 Annealer 逐步运行，记录每步提出的新解、ΔE、接受概率与降温后的温度
+    sa = Annealer(AnnealingLandscape(), x0=x0, bounds=tuple(bounds), step=step, t0=t0,
+                  cooling=cooling, rng=np.random.default_rng(seed))
+    current, proposed, delta, prob, accepted, temperatures = [x0], [], [], [], [], [t0]
+    for _ in range(n_iterations):
+        temperature = sa.temperature[0]
+        accept, delta_e = sa.step()
+        proposed.append(sa.proposal[0, 0])
+        delta.append(delta_e[0])
+        prob.append(np.exp(-max(delta_e[0], 0) / temperature))
+        accepted.append(accept[0])
+        current.append(sa.x[0, 0])
+        temperatures.append(sa.temperature[0])
+    return dict(current_x=np.array(current), proposed_x=np.array(proposed), delta_e=np.array(delta),
+                accept_prob=np.array(prob), accepted=np.array(accepted),
+                temperature=np.array(temperatures))
+
+
+def simulate_sa_ensemble(n_chains=10000, n_iterations=200, x0=6.5, t0=10.0, cooling=0.97, step=1.0,
+                         bounds=(0, 10), n_replicas=8, t_min=0.05, t_max=10.0, tolerance=0.5, seed=20):
+    # 同样的能量计算次数下对比：n_chains 条独立退火链 vs n_chains / n_replicas 个并行回火系统。
+    # 记录每条退火链与每个系统最低温副本的最终位置，以及落在全局最优附近的比例
+    energy = AnnealingLandscape()
+    xs = np.linspace(bounds[0], bounds[1], 100001)
+    x_min = xs[np.argmin(energy(xs[:, None]))]
+    rng = np.random.default_rng(seed)
+    sa = Annealer(energy, n_chains=n_chains, x0=x0, bounds=tuple(bounds), step=step, t0=t0,
+                  cooling=cooling, dtype=np.float32, rng=rng)
+    sa.run(n_iterations)
+    pt = ParallelTempering(energy, n_systems=n_chains // n_replicas, n_replicas=n_replicas,
+                           t_min=t_min, t_max=t_max, x0=x0, bounds=tuple(bounds), step=step,
+                           dtype=np.float32, rng=rng)
+    pt.run(n_iterations)
+    sa_final, pt_final = sa.x[:, 0], pt.coldest()[:, 0]
+    return dict(sa_final=sa_final, pt_final=pt_final, x_min=np.float64(x_min),
+                sa_success=np.mean(np.abs(sa_final - x_min) < tolerance),
+                pt_success=np.mean(np.abs(pt_final - x_min) < tolerance))
+
+
+SIMULATORS = {"aco": simulate_aco, "islands": simulate_islands, "pso": simulate_pso, "hc": simulate_hc,
+              "sa": simulate_sa, "sa_ensemble": simulate_sa_ensemble}
+# 各模拟函数用到的引擎模块
+ENGINES = {"aco": (aco_engine, tsp_exact), "islands": (aco_engine, aco_islands),
+           "pso": (pso_engine, objectives), "hc": (hc_engine, objectives), "sa": (sa_engine, objectives),
+           "sa_ensemble": (sa_engine, objectives)}
+
+
+def trace_params(kind, params):
+    # 补全默认值后再比较，模拟函数的默认参数改变时也会重新模拟；元组等统一成 JSON 形式
+    bound = inspect.signature(SIMULATORS[kind]).bind(**params)
+    bound.apply_defaults()
+    return json.loads(json.dumps(bound.arguments))
+
+
+def engine_version(kind):
+    # 模拟函数及其引擎模块源码的摘要：引擎代码改动后（哪怕参数不变）旧轨迹也会重新模拟
+    digest = hashlib.sha1(inspect.getsource(SIMULATORS[kind]).encode())
+    for module in ENGINES[kind]:
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:16]
+
+
+def trace_path(kind, params, name=None, trace_dir=TRACE_DIR):
+    # 文件名含种子与参数摘要：同一种子、不同参数的轨迹互不覆盖
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+    return os.path.join(trace_dir, f"{name or kind}-{params['seed']}-{digest}.npz")
+
+
+def trace(kind, name=None, trace_dir=TRACE_DIR, **params):
+    # 读取已有轨迹；文件不存在、已损坏、模拟参数不同或引擎代码有改动时重新模拟并保存
+    params = trace_params(kind, params)
+    engine = engine_version(kind)
+    path = trace_path(kind, params, name, trace_dir)
+    if os.path.exists(path):
+        try:
+            cached = load_trace(path)
+        except (zipfile.BadZipFile, EOFError, ValueError, KeyError):
+            cached = None
+        if cached and cached["params"] == params and cached["engine"] == engine:
+            return cached
+    arrays = SIMULATORS[kind](**params)
+    save_trace(path, params, engine, **arrays)
+    return load_trace(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无画面运行优化算法并写出轨迹文件")
+    parser.add_argument("kind", choices=sorted(SIMULATORS))
+    parser.add_argument("--name", help="轨迹文件名（默认同 kind）")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="模拟参数，VALUE 按 JSON 解析，如 --set n_iterations=200")
+    args = parser.parse_args()
+
+    params = {}
+    for item in args.set:
+        key, value = item.split("=", 1)
+        try:
+            params[key] = json.loads(value)
+        except json.JSONDecodeError:
+            params[key] = value
+    result = trace(args.kind, name=args.name, **params)
+    path = trace_path(args.kind, trace_params(args.kind, params), args.name)
+    print(f"{path}: {os.path.getsize(path)} bytes")
+    for key, value in result.items():
+        if key not in ("params", "engine"):
+            print(f"  {key:<16} {value.dtype} {value.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+
+import numpy as np
+
+from aco_engine import distance_matrix
+
+# TSP 的精确解与下界，用来检验蚁群算法的结果：
+#   held_karp       状态压缩 DP (Held-Karp)，按子集规模分层、对整层子集向量化，适合 ≤ 20 个城市
+#   one_tree_bound  1-树下界，配合次梯度法调整节点惩罚 (Held-Karp 下界)，适合更大的实例
+#   reference       自动选择二者之一，结果按城市坐标的哈希缓存在内存和磁盘上
+
+EXACT_LIMIT = 18
+CACHE_DIR = os.path.join("media", "tsp_exact")
+
+_cache = {}
+
+
+def held_karp(dist):
+    dist = np.asarray(dist, dtype=np.float64)
+    n = len(dist)
+    if n <= 3:
+        tour = np.arange(n)
+        return float(dist[tour, np.roll(tour, -1)].sum()), tour
+
+    # 城市 0 为起点；C[S, j] = 从 0 出发恰好经过集合 S（不含 0）并停在 j 的最短路长
+    m = n - 1
+    full = 1 << m
+    d = dist[1:, 1:]
+    cost = np.full((full, m), np.inf)
+    parent = np.zeros((full, m), dtype=np.int8)
+    singles = 1 << np.arange(m)
+    cost[singles, np.arange(m)] = dist[0, 1:]
+
+    masks = np.arange(full)
+    size = np.zeros(full, dtype=np.int8)
+    for b in range(m):
+        size += (masks >> b) & 1
+    order = np.argsort(size, kind="stable")
+    bounds = np.searchsorted(size[order], np.arange(m + 2))
+
+    for s in range(2, m + 1):
+        layer = order[bounds[s]:bounds[s + 1]]
+        for j in range(m):
+            S = layer[(layer >> j) & 1 == 1]
+            # 上一步的集合 S\{j} 中不含的终点 k 的值为 inf，自动被排除
+            cand = cost[S ^ (1 << j)] + d[:, j]
+            k = np.argmin(cand, axis=1)
+            cost[S, j] = cand[np.arange(len(S)), k]
+            parent[S, j] = k
+
+    last = cost[full - 1] + dist[1:, 0]
+    j = int(np.argmin(last))
+    length = float(last[j])
+
+    # 沿 parent 回溯出路径
+    tour, S = [], full - 1
+    while S:
+        tour.append(j + 1)
+        S, j = S ^ (1 << j), int(parent[S, j])
+    tour.append(0)
+    return length, np.array(tour[::-1])
+
+
+def minimum_one_tree(dist, special=0):
+    # 去掉特殊节点后的最小生成树 (Prim，按行向量化) + 特殊节点的两条最短边；
+    # 返回总长与各节点的度
+    n = len(dist)
+    rest = np.array([i for i in range(n) if i != special])
+    sub = dist[np.ix_(rest, rest)]
+    degree = np.zeros(n, dtype=np.int64)
+
+    in_tree = np.zeros(len(rest), dtype=bool)
+    in_tree[0] = True
+    best = sub[0].copy()
+    link = np.zeros(len(rest), dtype=np.intp)
+    total = 0.0
+    for _ in range(len(rest) - 1):
+        v = int(np.argmin(np.where(in_tree, np.inf, best)))
+        total += best[v]
+        degree[rest[v]] += 1
+        degree[rest[link[v]]] += 1
+        in_tree[v] = True
+        closer = sub[v] < best
+        best[closer] = sub[v][closer]
+        link[closer] = v
+
+    two = np.argpartition(dist[special, rest], 1)[:2]
+    total += dist[special, rest[two]].sum()
+    degree[special] = 2
+    degree[rest[two]] += 1
+    return total, degree
+
+
+def one_tree_bound(dist, upper=None, iterations=100):
+    # Held-Karp 下界：对节点惩罚 π 做次梯度上升，
+    # 边权 d_ij + π_i + π_j 下的最小 1-树长度减去 2·Σπ 始终是最优路径长度的下界
+    dist = np.asarray(dist, dtype=np.float64)
+    n = len(dist)
+    if upper is None:
+        upper = float(dist[np.arange(n), np.roll(np.arange(n), -1)].sum())
+    pi = np.zeros(n)
+    best_bound, step_scale, stall = -np.inf, 2.0, 0
+    for _ in range(iterations):
+        total, degree = minimum_one_tree(dist + pi[:, None] + pi[None, :])
+        bound = total - 2.0 * pi.sum()
+        if bound > best_bound + 1e-12:
+            best_bound, stall = bound, 0
+        else:
+            stall += 1
+            if stall >= 5:
+                step_scale, stall = step_scale / 2.0, 0
+        g = degree - 2
+        norm = float((g * g).sum())
+        if norm == 0:
+            break       # 1-树恰好是一条哈密顿回路，下界即最优值
+        pi += step_scale * max(upper - bound, 1e-12) / norm * g
+    return float(best_bound)
+
+
+def cities_key(cities):
+    cities = np.ascontiguousarray(cities, dtype=np.float64)
+    return hashlib.sha1(str(cities.shape).encode() + cities.tobytes()).hexdigest()
+
+
+def reference(cities, upper=None, exact_limit=EXACT_LIMIT, cache_dir=CACHE_DIR):
+    # 返回 (长度, 路径或 None, 是否精确)：规模不超过 exact_limit 时为精确最优解，
+    # 否则为 1-树下界。结果按坐标与求解方式（精确解 / 给定 upper 的下界）哈希缓存，
+    # 同一组城市的精确解与下界分开存放
+    cities = np.asarray(cities, dtype=np.float64)
+    exact = len(cities) <= exact_limit
+    method = "exact" if exact else f"one-tree:{None if upper is None else float(upper)!r}"
+    key = hashlib.sha1(f"{cities_key(cities)}:{method}".encode()).hexdigest()
+    if key in _cache:
+        return _cache[key]
+
+    path = os.path.join(cache_dir, key + ".npz") if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            tour = data["tour"] if data["exact"] else None
+            result = (float(data["length"]), tour, bool(data["exact"]))
+    else:
+        dist = distance_matrix(cities)
+        if exact:
+            length, tour = held_karp(dist)
+            result = (length, tour, True)
+        else:
+            result = (one_tree_bound(dist, upper=upper), None, False)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tour = result[1] if result[2] else np.zeros(0, dtype=np.intp)
+            np.savez(path, length=result[0], tour=tour, exact=result[2])
+    _cache[key] = result
+    return result
+
+
+def optimality_gap(length, cities, upper=None):
+    # 相对最优值（或下界）的差距；基于下界时为差距的上界
+    value, _, exact = reference(cities, upper=upper)
+    return length / value - 1.0, exact
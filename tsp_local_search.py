@@ -0,0 +1,119 @@
+from collections import deque
+
+import numpy as np
+
+from aco_engine import distance_matrix, nearest_neighbours
+
+# 2-opt + Or-opt 局部搜索，用于在蚂蚁构建路径之后改进路径。
+# 只考虑与当前城市的 k 近邻相关的移动（近邻表），并用 don't-look bits
+# 跳过最近没有改进的城市；对一个城市的全部候选移动，增益一次性用数组算出，取最大者
+
+
+class LocalSearch:
+    def __init__(self, cities, k=10, or_opt=True, max_segment=3, dense_limit=2000):
+        self.cities = np.asarray(cities, dtype=np.float64)
+        self.n = len(self.cities)
+        self.nn, _ = nearest_neighbours(self.cities, k)
+        self.or_opt = or_opt
+        self.max_segment = max_segment
+        # 城市不多时直接查距离矩阵，否则由坐标现算
+        self.dist = distance_matrix(self.cities) if self.n <= dense_limit else None
+        self.x, self.y = self.cities[:, 0].copy(), self.cities[:, 1].copy()
+
+    def d(self, u, v):
+        if self.dist is not None:
+            return self.dist[u, v]
+        return np.hypot(self.x[u] - self.x[v], self.y[u] - self.y[v])
+
+    def improve(self, tour):
+        n = self.n
+        tour = np.array(tour, dtype=np.intp)
+        if n < 5:
+            return tour
+        pos = np.empty(n, dtype=np.intp)
+        pos[tour] = np.arange(n)
+
+        # don't-look bits：队列中的城市为“活跃”城市
+        queue = deque(tour.tolist())
+        active = np.ones(n, dtype=bool)
+        while queue:
+            a = queue.popleft()
+            active[a] = False
+            touched = self.two_opt_move(tour, pos, a)
+            if touched is None and self.or_opt:
+                touched = self.or_opt_move(tour, pos, a)
+            if touched is None:
+                continue
+            for c in touched:
+                if not active[c]:
+                    active[c] = True
+                    queue.append(c)
+        return tour
+
+    def two_opt_move(self, tour, pos, a):
+        # 把边 (x, succ x) 与 (y, succ y) 换成 (x, y) 与 (succ x, succ y)。
+        # 候选：y ∈ N(a) 且 x = a（后继方向），或 x = pred a, y = pred c（前驱方向）
+        n = self.n
+        c = self.nn[a]
+        pc = pos[c]
+        x = np.concatenate((np.full(len(c), a), np.full(len(c), tour[(pos[a] - 1) % n])))
+        y = np.concatenate((c, tour[(pc - 1) % n]))
+        sx, sy = tour[(pos[x] + 1) % n], tour[(pos[y] + 1) % n]
+        gain = self.d(x, sx) + self.d(y, sy) - self.d(x, y) - self.d(sx, sy)
+        best = int(np.argmax(gain))
+        if gain[best] <= 1e-10:
+            return None
+        x, y, sx, sy = int(x[best]), int(y[best]), int(sx[best]), int(sy[best])
+        self.reverse(tour, pos, pos[x] + 1, pos[y])
+        return x, y, sx, sy
+
+    def reverse(self, tour, pos, i, j):
+        # 反转环形区间 tour[i..j]；若区间超过一半，则反转其补集（得到等价路径）
+        n = self.n
+        length = (j - i) % n + 1
+        if length > n // 2:
+            i, j = j + 1, i - 1
+            length = n - length
+        idx = (i + np.arange(length)) % n
+        tour[idx] = tour[idx[::-1]]
+        pos[tour[idx]] = idx
+
+    def or_opt_move(self, tour, pos, a):
+        # 把从 a 开始的 1..max_segment 个城市整体移到别处（可反向插入），
+        # 插入位置取 a 或段尾城市的近邻 c 与其前驱/后继之间
+        n = self.n
+        best_gain, best_move = 1e-10, None
+        for length in range(1, min(self.max_segment, n - 3) + 1):
+            e = tour[(pos[a] + length - 1) % n]
+            p, nx = tour[(pos[a] - 1) % n], tour[(pos[a] + length) % n]
+            removed = self.d(p, a) + self.d(e, nx) - self.d(p, nx)
+            if removed <= best_gain:
+                continue
+            c = np.concatenate((self.nn[a], self.nn[e]))
+            u = np.concatenate((c, tour[(pos[c] - 1) % n]))
+            v = np.concatenate((tour[(pos[c] + 1) % n], c))
+            # 插入的边 (u, v) 两端都不能落在被移动的段内
+            ok = ((pos[u] - pos[a]) % n >= length) & ((pos[v] - pos[a]) % n >= length)
+            if not ok.any():
+                continue
+            u, v = u[ok], v[ok]
+            base = self.d(u, v)
+            forward = self.d(u, a) + self.d(e, v) - base
+            backward = self.d(u, e) + self.d(a, v) - base
+            gain = removed - np.minimum(forward, backward)
+            k = int(np.argmax(gain))
+            if gain[k] > best_gain:
+                best_gain = gain[k]
+                best_move = (length, e, p, nx, int(u[k]), int(v[k]), backward[k] < forward[k])
+        if best_move is None:
+            return None
+
+        length, e, p, nx, u, v, flip = best_move
+        rolled = np.roll(tour, -pos[a])
+        segment, rest = rolled[:length], rolled[length:]
+        if flip:
+            segment = segment[::-1]
+        at = (pos[u] - pos[a]) % n - length + 1
+        tour[:] = np.concatenate((rest[:at], segment, rest[at:]))
+        pos[tour] = np.arange(n)
+        return a, e, p, nx, u, v